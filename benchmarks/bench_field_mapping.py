@@ -0,0 +1,143 @@
+"""
+Micro-benchmark: the compiled field-mapping pipelines (src/utils/field_mapping.py) against the hand-written
+mapping they replaced, from submitted form data to the pdfcpu payload. Checks both produce identical output first.
+
+    python benchmarks/bench_field_mapping.py [iterations]
+"""
+import os
+import sys
+import timeit
+import logging
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.utils.helpers import format_phone
+from src.utils.pdf_filler import PDF_FIELD_MAP, DEFAULT_VALUES, PAYLOAD_PIPELINE, build_pdfcpu_payload
+from src.utils.field_mapping import FORM_FIELD_SPEC, compile_form_spec, run_form_pipeline
+
+logger = logging.getLogger('bench_field_mapping')
+
+SAMPLE_FORMS = {
+    'complete': {
+        'field2_name': 'Jane Q. Claimant', 'field2_address': '123 Main St', 'field2_city': 'Springfield',
+        'field2_state': 'VA', 'field2_zip': '22150', 'field3_type_employment': 'Civilian',
+        'field_pdf_4_dob': '01/02/1970', 'field_pdf_5_marital_status': 'Married',
+        'field8_basis_of_claim': 'Additional details from the claimant.',
+        'field9_property_damage_description_vehicle': 'Phone', 'field9_property_damage_description_other': 'Glasses',
+        'field10_nature_of_injury': '', 'field12a_property_damage_amount': '250',
+        'field12b_personal_injury_amount': '10000', 'field12c_wrongful_death_amount': '0',
+        'field12d_total_amount': '10250', 'field_pdf_13b_phone': '5551234567',
+        'field13a_signature': 'Jane Q. Claimant', 'field14_date_signed': '2021-01-06T12:00',
+    },
+    'sparse': {
+        'field2_name': 'John Doe', 'field3_type_employment': 'Other', 'field3_other_specify': 'Contractor',
+        'field12b_personal_injury_amount': 'n/a', 'field_pdf_13b_phone': '555-1234',
+    },
+}
+
+
+# --- Legacy implementations (as they were before the compiled pipelines), trimmed of their debug logging ---
+
+def legacy_map_form_data_to_pdf_fields(form_data):
+    pdf_data = {}
+    name = form_data.get('field2_name', '')
+    address = form_data.get('field2_address', '')
+    city = form_data.get('field2_city', '')
+    state = form_data.get('field2_state', '')
+    zip_code = form_data.get('field2_zip', '')
+    pdf_data['field2_claimant_info_combined'] = f"{name}\n{address}\n{city}, {state} {zip_code}".strip()
+    pdf_data['field2_name'] = name
+    pdf_data['field2_address'] = address
+    pdf_data['field2_city'] = city
+    pdf_data['field2_state'] = state
+    pdf_data['field2_zip'] = zip_code
+    employment_type = form_data.get('field3_type_employment', '')
+    pdf_data['field3_type_employment'] = form_data.get('field3_other_specify', '') if employment_type == 'Other' else employment_type
+    pdf_data['field3_checkbox_civilian'] = employment_type == 'Civilian'
+    pdf_data['field3_checkbox_military'] = employment_type == 'Military'
+    pdf_data['field_pdf_4_dob'] = form_data.get('field_pdf_4_dob', '')
+    pdf_data['field_pdf_5_marital_status'] = form_data.get('field_pdf_5_marital_status', '')
+    boilerplate_8 = DEFAULT_VALUES.get('field8_basis_of_claim', '')
+    user_8 = form_data.get('field8_basis_of_claim', '').strip()
+    pdf_data['field8_basis_of_claim'] = boilerplate_8 if not user_8 else f"{boilerplate_8}\n{user_8}"
+    combined_prop_desc = f"{form_data.get('field9_property_damage_description_vehicle', '')}\n{form_data.get('field9_property_damage_description_other', '')}".strip()
+    pdf_data['field9_property_damage_description'] = combined_prop_desc if combined_prop_desc else DEFAULT_VALUES.get('field9_property_damage_description', '')
+    pdf_data['field9_owner_name_address'] = form_data.get('field9_owner_name_address', DEFAULT_VALUES.get('field9_owner_name_address', ''))
+    boilerplate_10 = DEFAULT_VALUES.get('field10_nature_of_injury', '')
+    user_10 = form_data.get('field10_nature_of_injury', '').strip()
+    pdf_data['field10_nature_of_injury'] = boilerplate_10 if not user_10 else f"{boilerplate_10}\n{user_10}"
+    pdf_data['field11_witness_name'] = form_data.get('field11_witness_name', DEFAULT_VALUES.get('field11_witness_name', ''))
+    pdf_data['field11_witness_address'] = form_data.get('field11_witness_address', DEFAULT_VALUES.get('field11_witness_address', ''))
+    pdf_data['field12a_property_damage'] = form_data.get('field12a_property_damage_amount', DEFAULT_VALUES.get('field12a_property_damage', ''))
+    pdf_data['field12b_personal_injury'] = form_data.get('field12b_personal_injury_amount', DEFAULT_VALUES.get('field12b_personal_injury', ''))
+    pdf_data['field12c_wrongful_death'] = form_data.get('field12c_wrongful_death_amount', DEFAULT_VALUES.get('field12c_wrongful_death', ''))
+    pdf_data['field12d_total_claim_amount'] = form_data.get('field12d_total_amount', form_data.get('field12d_total_claim_amount', DEFAULT_VALUES.get('field12d_total_claim_amount', '')))
+    pdf_data['field13a_signature'] = form_data.get('field13a_signature', 'Pending Signature')
+    for key in ('field_pdf_13b_phone', 'field14_date_signed', 'field15_accident_insurance', 'field15_insurer_name_address_policy',
+                'field16_filed_claim', 'field16_claim_details', 'field17_deductible_amount', 'field18_insurer_action',
+                'field19_liability_insurance', 'field19_insurer_name_address'):
+        pdf_data[key] = form_data.get(key, '')
+    for app_key, pdf_field in PDF_FIELD_MAP.items():
+        if app_key not in pdf_data or pdf_data[app_key] in (None, ""):
+            logger.warning(f"PDF MAPPING: Field '{app_key}' (PDF: '{pdf_field}') is missing or blank in PDF data.")
+    return pdf_data
+
+
+def legacy_build_pdfcpu_payload(form_data):
+    pdfcpu_data = {"forms": [{}]}
+    form_fields_dict = pdfcpu_data["forms"][0]
+    for app_field_key, pdf_field_name_from_map in PDF_FIELD_MAP.items():
+        submitted_value = form_data.get(app_field_key)
+        if submitted_value is None or str(submitted_value).strip() == '':
+            field_value = DEFAULT_VALUES.get(app_field_key)
+        else:
+            field_value = submitted_value
+        if field_value is None:
+            continue
+        final_json_value = format_phone(field_value) if app_field_key == 'field_pdf_13b_phone' else field_value
+        if app_field_key in ['field12a_property_damage', 'field12b_personal_injury', 'field12c_wrongful_death', 'field12d_total_claim_amount']:
+            try:
+                final_json_value = f"${float(field_value):,.2f}"
+            except ValueError:
+                logger.warning(f"Could not convert monetary field '{app_field_key}' value '{field_value}' to float.")
+        if app_field_key in ['field3_checkbox_civilian', 'field3_checkbox_military']:
+            pdfcpu_field_type = 'checkbox'
+            if isinstance(field_value, str):
+                final_json_value = field_value.lower() == 'true'
+            elif not isinstance(field_value, bool):
+                final_json_value = bool(field_value)
+        else:
+            pdfcpu_field_type = 'textfield'
+        logger.info(f"Processing '{app_field_key}': PDF Target='{pdf_field_name_from_map}', Original Value='{field_value}', JSON Value='{final_json_value}'")
+        form_fields_dict.setdefault(pdfcpu_field_type, []).append({"name": pdf_field_name_from_map, "value": final_json_value})
+    return pdfcpu_data
+
+
+FORM_TO_PDF_PIPELINE = compile_form_spec(FORM_FIELD_SPEC, DEFAULT_VALUES)
+
+
+def legacy(form_data):
+    return legacy_build_pdfcpu_payload(legacy_map_form_data_to_pdf_fields(form_data))
+
+
+def compiled(form_data):
+    return build_pdfcpu_payload(run_form_pipeline(FORM_TO_PDF_PIPELINE, form_data))
+
+
+def main(iterations=5000):
+    logging.basicConfig(level=logging.INFO, stream=open(os.devnull, 'w'))  # Log like the app does, but discard it
+    for label, form_data in SAMPLE_FORMS.items():
+        if legacy(form_data) != compiled(form_data):
+            sys.exit(f"Output mismatch for the '{label}' sample form.")
+    print(f"{len(PAYLOAD_PIPELINE)} PDF fields, {iterations} fills per sample form")
+    for label, form_data in SAMPLE_FORMS.items():
+        legacy_time = min(timeit.repeat(lambda: legacy(form_data), number=iterations, repeat=3))
+        compiled_time = min(timeit.repeat(lambda: compiled(form_data), number=iterations, repeat=3))
+        print(f"{label:>10}: legacy {legacy_time / iterations * 1e6:8.1f} us/fill, "
+              f"compiled {compiled_time / iterations * 1e6:8.1f} us/fill ({legacy_time / compiled_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import platform
+import tempfile
+import statistics
+from datetime import datetime, timezone
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+# --- Isolated app environment ---
+# src.app reads its database, session, log and cache locations from the environment when it is imported, so they
+# are pointed at a throwaway directory before any benchmark imports it. AUTO_MIGRATE builds the schema at startup.
+BENCH_DATA_DIR = tempfile.mkdtemp(prefix='sf95-bench-')
+os.environ['DATABASE_PATH'] = os.path.join(BENCH_DATA_DIR, 'form_data.db')
+os.environ['SESSION_DB_PATH'] = os.path.join(BENCH_DATA_DIR, 'sessions.db')
+os.environ['DEBUG_LOG_PATH'] = os.path.join(BENCH_DATA_DIR, 'debugging-logs.ring')
+os.environ['PDF_CACHE_DIR'] = os.path.join(BENCH_DATA_DIR, 'pdf_cache')
+os.environ['METRICS_DIR'] = os.path.join(BENCH_DATA_DIR, 'metrics')
+os.environ['AUTO_MIGRATE'] = '1'
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baselines.json')
+RESULTS_PATH = os.path.join(BENCH_DIR, 'results.json')
+BENCH_ROUNDS = int(os.environ.get('BENCH_ROUNDS', 20))
+BENCH_SEED_CLAIMS = int(os.environ.get('BENCH_SEED_CLAIMS', 10000))
+
+ADMIN_USERNAME = 'bench-admin@example.com'
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('bench', 'claim intake benchmarks')
+    group.addoption('--bench-save', action='store_true',
+                    help="Store this run's timings as the new baselines (benchmarks/baselines.json).")
+    group.addoption('--bench-max-ratio', type=float, default=None,
+                    help='Fail any benchmark whose median is more than this many times its baseline median.')
+
+
+# --- Timing and baselines ---
+
+def machine_info():
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'processor': platform.processor() or platform.machine()}
+
+
+def summarize(timings):
+    """Seconds -> rounded millisecond stats for one benchmark."""
+    return {
+        'rounds': len(timings),
+        'min_ms': round(min(timings) * 1000, 3),
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'mean_ms': round(statistics.mean(timings) * 1000, 3),
+        'max_ms': round(max(timings) * 1000, 3),
+        'stdev_ms': round(statistics.stdev(timings) * 1000, 3) if len(timings) > 1 else 0.0,
+    }
+
+
+class BenchRecorder:
+    """Collects each benchmark's stats and compares them with the stored baselines."""
+
+    def __init__(self, max_ratio=None):
+        self.max_ratio = max_ratio
+        self.results = {}
+        self.baselines = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH, 'r') as f:
+                self.baselines = json.load(f).get('benchmarks', {})
+
+    def record(self, name, stats):
+        self.results[name] = stats
+        baseline = self.baselines.get(name)
+        if baseline and self.max_ratio:
+            ratio = stats['median_ms'] / baseline['median_ms'] if baseline['median_ms'] else 0
+            if ratio > self.max_ratio:
+                pytest.fail(f"{name}: median {stats['median_ms']}ms is {ratio:.2f}x the baseline {baseline['median_ms']}ms "
+                            f"(allowed {self.max_ratio}x)")
+
+    def write(self, path, merge=False):
+        benchmarks = {}
+        if merge and os.path.exists(path):
+            with open(path, 'r') as f:
+                benchmarks = json.load(f).get('benchmarks', {})
+        benchmarks.update(self.results)
+        with open(path, 'w') as f:
+            json.dump({'machine': machine_info(), 'saved_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                       'benchmarks': dict(sorted(benchmarks.items()))}, f, indent=2)
+            f.write('\n')
+
+
+def pytest_configure(config):
+    config.bench_recorder = BenchRecorder(config.getoption('--bench-max-ratio'))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    recorder = config.bench_recorder
+    if not recorder.results:
+        return
+    terminalreporter.section('benchmarks (ms)')
+    terminalreporter.write_line(f"{'name':<45} {'median':>10} {'min':>10} {'max':>10} {'baseline':>10} {'ratio':>7}")
+    for name, stats in sorted(recorder.results.items()):
+        baseline = recorder.baselines.get(name)
+        baseline_median = f"{baseline['median_ms']:.3f}" if baseline else '-'
+        ratio = f"{stats['median_ms'] / baseline['median_ms']:.2f}x" if baseline and baseline['median_ms'] else '-'
+        terminalreporter.write_line(f"{name:<45} {stats['median_ms']:>10.3f} {stats['min_ms']:>10.3f} {stats['max_ms']:>10.3f} {baseline_median:>10} {ratio:>7}")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    recorder = session.config.bench_recorder
+    if recorder.results:
+        recorder.write(RESULTS_PATH)
+        if session.config.getoption('--bench-save'):
+            recorder.write(BASELINE_PATH, merge=True)
+    shutil.rmtree(BENCH_DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def bench(request):
+    """
+    bench(fn, rounds=BENCH_ROUNDS, warmup=1, setup=None): calls fn `rounds` times (after `warmup` untimed calls),
+    timing only fn; setup, if given, runs untimed before every call. Records the stats under the test's name and
+    returns fn's last result.
+    """
+    def run(fn, rounds=BENCH_ROUNDS, warmup=1, setup=None):
+        result = None
+        for _ in range(warmup):
+            if setup:
+                setup()
+            fn()
+        timings = []
+        for _ in range(rounds):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            result = fn()
+            timings.append(time.perf_counter() - start)
+        request.config.bench_recorder.record(request.node.name, summarize(timings))
+        return result
+    return run
+
+
+# --- App, clients and seeded data ---
+
+@pytest.fixture(scope='session')
+def flask_app():
+    from src import app as app_module
+    app_module.app.config['TESTING'] = True
+    app_module.app.config['FILLED_FORMS_DIR'] = os.path.join(BENCH_DATA_DIR, 'filled_forms')
+    os.makedirs(app_module.app.config['FILLED_FORMS_DIR'], exist_ok=True)
+    # Renders are only queued; worker threads would otherwise compete with the request being timed
+    start_render_queue = app_module.render_queue.start
+    app_module.render_queue.start = lambda: None
+    yield app_module
+    app_module.render_queue.start = start_render_queue
+
+
+@pytest.fixture
+def client(flask_app):
+    return flask_app.app.test_client()
+
+
+@pytest.fixture(scope='session')
+def admin_user_id(flask_app):
+    with flask_app.app.app_context():
+        user = flask_app.User.get_by_username(ADMIN_USERNAME)
+        if not user:
+            flask_app.User.create_user(ADMIN_USERNAME, 'bench-password', role='admin')
+            user = flask_app.User.get_by_username(ADMIN_USERNAME)
+        return user.id
+
+
+@pytest.fixture
+def admin_client(flask_app, admin_user_id):
+    test_client = flask_app.app.test_client()
+    with test_client.session_transaction() as session:
+        session['_user_id'] = str(admin_user_id)
+        session['_fresh'] = True
+    return test_client
+
+
+@pytest.fixture(scope='session')
+def seeded_claims(flask_app):
+    from src.utils.synthetic_claims import insert_claims
+    columns = [col.split(' ')[0] for col in flask_app.DB_SCHEMA]
+    conn = sqlite3.connect(os.environ['DATABASE_PATH'])
+    try:
+        return insert_claims(conn, columns, BENCH_SEED_CLAIMS, flask_app.PDF_FILLER_DEFAULTS, seed=1234)
+    finally:
+        conn.close()
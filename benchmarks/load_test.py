@@ -0,0 +1,176 @@
+"""
+Load test for the claim intake flow against a running server (development server, gunicorn or a staging host).
+Each simulated user repeatedly walks the multi-step flow with its own cookie jar:
+
+    GET /  ->  POST /submit  ->  GET /signature  ->  POST /signature  ->  GET /success/<id>
+
+and the script reports p50/p95/p99 latency and error counts per route. Every claim it submits is real, so point it
+at a disposable database (see `flask --app src.app seed-claims` for background volume), never at production.
+
+    python benchmarks/load_test.py --base-url http://127.0.0.1:61663 --users 20 --claims-per-user 10
+"""
+import sys
+import json
+import math
+import time
+import uuid
+import argparse
+import threading
+import http.cookiejar
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROUTES = ['GET /', 'POST /submit', 'GET /signature', 'POST /signature', 'GET /success/<id>']
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Leaves redirects to the caller, so each step of the flow is timed on its own."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class RouteStats:
+    """Latencies and failures per route, shared by all simulated users."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {route: [] for route in ROUTES}
+        self.errors = {route: 0 for route in ROUTES}
+
+    def add(self, route, seconds, ok):
+        with self._lock:
+            self.latencies[route].append(seconds)
+            if not ok:
+                self.errors[route] += 1
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class SimulatedUser:
+    def __init__(self, base_url, stats, user_number, run_tag, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.stats = stats
+        self.user_number = user_number
+        self.run_tag = run_tag
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect())
+
+    def request(self, route, path, data=None, expected=(200,)):
+        body = urllib.parse.urlencode(data).encode('utf-8') if data is not None else None
+        started = time.perf_counter()
+        try:
+            response = self.opener.open(self.base_url + path, data=body, timeout=self.timeout)
+            status, headers = response.status, response.headers
+            response.read()
+        except urllib.error.HTTPError as e:  # Includes the 302s _NoRedirect hands back
+            status, headers = e.code, e.headers
+            e.read()
+        except (urllib.error.URLError, OSError):
+            status, headers = None, {}
+        elapsed = time.perf_counter() - started
+        ok = status in expected
+        self.stats.add(route, elapsed, ok)
+        return ok, headers
+
+    def submit_claim(self, claim_number):
+        name = f"Load Test {self.user_number} {claim_number}"
+        email = f"loadtest-{self.run_tag}-{self.user_number}-{claim_number}@example.com"
+        ok, _ = self.request('GET /', '/')
+        if not ok:
+            return False
+        ok, _ = self.request('POST /submit', '/submit', {
+            'field2_name': name, 'field2_address': '123 Main St', 'field2_city': 'Springfield', 'field2_state': 'VA',
+            'field2_zip': '22150', 'field3_type_employment': 'Civilian', 'field_pdf_4_dob': '1970-01-02',
+            'field_pdf_5_marital_status': 'Single', 'field_pdf_13b_phone': '5551234567',
+            'field8_basis_of_claim': '', 'field10_nature_of_injury': '', 'field12a_property_damage_amount': '0',
+            'field12b_personal_injury_amount': '90000', 'field12c_wrongful_death_amount': '0', 'user_email_address': email,
+        }, expected=(302,))
+        if not ok:
+            return False
+        ok, _ = self.request('GET /signature', '/signature')
+        if not ok:
+            return False
+        ok, headers = self.request('POST /signature', '/signature', {
+            'field17_signature_of_claimant': name, 'user_email_address': email,
+        }, expected=(302,))
+        location = headers.get('Location', '') if ok else ''
+        if '/success/' not in location:
+            return False
+        success_path = '/success/' + location.rsplit('/success/', 1)[1]
+        ok, _ = self.request('GET /success/<id>', success_path)
+        return ok
+
+    def run(self, claims):
+        completed = 0
+        for claim_number in range(claims):
+            if self.submit_claim(claim_number):
+                completed += 1
+        return completed
+
+
+def run_load_test(base_url, users, claims_per_user, ramp_seconds=0.0, timeout=30.0):
+    """Runs `users` concurrent users, each submitting `claims_per_user` claims. Returns (RouteStats, completed, seconds)."""
+    stats = RouteStats()
+    run_tag = uuid.uuid4().hex[:8]
+
+    def user_main(user_number):
+        if ramp_seconds and users > 1:
+            time.sleep(ramp_seconds * user_number / (users - 1))
+        return SimulatedUser(base_url, stats, user_number, run_tag, timeout).run(claims_per_user)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        completed = sum(executor.map(user_main, range(users)))
+    return stats, completed, time.perf_counter() - started
+
+
+def summarize(stats):
+    summary = {}
+    for route in ROUTES:
+        latencies = sorted(stats.latencies[route])
+        summary[route] = {
+            'requests': len(latencies),
+            'errors': stats.errors[route],
+            'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+            'max_ms': round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Drive the claim intake flow with concurrent simulated users.')
+    parser.add_argument('--base-url', default='http://127.0.0.1:61663', help='Server root, including any application prefix.')
+    parser.add_argument('--users', type=int, default=10, help='Concurrent simulated users.')
+    parser.add_argument('--claims-per-user', type=int, default=5, help='Claims each user submits, one after another.')
+    parser.add_argument('--ramp', type=float, default=0.0, help='Seconds over which users start (0 = all at once).')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds.')
+    parser.add_argument('--json', dest='json_path', default=None, help='Also write the per-route summary to this JSON file.')
+    args = parser.parse_args(argv)
+
+    stats, completed, elapsed = run_load_test(args.base_url, args.users, args.claims_per_user, args.ramp, args.timeout)
+    summary = summarize(stats)
+    attempted = args.users * args.claims_per_user
+    print(f"{completed}/{attempted} claims completed by {args.users} user(s) in {elapsed:.1f}s ({completed / elapsed if elapsed else 0:.1f} claims/s)")
+    print(f"{'route':<20} {'requests':>8} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for route, row in summary.items():
+        print(f"{route:<20} {row['requests']:>8} {row['errors']:>7} {row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9} {row['max_ms']:>9}")
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'users': args.users, 'claims_per_user': args.claims_per_user, 'completed': completed,
+                       'seconds': round(elapsed, 2), 'routes': summary}, f, indent=2)
+    return 0 if completed == attempted else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import BENCH_DATA_DIR, BENCH_SEED_CLAIMS
+
+CLAIMANT_NAME = 'Jane Q. Claimant'
+CLAIMANT_EMAIL = 'jane.claimant@example.com'
+SUBMISSION = {
+    'field2_name': CLAIMANT_NAME, 'field2_address': '123 Main St', 'field2_city': 'Springfield', 'field2_state': 'VA',
+    'field2_zip': '22150', 'field3_type_employment': 'Civilian', 'field_pdf_4_dob': '1970-01-02',
+    'field_pdf_5_marital_status': 'Married', 'field_pdf_13b_phone': '(555) 123-4567',
+    'field8_basis_of_claim': 'I was on the west terrace.', 'field10_nature_of_injury': '',
+    'field12a_property_damage_amount': '250', 'field12b_personal_injury_amount': '90000',
+    'field12c_wrongful_death_amount': '0', 'user_email_address': CLAIMANT_EMAIL,
+    'supplemental_question_1_capitol_experience': 'Arrived around noon.',
+}
+
+
+def fetch(test_client, url):
+    """GET url and read the whole body (streamed responses included), closing the response afterwards."""
+    response = test_client.get(url)
+    body = response.get_data()
+    response.close()
+    return response, body
+
+
+# --- Claim intake ---
+
+def test_submit(client, bench):
+    response = bench(lambda: client.post('/submit', data=SUBMISSION))
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/signature')
+
+
+def test_signature_finalization(client, bench):
+    # Every round finalizes a fresh step 1 submission
+    response = bench(lambda: client.post('/signature', data={'field17_signature_of_claimant': CLAIMANT_NAME, 'user_email_address': CLAIMANT_EMAIL}),
+                     setup=lambda: client.post('/submit', data=SUBMISSION))
+    assert response.status_code == 302
+    assert '/success/' in response.headers['Location']
+
+
+def test_map_form_data_to_pdf_fields(flask_app, bench):
+    form_data = dict(SUBMISSION, field12d_total_claim_amount='90250.00')
+    pdf_data = bench(lambda: [flask_app.map_form_data_to_pdf_fields(form_data) for _ in range(100)], rounds=50)[-1]
+    assert pdf_data['field2_claimant_info_combined'].startswith(CLAIMANT_NAME)
+
+
+# --- Admin with seeded claims ---
+
+def test_admin_page(admin_client, seeded_claims, bench):
+    response, body = bench(lambda: fetch(admin_client, '/admin'))
+    assert response.status_code == 200
+
+
+def test_admin_claims_first_page(admin_client, seeded_claims, bench):
+    response, _ = bench(lambda: fetch(admin_client, '/admin/claims.json'))
+    assert response.status_code == 200
+    assert response.get_json()['total'] >= BENCH_SEED_CLAIMS
+
+
+def test_admin_claims_filtered_sorted(admin_client, seeded_claims, bench):
+    url = '/admin/claims.json?state=PA&signature_status=signed&basis_deviation=1&sort=Claimant%20Name'
+    response, _ = bench(lambda: fetch(admin_client, url))
+    assert response.status_code == 200
+    assert response.get_json()['claims']
+
+
+def test_download_csv(admin_client, seeded_claims, bench):
+    response, body = bench(lambda: fetch(admin_client, '/download_csv'), rounds=5)
+    assert response.status_code == 200
+    assert body.count(b'\n') > BENCH_SEED_CLAIMS
+
+
+# --- PDF filling ---
+
+@pytest.fixture
+def pdf_data(flask_app):
+    return flask_app.map_form_data_to_pdf_fields(dict(SUBMISSION, field12d_total_claim_amount='90250.00'))
+
+
+def test_fill_sf95_pdf_python_backend(flask_app, pdf_data, bench):
+    output_path = os.path.join(BENCH_DATA_DIR, 'python_SF95.pdf')
+    result = bench(lambda: flask_app.fill_sf95_pdf(pdf_data, flask_app.PDF_TEMPLATE_PATH, output_path, backend='python', use_cache=False))
+    assert result == output_path
+
+
+def test_fill_sf95_pdf_stubbed_pdfcpu(flask_app, pdf_data, bench, monkeypatch):
+    # Everything around the pdfcpu process (payload, temp JSON, bookkeeping), with the process replaced by a copy
+    def fake_run(command, **kwargs):
+        shutil.copyfile(command[-3], command[-1])
+        return subprocess.CompletedProcess(command, 0, '', '')
+    monkeypatch.setattr('src.utils.pdf_filler.subprocess.run', fake_run)
+    output_path = os.path.join(BENCH_DATA_DIR, 'stubbed_pdfcpu_SF95.pdf')
+    result = bench(lambda: flask_app.fill_sf95_pdf(pdf_data, flask_app.PDF_TEMPLATE_PATH, output_path, backend='pdfcpu', use_cache=False))
+    assert result == output_path
+
+
+@pytest.mark.skipif(shutil.which('pdfcpu') is None, reason="pdfcpu binary not installed")
+def test_fill_sf95_pdf_pdfcpu(flask_app, pdf_data, bench):
+    output_path = os.path.join(BENCH_DATA_DIR, 'pdfcpu_SF95.pdf')
+    result = bench(lambda: flask_app.fill_sf95_pdf(pdf_data, flask_app.PDF_TEMPLATE_PATH, output_path, backend='pdfcpu', use_cache=False), rounds=5)
+    assert result == output_path
@@ -0,0 +1,29 @@
+"""
+Worker spawn latency: a fresh interpreter importing the app (what Passenger and gunicorn pay for every new worker
+before it can serve), and the same plus create_app() (logging, data directories and the schema check).
+"""
+import os
+import sys
+import subprocess
+
+from conftest import BASE_DIR, BENCH_DATA_DIR, BENCH_ROUNDS
+
+STARTUP_ROUNDS = min(BENCH_ROUNDS, 10)  # Each round is a whole interpreter start
+
+
+def _spawn(code):
+    env = dict(os.environ, PYTHONPATH=BASE_DIR)  # Same isolated DATABASE_PATH etc. as the other benchmarks
+    subprocess.run([sys.executable, '-c', code], cwd=BENCH_DATA_DIR, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def test_interpreter_baseline(bench):
+    bench(lambda: _spawn("pass"), rounds=STARTUP_ROUNDS)
+
+
+def test_import_app(bench):
+    bench(lambda: _spawn("import src.app"), rounds=STARTUP_ROUNDS)
+
+
+def test_import_and_create_app(bench, flask_app):
+    # flask_app has migrated the benchmark database, so the schema check only reads it
+    bench(lambda: _spawn("from src.app import create_app; create_app()"), rounds=STARTUP_ROUNDS)
@@ -0,0 +1,42 @@
+"""
+Production server profile for gunicorn, the alternative to Passenger (passenger_wsgi.py) on hosts we control:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The master imports the app once (preload_app), loads the parsed SF-95 template and field maps, then forks preforked
+workers that share them. Each worker opens its database connections and starts its render threads before taking
+traffic, and is recycled gracefully after about GUNICORN_MAX_REQUESTS requests. Every setting below can be changed
+through the environment.
+"""
+import os
+import multiprocessing
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))  # Request threads per worker (gthread)
+worker_class = 'gthread'
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1').lower() in ('1', 'true', 'yes')
+
+# Recycle each worker after this many requests; the jitter keeps them from all restarting at once
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))  # Time a recycled worker gets to finish its requests
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))  # Synchronous PDF renders can take a while
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None  # e.g. '-' for stdout; the app logs its own requests
+errorlog = os.environ.get('GUNICORN_ERROR_LOG', '-')
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    # Master, after the app is loaded and before the first fork
+    if preload_app:
+        from src.app import preload_shared_state
+        preload_shared_state()
+
+
+def post_fork(server, worker):
+    from src.app import warm_up_worker
+    warm_up_worker(connections=threads)
@@ -14,8 +14,10 @@ if project_directory not in sys.path:
 # Determine the path to the 'src' directory, where app.py is located
 src_directory = os.path.join(project_directory, 'src')
 
-# Import the Flask application instance
-from src.app import app as application
+# Build the Flask application (logging, data directories and the schema check run once here, per worker)
+from src.app import create_app, warm_up_worker
+application = create_app()
+warm_up_worker() # Open this process's database connections before its first request
 
 # Optionally set environment variables for production
 # os.environ['FLASK_ENV'] = 'production'
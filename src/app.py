@@ -11,24 +11,26 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 #     # This block is primarily for the temporary direct execution for DB setup.
 #     __package__ = "src"
 
-from src.utils.logging_config import setup_logging
-setup_logging(log_file='app.log')
 import sqlite3
 import os
+import json
+import hmac
+import time
+import random
 import logging
+import threading
+import click
 from datetime import datetime, timezone
-from flask import Flask, request, jsonify, render_template, redirect, url_for, flash, current_app, g, Response, session, send_from_directory
-from flask_session import Session
-from fillpdf import fillpdfs
+from flask import Flask, request, jsonify, render_template, redirect, url_for, flash, current_app, g, Response, session, send_from_directory, stream_with_context, before_render_template, template_rendered, appcontext_pushed
+from flask.logging import default_handler
 import re
 import io
 import csv
 from unicodedata import normalize
 from werkzeug.utils import secure_filename
-import pytz # Added for timezone conversion
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user # Added for Flask-Login
 from werkzeug.security import generate_password_hash, check_password_hash # Ensuring this is present
-from werkzeug.exceptions import abort
+from werkzeug.exceptions import abort, HTTPException
 
 from src.forms import LoginForm # Import the LoginForm (absolute import for direct execution)
 from dotenv import load_dotenv # Added
@@ -36,14 +38,31 @@ from dotenv import load_dotenv # Added
 load_dotenv() # Added: Load .env file from project root
 
 # Import utility functions
-from src.utils.pdf_filler import fill_sf95_pdf, DEFAULT_VALUES as PDF_FILLER_DEFAULTS
-from src.utils.helpers import get_db, create_tables_if_not_exist, is_safe_url, init_db, init_app_db, normalize_phone, format_phone, ensure_filled_pdf_filename_unique, force_recreate_claims_table # Added phone helpers and unique constraint
-from src.utils.logging_config import setup_logging
+from src.utils.pdf_filler import fill_sf95_pdf, fill_many, load_fill_config, DEFAULT_VALUES as PDF_FILLER_DEFAULTS
+from src.utils.pdf_engine import get_template
+from src.utils.field_mapping import FORM_FIELD_SPEC, compile_form_spec, run_form_pipeline
+from src.utils.render_queue import RenderQueue, JOB_PENDING_STATUSES
+from src.utils.pdf_cache import pdf_cache
+from src.utils.hot_queries import (
+    SQL_USER_BY_USERNAME, SQL_USER_ID_BY_USERNAME, SQL_CLAIM_ID_BY_CLAIMANT_NAME, SQL_CLAIM_BY_FILENAME,
+    SQL_CLAIM_EMAIL_BY_FILENAME, SQL_CLAIMS_NEWEST_FIRST
+)
+from src.utils.claims_query import build_admin_claims_query, build_admin_claims_count, encode_cursor, ADMIN_PAGE_SIZE
+from src.utils.boilerplate_texts import (
+    BOILERPLATE_COLUMNS, current_boilerplate_ids, interned_claim_texts, claimant_text, boilerplate_texts_by_id, stored_claim_text
+)
+from src.utils.helpers import get_db, db_pool, is_safe_url, init_app_db, normalize_phone, format_phone, DATABASE_PATH # Added phone helpers
+from src.utils.migrations import apply_migrations, current_schema_version, latest_schema_version
+from src.utils.logging_config import setup_logging, attach_handlers, logging_stats, log_event, EventTextFormatter
+from src.utils.ring_log import debug_ring_log, RingLogHandler
+from src.utils.datetime_display import format_datetime_columns
+from src.utils.session_store import SqliteSessionInterface
+from src.utils.synthetic_claims import insert_claims
+from src.utils.metrics import metrics, render_prometheus, reset_db_timing, db_timing
+from src.utils.profiling import StackSampler, profile_store, collapsed_stacks
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('FLASK_SECRET_KEY', 'f9a8b7c6d5e4f3a2b1c0d9e8f7a6b5c4d3e2f1a0b9c8d7e6f5a4b3c2d1e0f9a8') # Use environment variable or default
-app.config['SESSION_TYPE'] = 'filesystem'
-app.config['SESSION_FILE_DIR'] = './flask_session/' # Ensure this directory exists and is writable
 app.config['SESSION_COOKIE_DOMAIN'] = False  # Let Flask/Werkzeug decide for localhost
 app.config['SESSION_COOKIE_PATH'] = '/'
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'  # Try 'Lax' first, may try 'None' if needed
@@ -51,87 +70,139 @@ app.config['SESSION_COOKIE_SECURE'] = False  # for localhost be False for localh
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['FILLED_FORMS_DIR'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'filled_forms')
 app.config['APPLICATION_ROOT'] = '/west-plaza-lawsuit' # Added
-app.debug = True  # Enable debug mode for detailed error output (disable in production)
-
-# --- Database Schema (needed by create_tables_if_not_exist) ---
-DB_SCHEMA = [
-    'field1_agency TEXT',
-    'field2_name TEXT',
-    'field2_address TEXT',
-    'field2_city TEXT',
-    'field2_state TEXT',
-    'field2_zip TEXT',
-    'field3_type_employment TEXT',
-    'field_pdf_4_dob TEXT',
-    'field_pdf_5_marital_status TEXT',
-    'field6_checkbox_military TEXT',
-    'field7_checkbox_civilian TEXT',
-    'field8_basis_of_claim TEXT',
-    'field9_property_damage_description TEXT',
-    'field10_nature_of_injury TEXT',
-    'field11_witness_name_1 TEXT',
-    'field11_witness_address_1 TEXT',
-    'field11_witness_name_2 TEXT',
-    'field11_witness_address_2 TEXT',
-    'field12a_property_damage_amount TEXT',
-    'field12b_personal_injury_amount TEXT',
-    'field12c_wrongful_death_amount TEXT',
-    'field12d_total_claim_amount TEXT',
-    'field13a_signature TEXT',
-    'field_pdf_13b_phone TEXT',
-    'field14_date_signed TEXT',
-    'user_email_address TEXT',
-    'supplemental_question_1_capitol_experience TEXT',
-    'supplemental_question_2_injuries_damages TEXT',
-    'supplemental_question_3_entry_exit_time TEXT',
-    'supplemental_question_4_inside_capitol_details TEXT',
-    'filled_pdf_filename TEXT UNIQUE NOT NULL',
-    'field17_signature_of_claimant TEXT',
-    'field18_date_of_signature TEXT',
-    'created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP',
-    'updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP'
-]
-
-# Ensure the data directory exists before DB access
-_data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
-if not os.path.exists(_data_dir):
-    os.makedirs(_data_dir, exist_ok=True)
-
-
-# Ensure unique constraint for filled_pdf_filename (must be in app context)
-def enforce_unique_constraint():
-    with app.app_context():
-        ensure_filled_pdf_filename_unique()
-enforce_unique_constraint()
-# Ensure session directory exists
-if not os.path.exists(app.config['SESSION_FILE_DIR']):
-    try:
-        os.makedirs(app.config['SESSION_FILE_DIR'])
-        app.logger.info(f"Created session directory: {app.config['SESSION_FILE_DIR']}")
-    except Exception as e:
-        app.logger.error(f"Error creating session directory {app.config['SESSION_FILE_DIR']}: {e}")
-        # Decide if this error is critical enough to raise
-
-# Ensure filled forms directory exists
-if not os.path.exists(app.config['FILLED_FORMS_DIR']):
-    try:
-        os.makedirs(app.config['FILLED_FORMS_DIR'])
-        app.logger.info(f"Created filled forms directory: {app.config['FILLED_FORMS_DIR']}")
-    except Exception as e:
-        app.logger.error(f"Error creating filled forms directory {app.config['FILLED_FORMS_DIR']}: {e}")
-        # Decide if this error is critical enough to raise
-
-# Call init_app_db to register teardown context
+app.config['PDF_RENDER_WORKERS'] = int(os.environ.get('PDF_RENDER_WORKERS', 2)) # Render threads per process
+app.config['PDF_RENDER_MAX_ATTEMPTS'] = int(os.environ.get('PDF_RENDER_MAX_ATTEMPTS', 3))
+app.config['PDF_RENDER_WAIT_SECONDS'] = float(os.environ.get('PDF_RENDER_WAIT_SECONDS', 20)) # How long a download waits for a pending render
+app.config['SESSION_DB_PATH'] = os.environ.get('SESSION_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(DATABASE_PATH)), 'sessions.db')) # Server-side sessions
+app.config['AUTO_MIGRATE'] = os.environ.get('AUTO_MIGRATE', '0').lower() in ('1', 'true', 'yes') # Apply pending migrations at startup instead of refusing
+app.debug = os.environ.get('FLASK_DEBUG', '0').lower() in ('1', 'true', 'yes')  # Debug mode only when asked for; `python3 app.py` always runs with it
+
+# Call init_app_db to register teardown context (returns pooled connections; must precede any app context use)
 init_app_db(app)
 
-Session(app) # Initialize Flask-Session
+# Initial values of the claim form (step 1); also a session-store default, so sessions only keep what differs
+HTML_FORM_DEFAULTS = {
+    'field1_agency': '', # Let user type, PDF_FILLER_DEFAULTS will handle if empty at PDF gen
+    'field2_name': '',
+    'field2_address': '',
+    'field2_city': '',
+    'field2_state': '',
+    'field2_zip': '',
+    'field3_type_employment': 'Civilian', # Default to Civilian
+    'field_pdf_4_dob': '',
+    'field_pdf_5_marital_status': '', # Assuming it's a dropdown/radio
+    'field_pdf_13b_phone': '',
+    'field8_basis_of_claim': '',
+    'field9_property_damage_description': '',
+    'field10_nature_of_injury': '',
+    'field11_witness_name_1': '',
+    'field11_witness_address_1': '',
+    'field11_witness_name_2': '',
+    'field11_witness_address_2': '',
+    'field12a_property_damage_amount': '0',
+    'field12b_personal_injury_amount': '90000',
+    'field12c_wrongful_death_amount': '0',
+    'field12d_total_claim_amount': '0',
+    'user_email_address': '',
+    'supplemental_question_1_capitol_experience': '',
+    'supplemental_question_2_injuries_damages': '',
+    'supplemental_question_3_entry_exit_time': '',
+    'supplemental_question_4_inside_capitol_details': ''
+}
+
+# Sessions live server-side in SQLite (SESSION_DB_PATH); the cookie only carries the session id
+def build_session_interface(session_db_path):
+    return SqliteSessionInterface(session_db_path, defaults={
+        'html_form_defaults': HTML_FORM_DEFAULTS,
+        'pdf_filler_defaults': PDF_FILLER_DEFAULTS,
+    })
+
+app.session_interface = build_session_interface(app.config['SESSION_DB_PATH'])
+
+# Form data -> PDF data, compiled once from the declarative spec
+FORM_TO_PDF_PIPELINE = compile_form_spec(FORM_FIELD_SPEC, PDF_FILLER_DEFAULTS)
 
 # --- Configuration (Constants needed before initialization logic) ---
-from src.utils.helpers import DATABASE_PATH
 DATABASE = DATABASE_PATH
 PDF_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'sf95.pdf') # Corrected template filename
 
-# --- Database Schema (needed by create_tables_if_not_exist) ---
+# --- Background PDF rendering ---
+# Requests only enqueue renders; worker threads start on the first request of each process
+render_queue = RenderQueue(DATABASE, workers=app.config['PDF_RENDER_WORKERS'], max_attempts=app.config['PDF_RENDER_MAX_ATTEMPTS'])
+MAX_SESSION_RENDER_JOBS = 10 # Render job ids remembered per session for render_status
+
+@app.before_request
+def start_render_queue():
+    render_queue.start()
+
+# --- Request metrics (served at /metrics, see src/utils/metrics.py) ---
+# Session load/save, PDF fills and the pdfcpu process are timed where they happen; these hooks time the request
+# as a whole, the SQLite calls made during it and each template render.
+app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN', '') # /metrics accepts 'Authorization: Bearer <token>' or an admin login
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    reset_db_timing()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.endpoint or 'unmatched' # Unrouted paths share one label instead of one series per URL
+        metrics.observe('request_duration_seconds', time.perf_counter() - started, endpoint=endpoint, method=request.method, status=response.status_code)
+        db_seconds, db_calls = db_timing()
+        metrics.observe('request_db_seconds', db_seconds, endpoint=endpoint)
+        metrics.inc('db_queries_total', db_calls, endpoint=endpoint)
+        metrics.flush()
+    return response
+
+def _template_render_started(sender, template, context, **extra):
+    g.setdefault('template_render_starts', []).append(time.perf_counter())
+
+def _template_render_finished(sender, template, context, **extra):
+    starts = g.get('template_render_starts')
+    if starts:
+        metrics.observe('template_render_seconds', time.perf_counter() - starts.pop(), template=template.name or 'string')
+
+before_render_template.connect(_template_render_started, app)
+template_rendered.connect(_template_render_finished, app)
+
+# --- On-demand profiling (listed at /superadmin/profiles, see src/utils/profiling.py) ---
+# Requests to PROFILE_ENDPOINTS are stack-sampled when PROFILING_ENABLED is set, or when they carry
+# 'X-Profile-Token: <PROFILE_TOKEN>'; only the ones slower than PROFILE_THRESHOLD_MS are saved.
+app.config['PROFILING_ENABLED'] = os.environ.get('PROFILING_ENABLED', '0').lower() in ('1', 'true', 'yes')
+app.config['PROFILE_TOKEN'] = os.environ.get('PROFILE_TOKEN', '') # Empty disables the header
+app.config['PROFILE_THRESHOLD_MS'] = float(os.environ.get('PROFILE_THRESHOLD_MS', 500))
+app.config['PROFILE_ENDPOINTS'] = [name.strip() for name in os.environ.get('PROFILE_ENDPOINTS', 'submit_form,signature,admin_view').split(',') if name.strip()]
+
+def _profiling_requested():
+    if request.endpoint not in app.config['PROFILE_ENDPOINTS']:
+        return False
+    if app.config['PROFILING_ENABLED']:
+        return True
+    token = app.config['PROFILE_TOKEN']
+    return bool(token) and hmac.compare_digest(request.headers.get('X-Profile-Token', ''), token)
+
+@app.before_request
+def start_request_profile():
+    if _profiling_requested():
+        g.request_profiler = StackSampler().start()
+        g.request_profile_started = time.perf_counter()
+
+@app.teardown_request
+def finish_request_profile(exc=None):
+    sampler = g.pop('request_profiler', None)
+    if sampler is None:
+        return
+    duration = time.perf_counter() - g.pop('request_profile_started')
+    stacks = sampler.stop()
+    if duration * 1000 >= app.config['PROFILE_THRESHOLD_MS']:
+        name = profile_store.save(request.endpoint, request.method, request.path, duration, sampler.interval, stacks, sampler.samples)
+        if name:
+            app.logger.info(f"Saved profile {name} of {request.method} {request.path} ({duration * 1000:.0f} ms, {sampler.samples} samples).")
+
+# --- Claim columns saved from the form (the table itself is defined by src/migrations) ---
 DB_SCHEMA = [
     'field1_agency TEXT',
     'field2_name TEXT',
@@ -144,9 +215,13 @@ DB_SCHEMA = [
     'field_pdf_5_marital_status TEXT',
     'field6_checkbox_military TEXT',
     'field7_checkbox_civilian TEXT',
-    'field8_basis_of_claim TEXT',
+    'field8_basis_of_claim TEXT',  # Claimant's addition only; the boilerplate is in boilerplate_texts
+    'field8_boilerplate_id INTEGER',
+    'field8_deviates_from_boilerplate INTEGER',
     'field9_property_damage_description TEXT',
     'field10_nature_of_injury TEXT',
+    'field10_boilerplate_id INTEGER',
+    'field10_deviates_from_boilerplate INTEGER',
     'field11_witness_name_1 TEXT',
     'field11_witness_address_1 TEXT',
     'field11_witness_name_2 TEXT',
@@ -171,99 +246,23 @@ DB_SCHEMA = [
 ]
 
 # --- Database Helper Functions (defined before use in initialization) ---
-def get_db():
-    if 'db' not in g:
-        g.db = sqlite3.connect(DATABASE, detect_types=sqlite3.PARSE_DECLTYPES)
-        g.db.row_factory = sqlite3.Row
-    return g.db
-
-@app.teardown_appcontext
-def close_connection(exception):
-    db = getattr(g, '_database', None)
-    if db is not None:
-        db.close()
-
-def table_exists(cursor, table_name, logger):
-    logger.debug(f"Checking if table '{table_name}' exists.")
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
-    exists = cursor.fetchone() is not None
-    logger.debug(f"Table '{table_name}' exists: {exists}")
-    return exists
-
-def create_tables_if_not_exist(logger): # Accept logger
-    logger.info("Entered create_tables_if_not_exist function.")
-    db = get_db()
-    cursor = db.cursor()
-    logger.info("Successfully obtained DB cursor.")
-
-    table_name = 'claims'
-    logger.info(f"Checking '{table_name}' table. Exists: {table_exists(cursor, table_name, logger)}")
+# get_db() comes from src.utils.helpers: it borrows a pooled connection, returned by close_db at teardown
 
-    if not table_exists(cursor, table_name, logger):
-        columns_sql_parts = ["id INTEGER PRIMARY KEY AUTOINCREMENT"] + DB_SCHEMA
-        columns_sql = ', '.join(columns_sql_parts)
-        create_table_sql = f"CREATE TABLE {table_name} ({columns_sql})"
-        logger.info(f"Creating '{table_name}' table with SQL: {create_table_sql}")
-        cursor.execute(create_table_sql)
-        db.commit()
-        logger.info(f"'{table_name}' table created successfully.")
-    else:
-        logger.info(f"'{table_name}' table exists. Checking for missing columns based on DB_SCHEMA.")
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        existing_columns_info = cursor.fetchall()
-        existing_column_names = [col_info['name'] for col_info in existing_columns_info]
-        logger.info(f"Existing columns in '{table_name}': {existing_column_names}")
-        logger.info(f"DB_SCHEMA to check against: {DB_SCHEMA}")
-
-        schema_column_definitions = {}
-        for col_def_str in DB_SCHEMA:
-            col_name = col_def_str.strip().split(' ')[0]
-            schema_column_definitions[col_name] = col_def_str.strip()
-        logger.info(f"Parsed schema column definitions from DB_SCHEMA: {schema_column_definitions}")
-
-        columns_added_count = 0
-        for schema_col_name, full_col_definition in schema_column_definitions.items():
-            if schema_col_name not in existing_column_names:
-                col_definition_for_alter = full_col_definition
-                if schema_col_name in ['created_at', 'updated_at'] and 'DEFAULT CURRENT_TIMESTAMP' in full_col_definition.upper():
-                    col_definition_for_alter = f"{schema_col_name} TIMESTAMP"
-                    logger.info(f"Column '{schema_col_name}' is missing. Will be added with simplified definition for ALTER: '{col_definition_for_alter}'")
-                else:
-                    logger.info(f"Column '{schema_col_name}' is missing. Attempting to add with definition: '{full_col_definition}'")
-                
-                try:
-                    alter_sql = f"ALTER TABLE {table_name} ADD COLUMN {col_definition_for_alter}"
-                    logger.info(f"Executing ALTER TABLE SQL: {alter_sql}")
-                    cursor.execute(alter_sql)
-                    db.commit()
-                    logger.info(f"Successfully added column '{schema_col_name}' to '{table_name}'.")
-                    columns_added_count += 1
-                except sqlite3.Error as e:
-                    logger.error(f"Error adding column {full_col_definition} to '{table_name}' table: {e}. Existing columns were: {existing_column_names}")
-        
-        if columns_added_count > 0:
-            logger.info(f"Added {columns_added_count} missing column(s) to '{table_name}'.")
+def check_schema_version(logger):
+    """Startup check: compares the database's schema_version with the newest migration. Never alters the schema."""
+    db = get_db()
+    version = current_schema_version(db)
+    latest = latest_schema_version()
+    if version < latest:
+        if app.config['AUTO_MIGRATE']:
+            applied = apply_migrations(db, logger)
+            logger.info(f"AUTO_MIGRATE applied {len(applied)} migration(s); schema now at version {latest}.")
         else:
-            logger.info(f"'{table_name}' table schema appears up to date with DB_SCHEMA. No columns were added.")
-
-    # Create 'users' table if it doesn't exist
-    if not table_exists(cursor, 'users', logger):
-        create_users_table_sql = """
-        CREATE TABLE users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL
-        );
-        """
-        logger.info("Creating 'users' table.")
-        cursor.execute(create_users_table_sql)
-        # Optionally, create a default admin user here if one doesn't exist
-        # For simplicity, we'll handle admin user creation separately for now or via a script.
-        logger.info("'users' table created successfully.")
+            logger.error(f"Database schema is at version {version} but the code expects {latest}. Run `flask --app src.app migrate-db`.")
+    elif version > latest:
+        logger.error(f"Database schema version {version} is newer than this code ({latest}); deploy the matching release.")
     else:
-        logger.info("'users' table already exists.")
-
-    logger.info("Exiting create_tables_if_not_exist function.")
+        logger.info(f"Database schema is up to date (version {version}).")
 
 # --- User Model ---
 class User(UserMixin):
@@ -291,8 +290,8 @@ class User(UserMixin):
     def get_by_username(username):
         db = get_db()
         cursor = db.cursor()
-        username_lower = username.lower()
-        user_data = cursor.execute('SELECT * FROM users WHERE LOWER(username) = ?', (username_lower,)).fetchone()
+        username_lower = username.strip().lower()
+        user_data = cursor.execute(SQL_USER_BY_USERNAME, (username_lower,)).fetchone()
         if user_data:
             role = user_data['role'] if 'role' in user_data.keys() else 'user'
             return User(id=user_data['id'], username=user_data['username'], password_hash=user_data['password_hash'], role=role)
@@ -313,7 +312,7 @@ class User(UserMixin):
         db = get_db()
         cursor = db.cursor()
         try:
-            cursor.execute('INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)', (username, generate_password_hash(password), role))
+            cursor.execute('INSERT INTO users (username, username_lower, password_hash, role) VALUES (?, ?, ?, ?)', (username, username.strip().lower(), generate_password_hash(password), role))
             db.commit()
             return True
         except sqlite3.IntegrityError as e:
@@ -333,69 +332,112 @@ login_manager.login_message_category = 'info'
 def load_user(user_id):
     return User.get_by_id(int(user_id))
 
-# Centralized app initialization function
-def initialize_application_internals(flask_app_object):
-    if flask_app_object:
-        # 0. Setup logging (File and Console)
-        # Use a log file relative to the current file's directory (project root on server)
-        log_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'debugging-logs.txt')
-        log_dir = os.path.dirname(log_file_path)
-        if not os.path.exists(log_dir) and log_dir:
-            os.makedirs(log_dir, exist_ok=True)
-
-        # Configure file handler
-        file_handler = logging.FileHandler(log_file_path)
-        file_handler.setLevel(logging.INFO) # Log INFO and above to file
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        flask_app_object.logger.addHandler(file_handler)
-
-        # Configure console handler (to still see logs in terminal)
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.DEBUG) # Show DEBUG and above in console
-        console_handler.setFormatter(formatter) # Can use the same or different formatter
-        flask_app_object.logger.addHandler(console_handler)
-
-        # Set the app logger's level (if not set by default)
-        # This ensures that messages of this level and above are processed by handlers.
-        flask_app_object.logger.setLevel(logging.DEBUG) # Process all messages from DEBUG upwards
-        
-        flask_app_object.logger.info("Custom logging initialized for file and console.")
-
-    # 1. Ensure necessary directories exist (e.g., for SQLite DB, filled forms)
-    data_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
-    if not os.path.exists(data_dir_path):
+# --- Application setup (once per process) ---
+# Importing this module only defines the app, its routes, hooks and commands. Logging, the data directories and the
+# schema check are set up by initialize_application_internals, exactly once per process: from create_app() (the WSGI
+# entry points) or, when the module-level app is used directly (`flask --app src.app`, tests), when its first app
+# context is pushed. Schema changes only ever happen through `flask migrate-db` / `init-db` (or AUTO_MIGRATE).
+def initialize_application_internals(flask_app_object, check_schema=True):
+    # 0. Logging: app.log and the console for every logger (root), plus the ring-buffer debug log for the app's own
+    # logger. The app logger propagates to root, so it gets no console handler of its own.
+    # The debug log is a fixed-size ring file (DEBUG_LOG_PATH); read it with `flask --app src.app debug-log`
+    setup_logging(log_file='app.log')
+    flask_app_object.logger.removeHandler(default_handler)
+    ring_handler = RingLogHandler(debug_ring_log)
+    ring_handler.setLevel(logging.INFO) # Log INFO and above to the debug log
+    ring_handler.setFormatter(EventTextFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    # Runs on the background log listener, so request threads never wait on the disk
+    attach_handlers(flask_app_object.logger, [ring_handler])
+    flask_app_object.logger.setLevel(logging.DEBUG) # Process all messages from DEBUG upwards
+    flask_app_object.logger.info(f"Logging initialized; using DATABASE_PATH {os.path.abspath(DATABASE)}.")
+
+    # 1. Directories for filled forms (the database directory is created by its connection pool)
+    try:
+        os.makedirs(flask_app_object.config['FILLED_FORMS_DIR'], exist_ok=True)
+    except OSError as e:
+        flask_app_object.logger.error(f"Error creating filled forms directory {flask_app_object.config['FILLED_FORMS_DIR']}: {e}")
+
+    # 2. Database schema check (needs application context); CLI commands skip it
+    if not check_schema:
+        return
+    with flask_app_object.app_context():
         try:
-            os.makedirs(data_dir_path)
-            if flask_app_object:
-                flask_app_object.logger.info(f"Created data directory: {data_dir_path}")
-            else:
-                print(f"Created data directory: {data_dir_path}") # Fallback if no app object
+            # Only reads schema_version; migrations are applied by `flask migrate-db` (or AUTO_MIGRATE)
+            check_schema_version(flask_app_object.logger)
         except Exception as e:
-            if flask_app_object:
-                flask_app_object.logger.error(f"Error creating data directory {data_dir_path}: {e}")
-            else:
-                print(f"Error creating data directory {data_dir_path}: {e}") # Fallback
-            # Decide if this error is critical enough to raise
+            flask_app_object.logger.error(f"Error during database setup in app context: {e}")
+
+_app_init_lock = threading.RLock()
+_app_init_state = {'done': False, 'running': False}
+
+def ensure_app_initialized(flask_app_object=None, check_schema=True):
+    """Runs initialize_application_internals once per process; later calls (and calls made during it) return at once."""
+    if _app_init_state['done']:
+        return
+    with _app_init_lock:
+        if _app_init_state['done'] or _app_init_state['running']:
+            return # Already done, or this thread is inside the setup (which pushes an app context of its own)
+        _app_init_state['running'] = True
+        try:
+            initialize_application_internals(flask_app_object or app, check_schema=check_schema)
+        finally:
+            _app_init_state['running'] = False
+            _app_init_state['done'] = True
 
-    # 2. Database schema check/initialization (needs application context)
-    if flask_app_object:
-        with flask_app_object.app_context():
-            try:
-                # Pass the Flask app's logger to the database function
-                create_tables_if_not_exist(flask_app_object.logger) # This logger will now use the handlers we set up
-                flask_app_object.logger.info("Database schema checked/initialized successfully (within app context).")
-            except Exception as e:
-                flask_app_object.logger.error(f"Error during database setup in app context: {e}")
-                # Depending on the app's needs, you might want to raise this error
-                # to prevent the app from starting with a non-functional database.
-                # raise # Uncomment if startup should fail on DB error
-    else:
-        # Handle case where flask_app_object is None, if that's possible in your flow
-        print("initialize_application_internals: flask_app_object is None, skipping DB and advanced logging setup.")
+def _initialize_on_first_app_context(sender, **extra):
+    # CLI commands skip the startup schema check: `flask migrate-db` / `init-db` are about to migrate the schema
+    # anyway, and the `flask` group pushes this context before it knows which command will run
+    ensure_app_initialized(sender, check_schema=click.get_current_context(silent=True) is None)
+
+appcontext_pushed.connect(_initialize_on_first_app_context, app)
 
-# Call the centralized initialization function AFTER all helpers and constants are defined
-initialize_application_internals(app)
+def create_app(config=None):
+    """
+    Application factory for the WSGI entry points and tests: applies `config` (a dict of app.config keys, e.g.
+    TESTING, FILLED_FORMS_DIR or SESSION_DB_PATH) over the environment-based defaults, runs the one-time setup and
+    returns the app. Database, log and cache locations are read from the environment (DATABASE_PATH, DEBUG_LOG_PATH,
+    PDF_CACHE_DIR, ...) when the modules are imported.
+    """
+    if config:
+        app.config.update(config)
+        if 'SESSION_DB_PATH' in config:
+            app.session_interface = build_session_interface(app.config['SESSION_DB_PATH'])
+    ensure_app_initialized(app)
+    return app
+
+# --- Production serving (gunicorn.conf.py, passenger_wsgi.py) ---
+
+def preload_shared_state():
+    """
+    Loads what each worker would otherwise load for its first PDF (the field map and compiled payload pipeline, the
+    parsed SF-95 template and its cache digest). gunicorn calls this in the master before forking, so every worker
+    starts with them, shared copy-on-write.
+    """
+    try:
+        load_fill_config()
+        get_template(PDF_TEMPLATE_PATH)
+        pdf_cache.template_digest(os.path.abspath(PDF_TEMPLATE_PATH))
+        app.logger.info(f"Preloaded the PDF template and field map in process {os.getpid()}.")
+    except Exception as e:
+        app.logger.error(f"Preloading the PDF template and field map failed (workers will load them on demand): {e}")
+    # Connections the master opened (the schema check) are not handed down to the workers
+    db_pool.close_all()
+    app.session_interface.pool.close_all()
+
+def warm_up_worker(connections=1):
+    """
+    Prepares a freshly started worker before its first request: runs the one-time setup, opens `connections` pooled
+    database and session connections (one per request thread) and starts the PDF render threads. Never raises.
+    """
+    started = time.perf_counter()
+    ensure_app_initialized(app)
+    try:
+        opened = db_pool.warm(connections)
+        app.session_interface.warm_up(connections)
+        render_queue.start()
+        app.logger.info(f"Worker {os.getpid()} warmed up with {opened} database connection(s) in {(time.perf_counter() - started) * 1000:.0f} ms.")
+    except Exception as e:
+        app.logger.error(f"Warming up worker {os.getpid()} failed (connections will open on demand): {e}")
 
 # --- Utility Functions (like slugify, PDF field mapping, etc. - can be here or imported) ---
 
@@ -404,21 +446,13 @@ import traceback
 # --- GLOBAL ERROR HANDLER ---
 @app.errorhandler(Exception)
 def handle_unhandled_exception(e):
+    if isinstance(e, HTTPException):
+        return e # abort(401/403/404) keeps its status instead of becoming a 500
     # Log to Flask logger
     app.logger.error(f"[GLOBAL ERROR HANDLER] Unhandled Exception: {e}\n{traceback.format_exc()}")
-    # Attempt to log to file with 1000 line limit (same as your custom function)
-    LOG_PATH = 'debugging-logs.txt'
-    MAX_LINES = 1000
+    # Also keep it in the ring-buffer debug log
     try:
-        if os.path.exists(LOG_PATH):
-            with open(LOG_PATH, 'r') as f:
-                lines = f.readlines()
-        else:
-            lines = []
-        lines.append(f"[GLOBAL ERROR HANDLER] {e}\n{traceback.format_exc()}\n")
-        lines = lines[-MAX_LINES:]
-        with open(LOG_PATH, 'w') as f:
-            f.writelines(lines)
+        debug_ring_log.append(f"[GLOBAL ERROR HANDLER] {e}\n{traceback.format_exc()}")
     except Exception as log_exc:
         app.logger.error(f"[GLOBAL ERROR HANDLER] Failed to log exception to file: {log_exc}")
     return "Internal Server Error", 500
@@ -470,66 +504,9 @@ DESIRED_COLUMNS_ORDER_AND_HEADERS = [
     ('field18_date_of_signature', 'Date and Time Signed'), # Added for date signed
 ]
 
-# --- Timezone Helper --- 
-def format_datetime_for_display(utc_datetime_input, target_tz_str='America/New_York'):
-    """Formats a UTC datetime string or object for display in a target timezone.
-    Handles 'YYYY-MM-DDTHH:MM' and 'YYYY-MM-DD HH:MM:SS' formats, and datetime objects.
-    Returns 'MM/DD/YYYY hh:mm AM/PM' or 'Pending' if input is invalid/None.
-    """
-    if not utc_datetime_input: # Handles None, empty string
-        return "Pending"
-
-    current_app.logger.info(f"format_datetime_for_display: Received input '{utc_datetime_input}' of type {type(utc_datetime_input)}")
-
-    try:
-        parsed_dt = None
-        if isinstance(utc_datetime_input, datetime): # Check if input is already a datetime object
-            current_app.logger.info(f"format_datetime_for_display: Input is already a datetime object: {utc_datetime_input}. Assuming naive UTC.")
-            parsed_dt = utc_datetime_input # Use it directly
-        elif isinstance(utc_datetime_input, str):
-            utc_datetime_str = utc_datetime_input # It's a string, proceed with parsing
-            if 'T' in utc_datetime_str:
-                current_app.logger.info(f"format_datetime_for_display: Detected 'T' in '{utc_datetime_str}', attempting T-specific parsing.")
-                try:
-                    parsed_dt = datetime.strptime(utc_datetime_str, '%Y-%m-%dT%H:%M:%S')
-                    current_app.logger.info(f"format_datetime_for_display: Parsed with 'T' and seconds: {parsed_dt}")
-                except ValueError:
-                    current_app.logger.info(f"format_datetime_for_display: Failed 'T' with seconds, trying 'T' without seconds for '{utc_datetime_str}'.")
-                    parsed_dt = datetime.strptime(utc_datetime_str, '%Y-%m-%dT%H:%M')
-                    current_app.logger.info(f"format_datetime_for_display: Parsed with 'T' without seconds: {parsed_dt}")
-            else:
-                current_app.logger.info(f"format_datetime_for_display: No 'T' in '{utc_datetime_str}', attempting non-T parsing.")
-                try:
-                    current_app.logger.info(f"format_datetime_for_display: Trying to parse '{utc_datetime_str}' with milliseconds...")
-                    parsed_dt = datetime.strptime(utc_datetime_str, '%Y-%m-%d %H:%M:%S.%f')
-                    current_app.logger.info(f"format_datetime_for_display: Parsed non-T with milliseconds: {parsed_dt}")
-                except ValueError as e_ms:
-                    current_app.logger.info(f"format_datetime_for_display: Failed non-T with milliseconds for '{utc_datetime_str}': {e_ms}. Trying without milliseconds...")
-                    try:
-                        parsed_dt = datetime.strptime(utc_datetime_str, '%Y-%m-%d %H:%M:%S')
-                        current_app.logger.info(f"format_datetime_for_display: Parsed non-T without milliseconds: {parsed_dt}")
-                    except ValueError as e_no_ms:
-                        current_app.logger.error(f"format_datetime_for_display: Failed to parse non-T ('{utc_datetime_str}') without milliseconds either: {e_no_ms}")
-                        raise # Re-raise to hit the outer exception handler
-        else:
-            current_app.logger.error(f"format_datetime_for_display: Input '{utc_datetime_input}' is neither a string nor a datetime object. Type: {type(utc_datetime_input)}")
-            return str(utc_datetime_input) # Fallback for unexpected types
-
-        if parsed_dt is None:
-            current_app.logger.error(f"format_datetime_for_display: parsed_dt is None after attempting to process input '{utc_datetime_input}'. This should not happen.")
-            return str(utc_datetime_input) # Fallback
-            
-        current_app.logger.info(f"format_datetime_for_display: Successfully processed input. Parsed datetime: {parsed_dt}. Localizing to UTC.")
-        utc_dt_aware = pytz.utc.localize(parsed_dt)
-        current_app.logger.info(f"format_datetime_for_display: Localized to UTC: {utc_dt_aware}. Converting to target timezone '{target_tz_str}'.")
-        target_tz = pytz.timezone(target_tz_str)
-        target_dt_aware = utc_dt_aware.astimezone(target_tz)
-        formatted_output = target_dt_aware.strftime('%m/%d/%Y %I:%M %p')
-        current_app.logger.info(f"format_datetime_for_display: Converted to target timezone: {target_dt_aware}. Formatted output: {formatted_output}")
-        return formatted_output
-    except Exception as e:
-        current_app.logger.error(f"format_datetime_for_display: General error converting datetime input '{utc_datetime_input}': {e}")
-        return str(utc_datetime_input) # Return string representation of original on error
+# Timestamp columns in the table above -> the UTC epoch column they are displayed from (formatted per page/batch
+# with format_datetime_columns; see src/migrations/0005_claim_epoch_timestamps.py)
+DISPLAY_DATETIME_COLUMNS = {'created_at': 'created_at_epoch', 'field18_date_of_signature': 'signed_at_epoch'}
 
 # --- Admin Required Decorator ---
 from flask_login import login_required, current_user
@@ -564,6 +541,29 @@ def superadmin():
     users = [dict(user) for user in users]
     return render_template('superadmin.html', users=users)
 
+@app.route('/superadmin/profiles')
+@login_required
+@superadmin_required
+def superadmin_profiles():
+    profiles = profile_store.list()
+    for profile in profiles:
+        profile['recorded_at_display'] = datetime.fromtimestamp(profile['recorded_at'], timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    return render_template('superadmin_profiles.html', profiles=profiles,
+                           profiling_enabled=app.config['PROFILING_ENABLED'],
+                           threshold_ms=app.config['PROFILE_THRESHOLD_MS'],
+                           endpoints=app.config['PROFILE_ENDPOINTS'])
+
+@app.route('/superadmin/profiles/<name>.folded')
+@login_required
+@superadmin_required
+def download_profile(name):
+    """One saved profile as collapsed stacks, for flamegraph.pl / speedscope."""
+    profile = profile_store.load(f"{name}.json")
+    if profile is None:
+        abort(404)
+    return Response(collapsed_stacks(profile), mimetype='text/plain',
+                    headers={'Content-Disposition': f'attachment; filename="{name}.folded"'})
+
 @app.route('/add_user', methods=['GET', 'POST'])
 @login_required
 @superadmin_required
@@ -655,6 +655,10 @@ def edit_claim(claim_id):
             current_app.logger.error(f"EDIT_CLAIM: Error recalculating total claim amount: {e}")
             # Optionally: fallback to original value or clear
             form_data['field12d_total_claim_amount'] = form_data.get('field12d_total_claim_amount', '')
+        # Boxes 8 and 10 hold the claimant's own text; it stays against the boilerplate version the claim was filed
+        # with (or stays whole if it replaced the boilerplate), and the deviation flag follows the edit
+        form_data.update(interned_claim_texts({field: form_data[field] for field in BOILERPLATE_COLUMNS if field in form_data},
+                                              {field: claim[id_column] for field, (id_column, _) in BOILERPLATE_COLUMNS.items()}))
         update_fields = []
         update_values = []
         for key in claim.keys():
@@ -684,6 +688,8 @@ def edit_claim(claim_id):
     # GET: Render form with claim data
     # Map DB row to form_data dict expected by form.html
     form_data = dict(claim)
+    for field in BOILERPLATE_COLUMNS:
+        form_data[field] = claimant_text(claim, field)
     # If phone number, format for display
     if 'field_pdf_13b_phone' in form_data:
         form_data['field_pdf_13b_phone'] = format_phone(form_data['field_pdf_13b_phone'])
@@ -699,34 +705,7 @@ def form():
     try:
         today_date = datetime.today().strftime('%Y-%m-%d')
         # Persist form data across navigation: always use latest session data or defaults
-        html_form_defaults = session.get('html_form_defaults', {
-            'field1_agency': '', # Let user type, PDF_FILLER_DEFAULTS will handle if empty at PDF gen
-            'field2_name': '',
-            'field2_address': '',
-            'field2_city': '',
-            'field2_state': '',
-            'field2_zip': '',
-            'field3_type_employment': 'Civilian', # Default to Civilian
-            'field_pdf_4_dob': '',
-            'field_pdf_5_marital_status': '', # Assuming it's a dropdown/radio
-            'field_pdf_13b_phone': '',
-            'field8_basis_of_claim': '',
-            'field9_property_damage_description': '',
-            'field10_nature_of_injury': '',
-            'field11_witness_name_1': '',
-            'field11_witness_address_1': '',
-            'field11_witness_name_2': '',
-            'field11_witness_address_2': '',
-            'field12a_property_damage_amount': '0',
-            'field12b_personal_injury_amount': '90000',
-            'field12c_wrongful_death_amount': '0',
-            'field12d_total_claim_amount': '0',
-            'user_email_address': '',
-            'supplemental_question_1_capitol_experience': '',
-            'supplemental_question_2_injuries_damages': '',
-            'supplemental_question_3_entry_exit_time': '',
-            'supplemental_question_4_inside_capitol_details': ''
-        })
+        html_form_defaults = session.get('html_form_defaults', dict(HTML_FORM_DEFAULTS))
         session['html_form_defaults'] = html_form_defaults
 
         # Use the latest form data from session if present
@@ -738,7 +717,7 @@ def form():
         if current_user.is_authenticated and getattr(current_user, 'role', None) not in ['admin', 'superadmin']:
             form_data['user_email_address'] = current_user.username
         session['form_data'] = form_data  # Always persist
-        current_app.logger.info(f"FORM PAGE: Loaded form_data from session: {form_data}")
+        log_event(current_app.logger, "FORM PAGE: Loaded form_data from session", sample=True, form_data=lambda: dict(form_data))
 
         states_and_territories = [
             'AK', 'AL', 'AR', 'AS', 'AZ', 'CA', 'CO', 'CT', 'DC', 'DE',
@@ -749,12 +728,10 @@ def form():
             'VI', 'VT', 'WA', 'WI', 'WV', 'WY'
         ]
         validation_errors = session.pop('validation_errors_step1', {})
-        current_app.logger.info(f"FORM PAGE: Rendering with form_data: {form_data}")
+        log_event(current_app.logger, "FORM PAGE: Rendering", sample=True, validation_errors=validation_errors)
         return render_template('form.html', form_data=form_data, title="SF-95 Claim Form - Step 1", validation_errors=validation_errors, states_list=states_and_territories, current_user=current_user)
     except Exception as e:
-        with open('/home3/investi9/public_html/west-plaza-lawsuit/debugging-logs.txt', 'a') as f:
-            f.write('\n--- Exception during form submission ---\n')
-            traceback.print_exc(file=f)
+        debug_ring_log.append(f"--- Exception during form submission ---\n{traceback.format_exc()}")
         raise
 
 @app.route('/form')
@@ -804,101 +781,58 @@ def redirect_form_to_root():
     session['pdf_data_for_filling_draft'] = pdf_data_for_filling_draft
     session['claimant_name_for_signature'] = name
     session_cookie = request.cookies.get('session')
-    current_app.logger.info(f"SIGNATURE POST: Session before redirect: {dict(session)} | Session cookie: {session_cookie} | Headers: {dict(request.headers)}")
-    log_msg = f"\nSIGNATURE POST: Session before redirect: {dict(session)} | Session cookie: {session_cookie} | Headers: {dict(request.headers)}\n"
-    with open('debugging-logs.txt', 'a') as f:
-        f.write(log_msg)
-    trim_debug_log()
+    log_event(current_app.logger, "SIGNATURE POST: Session before redirect", sample=True,
+              session=lambda: dict(session), session_cookie=session_cookie, headers=lambda: dict(request.headers))
     return redirect(url_for('signature_review'))
 
-# --- Helper: Trim debug log to 1000 lines ---
-def trim_debug_log():
-    try:
-        with open('debugging-logs.txt', 'r+') as f:
-            lines = f.readlines()
-            if len(lines) > 1000:
-                f.seek(0)
-                f.writelines(lines[-1000:])
-                f.truncate()
-    except Exception as e:
-        print(f"Failed to trim debugging-logs.txt: {e}")  # Use print as fallback if logger fails
+def form_data_from_claim_row(claim):
+    '''
+    Turns a stored claims row back into the form data map_form_data_to_pdf_fields expects. Most columns already hold
+    the raw form values; only the fields the mapping rewrites before saving need undoing.
+    '''
+    from src.utils.pdf_filler import DEFAULT_VALUES
+    form_data = {key: claim[key] for key in claim.keys() if claim[key] is not None}
+    # Boxes 8 and 10 hold only the claimant's own text here; pdf_data_from_claim_row restores the filed boilerplate
+    for key in BOILERPLATE_COLUMNS:
+        form_data[key] = claimant_text(claim, key)
+    employment_type = form_data.get('field3_type_employment') or ''
+    if employment_type not in ('', 'Civilian', 'Military'):
+        form_data['field3_type_employment'] = 'Other'
+        form_data['field3_other_specify'] = employment_type
+    property_description = form_data.pop('field9_property_damage_description', '')
+    if property_description and property_description != DEFAULT_VALUES.get('field9_property_damage_description'):
+        form_data['field9_property_damage_description_other'] = property_description
+    # Signed claims store the full signature timestamp; box 14 shows only the date
+    date_signed = form_data.get('field14_date_signed')
+    if date_signed and not isinstance(date_signed, str):
+        form_data['field14_date_signed'] = date_signed.strftime('%m/%d/%Y')
+    elif date_signed and re.match(r'^\d{4}-\d{2}-\d{2}', date_signed):
+        form_data['field14_date_signed'] = f"{date_signed[5:7]}/{date_signed[8:10]}/{date_signed[0:4]}"
+    return form_data
 
 # --- Helper: Map form/session data to PDF field keys ---
-def map_form_data_to_pdf_fields(form_data):
+def pdf_data_from_claim_row(claim, texts_by_id):
     '''
-    Centralizes mapping from user form/session data to PDF field keys.
-    Handles all fields in pdf_field_map.json, including concatenation, formatting, and defaulting.
-    Logs any missing or blank fields for debugging.
+    PDF data for re-rendering a stored claim with the current field map and defaults. Boxes 8 and 10 keep the
+    boilerplate version the claim was filed with (texts_by_id: boilerplate_texts_by_id), so editing DEFAULT_VALUES
+    doesn't rewrite historic claims.
     '''
-    from src.utils.pdf_filler import PDF_FIELD_MAP, DEFAULT_VALUES
-    pdf_data = {}
-    # Claimant info combined
-    name = form_data.get('field2_name', '')
-    address = form_data.get('field2_address', '')
-    city = form_data.get('field2_city', '')
-    state = form_data.get('field2_state', '')
-    zip_code = form_data.get('field2_zip', '')
-    pdf_data['field2_claimant_info_combined'] = f"{name}\n{address}\n{city}, {state} {zip_code}".strip()
-    pdf_data['field2_name'] = name
-    pdf_data['field2_address'] = address
-    pdf_data['field2_city'] = city
-    pdf_data['field2_state'] = state
-    pdf_data['field2_zip'] = zip_code
-    # Type of employment
-    employment_type = form_data.get('field3_type_employment', '')
-    pdf_data['field3_type_employment'] = form_data.get('field3_other_specify', '') if employment_type == 'Other' else employment_type
-    pdf_data['field3_checkbox_civilian'] = employment_type == 'Civilian'
-    pdf_data['field3_checkbox_military'] = employment_type == 'Military'
-    # DOB, marital status
-    pdf_data['field_pdf_4_dob'] = form_data.get('field_pdf_4_dob', '')
-    pdf_data['field_pdf_5_marital_status'] = form_data.get('field_pdf_5_marital_status', '')
-    # Basis of claim
-    boilerplate_8 = DEFAULT_VALUES.get('field8_basis_of_claim', "On January 6, 2021, at the U.S. Capitol, claimant was subjected to excessive force by federal officers, including tear gas and rubber bullets, leading to physical injury and emotional distress.")
-    user_8 = form_data.get('field8_basis_of_claim', '').strip()
-    pdf_data['field8_basis_of_claim'] = boilerplate_8 if not user_8 else f"{boilerplate_8}\n{user_8}"
-    # Property damage
-    prop_damage_vehicle = form_data.get('field9_property_damage_description_vehicle', '')
-    prop_damage_other = form_data.get('field9_property_damage_description_other', '')
-    combined_prop_desc = f"{prop_damage_vehicle}\n{prop_damage_other}".strip()
-    pdf_data['field9_property_damage_description'] = combined_prop_desc if combined_prop_desc else DEFAULT_VALUES.get('field9_property_damage_description', '')
-    pdf_data['field9_owner_name_address'] = form_data.get('field9_owner_name_address', DEFAULT_VALUES.get('field9_owner_name_address', ''))
-    # Nature of injury
-    boilerplate_10 = DEFAULT_VALUES.get('field10_nature_of_injury', "Respiratory distress from tear gas, contusions from rubber bullets, and severe emotional distress.")
-    user_10 = form_data.get('field10_nature_of_injury', '').strip()
-    pdf_data['field10_nature_of_injury'] = boilerplate_10 if not user_10 else f"{boilerplate_10}\n{user_10}"
-    # Witnesses
-    pdf_data['field11_witness_name'] = form_data.get('field11_witness_name', DEFAULT_VALUES.get('field11_witness_name', ''))
-    pdf_data['field11_witness_address'] = form_data.get('field11_witness_address', DEFAULT_VALUES.get('field11_witness_address', ''))
-    # Amounts
-    pdf_data['field12a_property_damage'] = form_data.get('field12a_property_damage_amount', DEFAULT_VALUES.get('field12a_property_damage', ''))
-    pdf_data['field12b_personal_injury'] = form_data.get('field12b_personal_injury_amount', DEFAULT_VALUES.get('field12b_personal_injury', ''))
-    pdf_data['field12c_wrongful_death'] = form_data.get('field12c_wrongful_death_amount', DEFAULT_VALUES.get('field12c_wrongful_death', ''))
-    pdf_data['field12d_total_claim_amount'] = form_data.get('field12d_total_amount', form_data.get('field12d_total_claim_amount', DEFAULT_VALUES.get('field12d_total_claim_amount', '')))
-    # Signature and phone
-    pdf_data['field13a_signature'] = form_data.get('field13a_signature', 'Pending Signature')
-    pdf_data['field_pdf_13b_phone'] = form_data.get('field_pdf_13b_phone', '')
-    pdf_data['field14_date_signed'] = form_data.get('field14_date_signed', '')
-    # Insurance, claim details, etc.
-    pdf_data['field15_accident_insurance'] = form_data.get('field15_accident_insurance', '')
-    pdf_data['field15_insurer_name_address_policy'] = form_data.get('field15_insurer_name_address_policy', '')
-    pdf_data['field16_filed_claim'] = form_data.get('field16_filed_claim', '')
-    pdf_data['field16_claim_details'] = form_data.get('field16_claim_details', '')
-    pdf_data['field17_deductible_amount'] = form_data.get('field17_deductible_amount', '')
-    pdf_data['field18_insurer_action'] = form_data.get('field18_insurer_action', '')
-    pdf_data['field19_liability_insurance'] = form_data.get('field19_liability_insurance', '')
-    pdf_data['field19_insurer_name_address'] = form_data.get('field19_insurer_name_address', '')
-    # Log missing/blank fields for all PDF fields
-    from flask import current_app
-    from src.utils.pdf_filler import PDF_FIELD_MAP
-    for app_key, pdf_field in PDF_FIELD_MAP.items():
-        if app_key not in pdf_data or pdf_data[app_key] in (None, ""):
-            current_app.logger.warning(f"PDF MAPPING: Field '{app_key}' (PDF: '{pdf_field}') is missing or blank in PDF data.")
+    pdf_data = map_form_data_to_pdf_fields(form_data_from_claim_row(claim))
+    for field in BOILERPLATE_COLUMNS:
+        pdf_data[field] = stored_claim_text(claim, field, texts_by_id)
     return pdf_data
 
+def map_form_data_to_pdf_fields(form_data):
+    '''
+    Centralizes mapping from user form/session data to PDF field keys: concatenation, formatting and defaulting
+    as declared in FORM_FIELD_SPEC (src/utils/field_mapping.py), compiled once at import.
+    '''
+    return run_form_pipeline(FORM_TO_PDF_PIPELINE, form_data)
+
 
 
     try:
-        cursor.execute("SELECT id FROM claims WHERE field2_name = ?", (claimant_name,))
+        cursor.execute(SQL_CLAIM_ID_BY_CLAIMANT_NAME, (claimant_name,))
         existing_record = cursor.fetchone()
         current_time_utc = datetime.now(timezone.utc)
 
@@ -988,8 +922,10 @@ def signature():
     form_email = form_data.get('user_email_address', '').strip().lower() if form_data else ''
     draft_email = session.get('draft_pdf_filename', '').split('_')[0] if session.get('draft_pdf_filename') else ''
 
-    current_app.logger.info(f"[SIGNATURE ROUTE ENTRY] User: {user_email_address}, IP: {request.remote_addr}, Method: {request.method}, Session: {dict(session)}, Headers: {dict(request.headers)}")
-    current_app.logger.info(f"[SIGNATURE ROUTE] Email sources: session['user_email_address']='{user_email_address}', form_data['user_email_address']='{form_email}', draft_pdf_filename-derived='{draft_email}'")
+    log_event(current_app.logger, "[SIGNATURE ROUTE ENTRY]", sample=True, user=user_email_address, ip=request.remote_addr,
+              method=request.method, session=lambda: dict(session), headers=lambda: dict(request.headers))
+    log_event(current_app.logger, "[SIGNATURE ROUTE] Email sources", sample=True, session_email=user_email_address,
+              form_data_email=form_email, draft_pdf_filename_email=draft_email)
 
     # Healing logic: always restore from form_data if missing
     if not user_email_address and form_email:
@@ -1001,18 +937,17 @@ def signature():
         session.modified = True
         current_app.logger.info(f"[SIGNATURE ROUTE] Healed session['user_email_address'] from draft_pdf_filename: {draft_email}")
     else:
-        current_app.logger.info(f"[SIGNATURE ROUTE] No healing needed for user_email_address.")
+        log_event(current_app.logger, "[SIGNATURE ROUTE] No healing needed for user_email_address", sample=True)
 
     # If still missing, log error
     if not session.get('user_email_address', '').strip():
         current_app.logger.error(f"[SIGNATURE ROUTE ERROR] user_email_address is STILL missing after healing attempts. Session: {dict(session)}, form_data: {form_data}")
 
     if request.method == 'GET':
-        current_app.logger.info(f"[SIGNATURE GET] Rendering signature review page. claimant_name_for_signature='{session.get('claimant_name_for_signature', '')}'")
-        log_msg = f"\n[SIGNATURE GET] Rendering signature review page. claimant_name_for_signature='{session.get('claimant_name_for_signature', '')}'\nSession: {dict(session)}\nSession cookie: {session_cookie}\nHeaders: {dict(request.headers)}\n"
-        with open('debugging-logs.txt', 'a') as f:
-            f.write(log_msg)
-        trim_debug_log()
+        # The app logger's ring-log handler keeps these events in the debug log as well
+        log_event(current_app.logger, "[SIGNATURE GET] Rendering signature review page", sample=True,
+                  claimant_name_for_signature=session.get('claimant_name_for_signature', ''), session=lambda: dict(session),
+                  session_cookie=session_cookie, headers=lambda: dict(request.headers))
         pdf_data_for_filling_draft = session.get('pdf_data_for_filling_draft')
         if not pdf_data_for_filling_draft:
             current_app.logger.warning(f"[SIGNATURE GET] 'pdf_data_for_filling_draft' NOT FOUND in session. Redirecting to form.")
@@ -1034,7 +969,7 @@ def signature():
     else:
         # POST: Handle signature submission and FINALIZE claim (PDF + DB)
         form_data = request.form.to_dict()
-        current_app.logger.info(f"[SIGNATURE POST] Received form data: {form_data}")
+        log_event(current_app.logger, "[SIGNATURE POST] Received form data", sample=True, form_data=dict(form_data))
         user_email_address = form_data.get('user_email_address', '').strip().lower() or session.get('user_email_address', '').strip().lower() or ''
         current_app.logger.info(f"[SIGNATURE POST] user_email_address from form: '{form_data.get('user_email_address', '')}', session: '{session.get('user_email_address', '')}', draft: '{draft_email}' | Using: '{user_email_address}'")
         if not user_email_address:
@@ -1109,16 +1044,16 @@ def signature():
                 current_app.logger.info(f"SIGNATURE FINALIZATION: Added default '{default_key}':'{default_value}' to final PDF data as it was missing.")
         current_app.logger.info(f"SIGNATURE FINALIZATION: Final PDF data prepared: {pdf_data_for_filling_final}")
 
-        # Generate the final PDF
-        db_filled_pdf_filename_final = None
+        # Queue the final PDF; the success page polls the job until the file is ready
+        db_filled_pdf_filename_final = output_pdf_filename_with_ext
         try:
-            fill_sf95_pdf(pdf_data_for_filling_final, PDF_TEMPLATE_PATH, output_pdf_path)
-            current_app.logger.info(f"SIGNATURE FINALIZATION: Final PDF generated: {output_pdf_path}")
-            db_filled_pdf_filename_final = os.path.basename(output_pdf_path)
+            final_job_id = render_queue.enqueue('final', pdf_data_for_filling_final, PDF_TEMPLATE_PATH, output_pdf_path, claim_id=submission_id_in_progress)
+            # Only this session (and admins) may poll the job; see render_status
+            session['render_job_ids'] = (session.get('render_job_ids', []) + [final_job_id])[-MAX_SESSION_RENDER_JOBS:]
+            current_app.logger.info(f"SIGNATURE FINALIZATION: Final PDF render queued: {output_pdf_path}")
         except Exception as e:
-            current_app.logger.error(f"SIGNATURE FINALIZATION: Error filling FINAL PDF for ID {submission_id_in_progress}: {e}", exc_info=True)
+            current_app.logger.error(f"SIGNATURE FINALIZATION: Error queueing FINAL PDF for ID {submission_id_in_progress}: {e}", exc_info=True)
             flash(f"Critical Error: Could not generate the final PDF document. Please contact support with submission ID {submission_id_in_progress}.", "danger")
-            db_filled_pdf_filename_final = output_pdf_filename_with_ext
 
         # Prepare DB update
         data_to_update_in_db = {
@@ -1242,11 +1177,27 @@ def signature():
             session['claimant_name_for_signature'] = claimant_name_from_step1
             return redirect(url_for('signature'))
 
+@app.route('/signature/preview_pdf')
+def draft_pdf_preview():
+    """Renders the unsigned draft PDF from step 1 session data on demand and shows it in the browser."""
+    pdf_data_for_filling_draft = session.get('pdf_data_for_filling_draft')
+    draft_pdf_filename = session.get('draft_pdf_filename')
+    if not pdf_data_for_filling_draft or not draft_pdf_filename:
+        flash('No data from step 1 found. Please start from the beginning.', 'error')
+        return redirect(url_for('form'))
+    output_pdf_path = os.path.join(current_app.config['FILLED_FORMS_DIR'], draft_pdf_filename)
+    if not fill_sf95_pdf(pdf_data_for_filling_draft, PDF_TEMPLATE_PATH, output_pdf_path):
+        current_app.logger.error(f"DRAFT PREVIEW: Could not render draft PDF {draft_pdf_filename}")
+        flash('Could not generate the draft PDF preview. You can still sign and submit your claim.', 'warning')
+        return redirect(url_for('signature'))
+    current_app.logger.info(f"DRAFT PREVIEW: Rendered draft PDF on demand: {output_pdf_path}")
+    return send_from_directory(current_app.config['FILLED_FORMS_DIR'], draft_pdf_filename, mimetype='application/pdf')
+
 @app.route('/submit', methods=['POST'])
 def submit_form():
     # Log incoming form data and session state
-    current_app.logger.info(f"SUBMIT_FORM: Received form data: {dict(request.form)}")
-    current_app.logger.info(f"SUBMIT_FORM: Session before processing: {dict(session)}")
+    log_event(current_app.logger, "SUBMIT_FORM: Received form data", sample=True, form=lambda: request.form.to_dict())
+    log_event(current_app.logger, "SUBMIT_FORM: Session before processing", sample=True, session=lambda: dict(session))
 
     # --- Step 1: Map form data to PDF/DB keys ---
     form_data = dict(request.form)
@@ -1271,8 +1222,7 @@ def submit_form():
     session['user_email_address'] = user_email_address
     current_app.logger.info(f"SUBMIT_FORM: Set session['user_email_address'] = {user_email_address}")
     pdf_data_for_filling_draft = map_form_data_to_pdf_fields(form_data)
-    current_app.logger.info(f"SUBMIT_FORM: Mapped form data to PDF/DB keys: {pdf_data_for_filling_draft}")
-    current_app.logger.info(f"SUBMIT_FORM: Saved form_data to session for persistence: {form_data}")
+    log_event(current_app.logger, "SUBMIT_FORM: Mapped form data to PDF/DB keys", sample=True, pdf_data=dict(pdf_data_for_filling_draft))
 
     # --- Step 1.5: Generate slugified email and draft PDF filename ---
     if not user_email_address:
@@ -1283,14 +1233,18 @@ def submit_form():
     output_pdf_filename_with_ext = f"{slug}_SF95.pdf"
     output_pdf_path = os.path.join(current_app.config['FILLED_FORMS_DIR'], output_pdf_filename_with_ext)
 
-    # --- Step 1.6: Generate draft PDF immediately ---
+    # The draft PDF is not rendered here; draft_pdf_preview renders it only if the user asks to see it.
+    # A PDF left from an earlier submission no longer matches this data, so drop it rather than serve it, and stop
+    # any render of the old data still queued or running for the same file from recreating it.
     try:
-        from src.utils.pdf_filler import fill_sf95_pdf
-        fill_sf95_pdf(pdf_data_for_filling_draft, PDF_TEMPLATE_PATH, output_pdf_path)
-        current_app.logger.info(f"SUBMIT_FORM: Draft PDF generated: {output_pdf_path}")
+        render_queue.cancel_for_output(output_pdf_path)
     except Exception as e:
-        current_app.logger.error(f"SUBMIT_FORM: Error generating draft PDF: {e}")
-
+        current_app.logger.error(f"SUBMIT_FORM: Could not cancel pending renders of {output_pdf_path}: {e}")
+    if os.path.exists(output_pdf_path):
+        try:
+            os.remove(output_pdf_path)
+        except OSError as e:
+            current_app.logger.error(f"SUBMIT_FORM: Could not remove outdated PDF {output_pdf_path}: {e}")
     # Save filename to session for later steps
     session['draft_pdf_filename'] = output_pdf_filename_with_ext
 
@@ -1300,7 +1254,8 @@ def submit_form():
     session['submission_id_in_progress'] = submission_id_in_progress
     session['pdf_data_for_filling_draft'] = pdf_data_for_filling_draft
     session['claimant_name_for_signature'] = form_data.get('field2_name', '')
-    current_app.logger.info(f"SUBMIT_FORM: Session set: submission_id_in_progress={submission_id_in_progress}, claimant_name_for_signature={form_data.get('field2_name', '')}, pdf_data_for_filling_draft={pdf_data_for_filling_draft}")
+    log_event(current_app.logger, "SUBMIT_FORM: Session set", submission_id_in_progress=submission_id_in_progress,
+              claimant_name_for_signature=form_data.get('field2_name', ''))
 
     # --- Step 3: Insert into DB (Stage 1) ---
     db = get_db()
@@ -1321,9 +1276,12 @@ def submit_form():
             data_to_save_for_db_stage1[key] = pdf_data_for_filling_draft.get(key, form_data.get(key, ''))
     data_to_save_for_db_stage1['created_at'] = current_time_utc
     data_to_save_for_db_stage1['updated_at'] = current_time_utc
-    current_app.logger.info(f"SUBMIT_FORM: Data prepared for DB insert: {data_to_save_for_db_stage1}")
+    log_event(current_app.logger, "SUBMIT_FORM: Data prepared for DB insert", sample=True, data=dict(data_to_save_for_db_stage1))
     # Insert
     try:
+        # Boxes 8 and 10 are saved as the claimant's own text plus a reference to the boilerplate it extends
+        data_to_save_for_db_stage1.update(interned_claim_texts({field: form_data.get(field, '') for field in BOILERPLATE_COLUMNS},
+                                                               current_boilerplate_ids(db, PDF_FILLER_DEFAULTS)))
         cols_for_insert_sql = []
         vals_for_insert_list = []
         placeholders_for_insert_sql = []
@@ -1365,8 +1323,7 @@ def submit_form():
             current_app.logger.info(f"SUBMIT_FORM: User {user_email_address} already exists, not creating.")
 
     # --- Step 4: Redirect to signature page ---
-    current_app.logger.info(f"SUBMIT_FORM: Redirecting to signature page with session: {dict(session)}")
-    trim_debug_log()
+    log_event(current_app.logger, "SUBMIT_FORM: Redirecting to signature page", sample=True, session=lambda: dict(session))
     return redirect(url_for('signature'))
 
     signature_page_data = dict(request.form) # Data from the signature page submission
@@ -1388,7 +1345,6 @@ def submit_form():
         # Session variables are already set from signature, just add errors and redirect back
         session['form_data_step2_errors'] = signature_page_data # To prefill signature attempt on error
         session['validation_errors_step2'] = validation_errors_step2
-        trim_debug_log()
         return redirect(url_for('signature_review'))
 
     # --- Finalize Submission (Stage 2) ---
@@ -1524,10 +1480,29 @@ def success_page(submission_id):
     # Find user by email if available in claim
     user_id = None
     if claim and 'user_email_address' in claim.keys():
-        user_row = cursor.execute('SELECT id FROM users WHERE username = ?', (claim['user_email_address'],)).fetchone()
+        user_row = cursor.execute(SQL_USER_ID_BY_USERNAME, ((claim['user_email_address'] or '').strip().lower(),)).fetchone()
         if user_row:
             user_id = user_row['id']
-    return render_template('success.html', submission_id=submission_id, pdf_filename=pdf_filename, user_id=user_id)
+    render_job = None
+    if pdf_filename:
+        render_job = render_queue.latest_job_for_output(os.path.join(current_app.config['FILLED_FORMS_DIR'], pdf_filename))
+        if render_job and not may_view_render_job(render_job):
+            render_job = None # The page then just shows the download link, which waits for a pending render itself
+    return render_template('success.html', submission_id=submission_id, pdf_filename=pdf_filename, user_id=user_id, render_job=render_job)
+
+def may_view_render_job(job):
+    """Whether the current visitor queued this render job in their session, or is an admin."""
+    if job['id'] in session.get('render_job_ids', []):
+        return True
+    return current_user.is_authenticated and current_user.is_admin()
+
+@app.route('/render_status/<int:job_id>')
+def render_status(job_id):
+    """Status of a background PDF render, polled by the success page. Only the session that queued it and admins see it."""
+    job = render_queue.get_job(job_id)
+    if not job or not may_view_render_job(job):
+        return jsonify({'error': 'Render job not found'}), 404
+    return jsonify({'id': job['id'], 'kind': job['kind'], 'status': job['status'], 'attempts': job['attempts']})
 
 @app.route('/reset_password', methods=['GET', 'POST'])
 def reset_password():
@@ -1540,7 +1515,7 @@ def reset_password():
         else:
             db = get_db()
             cursor = db.cursor()
-            user_row = cursor.execute('SELECT id FROM users WHERE username = ?', (email,)).fetchone()
+            user_row = cursor.execute(SQL_USER_ID_BY_USERNAME, (email,)).fetchone()
             if user_row:
                 # For now, redirect to set_password page (no email delivery yet)
                 return redirect(url_for('set_password', user_id=user_row['id']))
@@ -1571,7 +1546,7 @@ def download_filled_pdf(filename):
         current_app.logger.info(f"[PDF ACCESS DEBUG] Route hit. filename={filename}, user_email={getattr(current_user, 'email', None)}, username={getattr(current_user, 'username', None)}, role={getattr(current_user, 'role', None)}")
         db = get_db()
         cursor = db.cursor()
-        claim = cursor.execute('SELECT user_email_address FROM claims WHERE filled_pdf_filename = ?', (filename,)).fetchone()
+        claim = cursor.execute(SQL_CLAIM_EMAIL_BY_FILENAME, (filename,)).fetchone()
         if not claim:
             current_app.logger.warning(f"[PDF ACCESS DEBUG] No claim found for filename={filename}")
             current_app.logger.error(f"[PDF ACCESS DENIED] No claim found for filename {filename}")
@@ -1590,16 +1565,27 @@ def download_filled_pdf(filename):
             current_app.logger.error(f"[PDF ACCESS DENIED] User does not own PDF. claim_email={claim_email}, user_email={user_email}, user_username={user_username}")
             abort(403)
         current_app.logger.info(f"[PDF ACCESS GRANTED] User {user_email or user_username} downloading {filename}")
-        try:
-            return send_from_directory(current_app.config['FILLED_FORMS_DIR'], filename, as_attachment=True)
-        except FileNotFoundError:
-            current_app.logger.error(f"--- download_filled_pdf --- File not found: {filename} in directory {current_app.config['FILLED_FORMS_DIR']}")
-            flash(f"Error: Could not find the PDF file '{filename}'.", "danger")
-            return redirect(url_for('admin_view'))
-        except Exception as e:
-            current_app.logger.error(f"--- download_filled_pdf --- Unexpected error sending file {filename}: {e}", exc_info=True)
-            flash(f"An unexpected error occurred while trying to download the PDF '{filename}'.", "danger")
-            return redirect(url_for('admin_view'))
+        output_path = os.path.join(current_app.config['FILLED_FORMS_DIR'], filename)
+        render_job = render_queue.latest_job_for_output(output_path)
+        # Drafts are rendered lazily, so an unsigned claim may not have a file yet: queue its render like any other
+        if not os.path.exists(output_path) and not (render_job and render_job['status'] in JOB_PENDING_STATUSES):
+            full_claim = cursor.execute(SQL_CLAIM_BY_FILENAME, (filename,)).fetchone()
+            current_app.logger.info(f"--- download_filled_pdf --- {filename} not rendered yet; queueing its render.")
+            job_id = render_queue.enqueue('draft', pdf_data_from_claim_row(full_claim, boilerplate_texts_by_id(db)), PDF_TEMPLATE_PATH, output_path, claim_id=full_claim['id'])
+            render_job = render_queue.get_job(job_id)
+        # The file may still be rendering in the background; give the job a moment before serving
+        if render_job and render_job['status'] in JOB_PENDING_STATUSES:
+            render_job = render_queue.wait_for_job(render_job['id'], current_app.config['PDF_RENDER_WAIT_SECONDS'])
+            if render_job and render_job['status'] in JOB_PENDING_STATUSES:
+                current_app.logger.info(f"--- download_filled_pdf --- Render job {render_job['id']} for {filename} still {render_job['status']}")
+                return Response("Your PDF is still being generated. Please try again in a moment.", status=202, headers={'Retry-After': '5'}, mimetype='text/plain')
+        if not os.path.exists(output_path):
+            job_state = f"render job {render_job['id']} {render_job['status']}: {render_job['last_error']}" if render_job else "no render job"
+            current_app.logger.error(f"--- download_filled_pdf --- {filename} could not be rendered ({job_state})")
+            return Response("We could not generate this PDF. Please try again later or contact support.", status=500, mimetype='text/plain')
+        return send_from_directory(current_app.config['FILLED_FORMS_DIR'], filename, as_attachment=True)
+    except HTTPException:
+        raise # abort(403/404) and send_from_directory's NotFound keep their status
     except Exception as e:
         current_app.logger.error(f"[PDF ACCESS FATAL ERROR] Unexpected error in download_filled_pdf: {e}", exc_info=True)
         flash(f"A fatal error occurred while processing your PDF download request. Please contact support.", "danger")
@@ -1609,66 +1595,69 @@ def download_filled_pdf(filename):
 @login_required
 @admin_required
 def admin_view():
-    db = get_db()
-    cursor = db.cursor()
-
-    # Get the list of database column names needed for display from DESIRED_COLUMNS_ORDER_AND_HEADERS
-    db_columns_for_display = [col_map[0] for col_map in DESIRED_COLUMNS_ORDER_AND_HEADERS]
-    display_header_names = [
-        'ID', 'Claimant Name', 'Email Address', 'Phone Number', 'Basis of Claim', 
-        'Nature of Injury', 'Capitol Experience', 'Injuries/Damages',
-        'Entry/Exit Time', 'Inside Capitol Details', 'Property Damage Amount',
-        'Personal Injury Amount', 'Wrongful Death Amount', 'Total Claim Amount',
-        'Signature', 'Type of Employment', 'Marital Status', 'Street Address',
-        'City', 'State', 'Zip Code', 'Date and Time Created', 'Date and Time Signed'
+    # Rows are fetched page by page from admin_claims_query; this only renders the table shell and filters
+    # Hardcoded list of 50 US state codes in strict alphabetical order
+    states_list_for_filter = [
+        'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
+        'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
+        'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
+        'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
+        'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY'
     ]
-    
-    # Ensure 'id' (primary key) is selected for delete functionality,
-    # and avoid duplicates if 'id' were ever mapped in DESIRED_COLUMNS_ORDER_AND_HEADERS
-    select_columns_list = ['id'] + [col for col in db_columns_for_display if col != 'id']
-    select_columns_str = ', '.join(select_columns_list)
+    display_header_names = [display_header for _, display_header in DESIRED_COLUMNS_ORDER_AND_HEADERS]
+    return render_template('admin.html', title="Admin - View Submissions", column_names=display_header_names, states_for_filter=states_list_for_filter, page_size=ADMIN_PAGE_SIZE)
 
+def format_claim_row_for_admin(row, display_datetimes):
+    """
+    Display values for one claims row, keyed by admin table header, plus the row's action URLs.
+    display_datetimes is the row's entry from format_datetime_columns.
+    """
+    processed_row = {'id': row['id']}
+    for db_col, display_header in DESIRED_COLUMNS_ORDER_AND_HEADERS:
+        raw_value = row[db_col]
+        if db_col in DISPLAY_DATETIME_COLUMNS:
+            processed_row[display_header] = display_datetimes[DISPLAY_DATETIME_COLUMNS[db_col]]
+        elif db_col == 'field17_signature_of_claimant':
+            processed_row[display_header] = raw_value if raw_value else "Pending Signature"
+        elif db_col == 'filled_pdf_filename': # This is the 'ID' column in display
+            processed_row[display_header] = raw_value if raw_value else "N/A"
+        elif db_col == 'field_pdf_13b_phone':
+            processed_row[display_header] = format_phone(raw_value) if raw_value else "N/A"
+        else:
+            processed_row[display_header] = raw_value if raw_value is not None else ''
+    pdf_filename = row['filled_pdf_filename']
+    processed_row['pdf_url'] = url_for('download_filled_pdf', filename=pdf_filename) if pdf_filename and pdf_filename.endswith('.pdf') else None
+    processed_row['edit_url'] = url_for('edit_claim', claim_id=row['id'])
+    processed_row['delete_url'] = url_for('delete_claim', claim_id=row['id'])
+    return processed_row
+
+@app.route('/admin/claims.json', methods=['GET'])
+@login_required
+@admin_required
+def admin_claims_query():
+    """One page of admin claims. Filters, sort and keyset cursor come from the query string."""
+    select_columns = ['id'] + [col for col, _ in DESIRED_COLUMNS_ORDER_AND_HEADERS if col != 'id'] + list(DISPLAY_DATETIME_COLUMNS.values())
     try:
-        # Get distinct states for the filter dropdown
-        # Hardcoded list of 50 US state codes in strict alphabetical order
-        states_list_for_filter = [
-            'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
-            'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
-            'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
-            'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
-            'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY'
-        ]
-        current_app.logger.info(f"--- admin_view --- DEBUG: FINAL state list passed to template: {states_list_for_filter}")
+        limit = int(request.args.get('limit', ADMIN_PAGE_SIZE))
+        sql, args, sort_header, direction = build_admin_claims_query(request.args, select_columns, limit=limit)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        # Select the actual 'id' column along with others for the main table
-        cursor.execute(f"SELECT {select_columns_str} FROM claims ORDER BY created_at DESC")
-        raw_claims_data = cursor.fetchall() # List of sqlite3.Row objects
-        
-        claims_list_for_template = []
-        for row in raw_claims_data:
-            processed_row = {}
-            processed_row['id'] = row['id'] # Explicitly add the database 'id' to the processed_row for use in the template
-            for db_col, display_header in zip(db_columns_for_display, display_header_names):
-                raw_value = row[db_col]
-                if db_col == 'field18_date_of_signature' or db_col == 'created_at' or db_col == 'updated_at':
-                    processed_row[display_header] = format_datetime_for_display(raw_value)
-                elif db_col == 'field17_signature_of_claimant':
-                    processed_row[display_header] = raw_value if raw_value else "Pending Signature"
-                elif db_col == 'filled_pdf_filename': # This is the 'ID' column in display
-                    processed_row[display_header] = raw_value if raw_value else "N/A"
-                elif db_col == 'field_pdf_13b_phone':
-                    processed_row[display_header] = format_phone(raw_value) if raw_value else "N/A"
-                else:
-                    processed_row[display_header] = raw_value if raw_value is not None else ''
-            claims_list_for_template.append(processed_row)
-
-        current_app.logger.info(f"Fetched {len(claims_list_for_template)} claims for admin view.")
-        # Pass display_header_names for the table headers in the template
-        return render_template('admin.html', title="Admin - View Submissions", claims=claims_list_for_template, column_names=display_header_names, states_for_filter=states_list_for_filter)
-    except Exception as e:
-        current_app.logger.error(f"--- admin_view --- Error fetching admin data: {e}", exc_info=True)
-        # Also pass an empty list for states if there's an error fetching claims
-        return render_template('admin.html', title="Admin - Error", claims=[], column_names=[], states_for_filter=[], error=f"An error occurred: {e}")
+    db = get_db()
+    try:
+        rows = db.execute(sql, args).fetchall()
+        claims = [format_claim_row_for_admin(row, display_datetimes) for row, display_datetimes in zip(rows, format_datetime_columns(rows, DISPLAY_DATETIME_COLUMNS.values()))]
+        # A full page means there may be more; the last row's (sort value, id) is where the next page starts
+        next_cursor = encode_cursor(rows[-1]['sort_value'], rows[-1]['id']) if rows and len(rows) == args[-1] else None
+        result = {'claims': claims, 'next_cursor': next_cursor, 'sort': sort_header, 'dir': direction}
+        if not request.args.get('cursor'):
+            # Total matching rows, only on the first page so scrolling stays cheap
+            count_sql, count_args = build_admin_claims_count(request.args)
+            result['total'] = db.execute(count_sql, count_args).fetchone()[0]
+        return jsonify(result)
+    except sqlite3.Error as e:
+        current_app.logger.error(f"--- admin_claims_query --- Error querying claims: {e}", exc_info=True)
+        return jsonify({'error': 'Database error while loading claims.'}), 500
 
 # New route for deleting a claim
 @app.route('/admin/delete/<int:claim_id>', methods=['POST'])
@@ -1727,9 +1716,35 @@ def delete_claim(claim_id):
     # The 'finally' block for closing DB connection is handled by @app.teardown_appcontext
     return redirect(url_for('admin_view'))
 
+# --- CSV export ---
+CSV_EXPORT_BATCH_SIZE = 500
+
+class CsvLineBuffer:
+    """File-like object for csv.writer whose write() returns the line instead of storing it."""
+    def write(self, value):
+        return value
+
+def format_claim_row_for_csv(row, display_datetimes):
+    row_data_for_csv = []
+    for db_col, _ in DESIRED_COLUMNS_ORDER_AND_HEADERS:
+        raw_value = row[db_col]
+        if db_col in DISPLAY_DATETIME_COLUMNS:
+            row_data_for_csv.append(display_datetimes[DISPLAY_DATETIME_COLUMNS[db_col]])
+        elif db_col == 'field17_signature_of_claimant':
+            row_data_for_csv.append(raw_value if raw_value else "Pending Signature")
+        elif db_col == 'filled_pdf_filename': # This is the 'ID' column in display
+            row_data_for_csv.append(raw_value if raw_value else "N/A")
+        elif db_col == 'field_pdf_13b_phone':
+            row_data_for_csv.append(format_phone(raw_value))
+        else:
+            row_data_for_csv.append(raw_value if raw_value is not None else '')
+    return row_data_for_csv
+
 @app.route('/download_csv')
 def download_csv():
-    db = get_db()
+    # The response outlives the request's g.db (released at teardown), so the export borrows its own pooled
+    # connection and hands it back once the response is closed
+    db = db_pool.acquire()
     cursor = db.cursor()
 
     db_column_names = [col_map[0] for col_map in DESIRED_COLUMNS_ORDER_AND_HEADERS]
@@ -1741,63 +1756,182 @@ def download_csv():
         'Signature', 'Type of Employment', 'Marital Status', 'Street Address',
         'City', 'State', 'Zip Code', 'Date and Time Created', 'Date and Time Signed'
     ]
-    select_columns_str = ', '.join(db_column_names)
+    select_columns_str = ', '.join(db_column_names + list(DISPLAY_DATETIME_COLUMNS.values()))
 
     try:
-        cursor.execute(f"SELECT {select_columns_str} FROM claims ORDER BY created_at DESC")
-        claims_data_rows = cursor.fetchall() # List of sqlite3.Row objects
-
-        if not claims_data_rows:
+        cursor.execute(SQL_CLAIMS_NEWEST_FIRST.format(columns=select_columns_str))
+        first_row = cursor.fetchone()
+        if first_row is None:
+            db_pool.release(db)
             flash('No data to export.', 'info')
             return redirect(url_for('admin_view'))
-
-        csv_io = io.StringIO()
-        csv_writer = csv.writer(csv_io)
-        
-        # Write headers
-        headers = [col_header_pair[1] for col_header_pair in DESIRED_COLUMNS_ORDER_AND_HEADERS]
-        csv_writer.writerow(headers)
-        current_app.logger.info(f"--- download_csv --- CSV headers written: {headers}")
-
-        # Write data rows
-        for row in claims_data_rows:
-            row_data_for_csv = []
-            for db_col, _ in DESIRED_COLUMNS_ORDER_AND_HEADERS:
-                raw_value = row[db_col]
-                if db_col == 'field18_date_of_signature' or db_col == 'created_at' or db_col == 'updated_at':
-                    row_data_for_csv.append(format_datetime_for_display(raw_value))
-                elif db_col == 'field17_signature_of_claimant':
-                    row_data_for_csv.append(raw_value if raw_value else "Pending Signature")
-                elif db_col == 'filled_pdf_filename': # This is the 'ID' column in display
-                    row_data_for_csv.append(raw_value if raw_value else "N/A")
-                elif db_col == 'field_pdf_13b_phone':
-                    row_data_for_csv.append(format_phone(raw_value))
-                else:
-                    row_data_for_csv.append(raw_value if raw_value is not None else '')
-            csv_writer.writerow(row_data_for_csv)
-        current_app.logger.info(f"--- download_csv --- Successfully wrote {len(claims_data_rows)} rows to CSV.")
-
-        # Move to the beginning of the StringIO buffer
-        csv_io.seek(0)
-
-        return Response(
-            csv_io,
-            mimetype="text/csv",
-            headers={"Content-Disposition": "attachment;filename=claims_export.csv"}
-        )
     except sqlite3.Error as e:
+        db_pool.release(db)
         current_app.logger.error(f"Database error during CSV export: {e}")
         flash(f"Error exporting data: {e}", 'danger')
         return redirect(url_for('admin_view'))
 
+    def generate_csv():
+        # csv.writer needs a file; this one hands each formatted line straight back instead of buffering it
+        csv_writer = csv.writer(CsvLineBuffer())
+        headers = [col_header_pair[1] for col_header_pair in DESIRED_COLUMNS_ORDER_AND_HEADERS]
+        yield csv_writer.writerow(headers).encode('utf-8')
+        current_app.logger.info(f"--- download_csv --- CSV headers written: {headers}")
+        rows_written = 0
+        rows = [first_row]
+        try:
+            while rows:
+                yield ''.join(csv_writer.writerow(format_claim_row_for_csv(row, display_datetimes))
+                              for row, display_datetimes in zip(rows, format_datetime_columns(rows, DISPLAY_DATETIME_COLUMNS.values()))).encode('utf-8')
+                rows_written += len(rows)
+                rows = cursor.fetchmany(CSV_EXPORT_BATCH_SIZE)
+        except sqlite3.Error as e:
+            # Headers are already sent, so the error can only be logged; the download ends early
+            current_app.logger.error(f"Database error during CSV export after {rows_written} rows: {e}")
+            return
+        current_app.logger.info(f"--- download_csv --- Successfully wrote {rows_written} rows to CSV.")
+
+    response = Response(
+        stream_with_context(generate_csv()),
+        mimetype="text/csv",
+        headers={"Content-Disposition": "attachment;filename=claims_export.csv"}
+    )
+    @response.call_on_close
+    def release_export_connection():
+        cursor.close()
+        db_pool.release(db)
+    return response
+
+@app.cli.command('migrate-db')
+@click.option('--target', default=None, type=int, help='Stop after this migration version (default: apply all).')
+def migrate_db_command(target):
+    """Applies pending schema migrations from src/migrations."""
+    with app.app_context():
+        db = get_db()
+        before = current_schema_version(db)
+        applied = apply_migrations(db, app.logger, target=target)
+        for version, name in applied:
+            click.echo(f"Applied {version:04d}_{name}")
+        click.echo(f"Schema version {before} -> {current_schema_version(db)} (latest {latest_schema_version()}).")
+
 @app.cli.command('init-db')
 def init_db_command():
+    """Creates or upgrades the database (same as migrate-db)."""
+    with app.app_context():
+        apply_migrations(get_db(), app.logger)
+    click.echo(f"Initialized the database at {DATABASE}.")
+
+@app.cli.command('seed-claims')
+@click.option('--count', default=1000, show_default=True, type=int, help='Number of synthetic claims to insert.')
+@click.option('--seed', default=None, type=int, help='Random seed (default: random). The same seed against the same database collides on PDF filenames.')
+@click.option('--signed-ratio', default=0.7, show_default=True, type=float, help='Share of claims that are signed.')
+@click.option('--deviation-ratio', default=0.2, show_default=True, type=float, help='Share of field 8/10 texts that add to or replace the boilerplate.')
+def seed_claims_command(count, seed, signed_ratio, deviation_ratio):
+    """Inserts synthetic claims for capacity planning and load testing. Never run against production."""
+    seed = seed if seed is not None else random.randrange(2 ** 31)
+    columns = [col.split(' ')[0] for col in DB_SCHEMA]
+    started = time.time()
+    with app.app_context():
+        inserted = insert_claims(get_db(), columns, count, PDF_FILLER_DEFAULTS, seed=seed,
+                                 signed_ratio=signed_ratio, deviation_ratio=deviation_ratio)
+    click.echo(f"Inserted {inserted} synthetic claims into {DATABASE} in {time.time() - started:.1f}s (seed {seed}).")
+
+@app.cli.command('sweep-sessions')
+def sweep_sessions_command():
+    """Deletes expired sessions now (requests also sweep every SESSION_SWEEP_INTERVAL seconds)."""
+    removed = app.session_interface.sweep()
+    click.echo(f"Removed {removed} expired session(s).")
+
+@app.cli.command('debug-log')
+@click.option('--tail', default=0, type=int, help='Only print the newest N entries.')
+def debug_log_command(tail):
+    """Prints the ring-buffer debug log, oldest entry first."""
+    entries = debug_ring_log.entries()
+    if tail > 0:
+        entries = entries[-tail:]
+    for seq, timestamp, text in entries:
+        click.echo(f"#{seq} {datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC {text}")
+
+@app.cli.command('regenerate-pdfs')
+@click.option('--workers', default=os.cpu_count() or 1, show_default=True, type=int, help='Number of render processes.')
+@click.option('--batch-size', default=100, show_default=True, type=int, help='Claims read and rendered per batch; the checkpoint advances after each batch.')
+@click.option('--checkpoint', default=None, help='Checkpoint file (defaults to FILLED_FORMS_DIR/.regenerate_checkpoint.json).')
+@click.option('--restart', is_flag=True, help='Ignore any checkpoint and start again from the first claim.')
+def regenerate_pdfs_command(workers, batch_size, checkpoint, restart):
+    """Re-renders every claim's PDF with the current field map, defaults and template."""
+    from concurrent.futures import ProcessPoolExecutor
+    checkpoint_path = checkpoint or os.path.join(app.config['FILLED_FORMS_DIR'], '.regenerate_checkpoint.json')
+    state = {'last_claim_id': 0, 'regenerated': 0, 'failed_claim_ids': []}
+    if not restart and os.path.exists(checkpoint_path):
+        with open(checkpoint_path) as f:
+            state.update(json.load(f))
+        click.echo(f"Resuming after claim ID {state['last_claim_id']} ({state['regenerated']} already regenerated).")
+
+    def save_checkpoint():
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, checkpoint_path)
+
+    def render_rows(executor, rows):
+        """Renders a batch of claims rows and returns the IDs of those that failed."""
+        claims = [(row['filled_pdf_filename'], pdf_data_from_claim_row(row, boilerplate_texts)) for row in rows]
+        # One fill_many call per worker, so a pdfcpu backend renders each worker's share in a single process
+        share = -(-len(claims) // max(1, workers))
+        shares = [claims[start:start + share] for start in range(0, len(claims), share)]
+        results = executor.map(fill_many, shares, [PDF_TEMPLATE_PATH] * len(shares), [app.config['FILLED_FORMS_DIR']] * len(shares))
+        failed = []
+        for row, result in zip(rows, (result for share_results in results for result in share_results)):
+            if result.path:
+                state['regenerated'] += 1
+            else:
+                failed.append(row['id'])
+                app.logger.error(f"REGENERATE PDFS: Failed to render claim ID {row['id']} ({row['filled_pdf_filename']}): {result.error}")
+        return failed
+
     with app.app_context():
+        # Pooled connection; each batch is its own keyset query, so no read transaction stays open between batches
         db = get_db()
-    print('Initialized the database defined in app.config[DATABASE].')
+        boilerplate_texts = boilerplate_texts_by_id(db)
+        started = time.time()
+        rendered_this_run = 0
+        with ProcessPoolExecutor(max_workers=max(1, workers)) as executor:
+            # Claims that failed in an earlier run lie behind last_claim_id, so they are retried first
+            retry_ids = list(state['failed_claim_ids'])
+            if retry_ids:
+                click.echo(f"Retrying {len(retry_ids)} claim(s) that failed before.")
+            for start in range(0, len(retry_ids), batch_size):
+                chunk = retry_ids[start:start + batch_size]
+                rows = db.execute(
+                    f"SELECT * FROM claims WHERE id IN ({', '.join('?' * len(chunk))}) AND filled_pdf_filename IS NOT NULL AND filled_pdf_filename != '' ORDER BY id",
+                    chunk
+                ).fetchall()
+                still_failed = set(render_rows(executor, rows))
+                # Claims deleted (or left without a PDF) since are dropped as well
+                state['failed_claim_ids'] = [claim_id for claim_id in state['failed_claim_ids'] if claim_id not in chunk or claim_id in still_failed]
+                rendered_this_run += len(rows)
+                save_checkpoint()
+            while True:
+                rows = db.execute(
+                    "SELECT * FROM claims WHERE id > ? AND filled_pdf_filename IS NOT NULL AND filled_pdf_filename != '' ORDER BY id LIMIT ?",
+                    (state['last_claim_id'], batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+                state['failed_claim_ids'].extend(render_rows(executor, rows))
+                rendered_this_run += len(rows)
+                state['last_claim_id'] = rows[-1]['id']
+                save_checkpoint()
+                elapsed = time.time() - started
+                click.echo(f"Processed {rendered_this_run} claims up to ID {state['last_claim_id']} in {elapsed:.1f}s ({rendered_this_run / elapsed:.1f} PDFs/s).")
+
+    elapsed = time.time() - started
+    click.echo(f"Done: {rendered_this_run} claims in {elapsed:.1f}s ({(rendered_this_run / elapsed) if elapsed else 0:.1f} PDFs/s) with {workers} worker(s); {len(state['failed_claim_ids'])} failed.")
+    if state['failed_claim_ids']:
+        click.echo(f"Failed claim IDs: {state['failed_claim_ids']} (checkpoint kept at {checkpoint_path}).")
+    elif os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
 
-print('APP.PY: Registering /login route')
-app.logger.info('APP.PY: Registering /login route')
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     current_app.logger.info(f"LOGIN ROUTE: Method={request.method}, Form data={request.form}")
@@ -1871,13 +2005,43 @@ def logout():
 def health_check():
     return "OK", 200
 
+@app.route('/metrics')
+def prometheus_metrics():
+    """Latency histograms and counters of every worker process, in Prometheus text format."""
+    token = app.config['METRICS_TOKEN']
+    token_ok = bool(token) and request.headers.get('Authorization', '') == f"Bearer {token}"
+    if not token_ok and not (current_user.is_authenticated and current_user.is_admin()):
+        abort(401 if token else 404) # Without a token configured, only admins know the endpoint exists
+    return Response(render_prometheus(metrics.collect()), mimetype='text/plain; version=0.0.4')
+
+@app.route('/admin/pdf_cache_stats')
+@login_required
+@admin_required
+def pdf_cache_stats():
+    return jsonify(pdf_cache.stats())
+
+@app.route('/admin/db_pool_stats')
+@login_required
+@admin_required
+def db_pool_stats():
+    return jsonify(db_pool.stats())
+
+@app.route('/admin/session_stats')
+@login_required
+@admin_required
+def session_store_stats():
+    return jsonify(app.session_interface.stats())
+
+@app.route('/admin/logging_stats')
+@login_required
+@admin_required
+def logging_pipeline_stats():
+    return jsonify(logging_stats())
+
 if __name__ == '__main__':
+    # The development server brings its own database up to date; deployed workers expect `flask migrate-db`
+    create_app()
+    with app.app_context():
+        apply_migrations(get_db(), app.logger)
     app.logger.info("Starting Flask development server.") # Use app.logger here
     app.run(debug=True, port=61663)
-
-# --- ROUTE DEBUGGING SNIPPET ---
-print("=== FLASK APP.PY STARTED ===")
-print("REGISTERED ROUTES:")
-for rule in app.url_map.iter_rules():
-    print(rule, rule.endpoint)
-# --- END ROUTE DEBUGGING SNIPPET ---
@@ -0,0 +1,59 @@
+"""claims and users tables as they stood before versioned migrations; brings older databases up to the same columns."""
+
+CLAIMS_COLUMNS = [
+    'field1_agency TEXT',
+    'field2_name TEXT',
+    'field2_address TEXT',
+    'field2_city TEXT',
+    'field2_state TEXT',
+    'field2_zip TEXT',
+    'field3_type_employment TEXT',
+    'field_pdf_4_dob TEXT',
+    'field_pdf_5_marital_status TEXT',
+    'field6_checkbox_military TEXT',
+    'field7_checkbox_civilian TEXT',
+    'field8_basis_of_claim TEXT',
+    'field9_property_damage_description TEXT',
+    'field10_nature_of_injury TEXT',
+    'field11_witness_name_1 TEXT',
+    'field11_witness_address_1 TEXT',
+    'field11_witness_name_2 TEXT',
+    'field11_witness_address_2 TEXT',
+    'field12a_property_damage_amount TEXT',
+    'field12b_personal_injury_amount TEXT',
+    'field12c_wrongful_death_amount TEXT',
+    'field12d_total_claim_amount TEXT',
+    'field13a_signature TEXT',
+    'field_pdf_13b_phone TEXT',
+    'field14_date_signed TEXT',
+    'user_email_address TEXT',
+    'supplemental_question_1_capitol_experience TEXT',
+    'supplemental_question_2_injuries_damages TEXT',
+    'supplemental_question_3_entry_exit_time TEXT',
+    'supplemental_question_4_inside_capitol_details TEXT',
+    'filled_pdf_filename TEXT',
+    'field17_signature_of_claimant TEXT',
+    'field18_date_of_signature TEXT',
+    'created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP',
+    'updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP',
+]
+
+
+def upgrade(conn):
+    conn.execute(f"CREATE TABLE IF NOT EXISTS claims (id INTEGER PRIMARY KEY AUTOINCREMENT, {', '.join(CLAIMS_COLUMNS)})")
+    # Databases created by older releases may be missing later columns
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(claims)").fetchall()}
+    for column_definition in CLAIMS_COLUMNS:
+        column_name = column_definition.split(' ')[0]
+        if column_name not in existing:
+            if column_name in ('created_at', 'updated_at'):
+                column_definition = f"{column_name} TIMESTAMP"  # ALTER TABLE can't add a non-constant default
+            conn.execute(f"ALTER TABLE claims ADD COLUMN {column_definition}")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL
+        )
+    """)
@@ -0,0 +1,7 @@
+"""users.role: User.create_user and the admin pages have always expected it, but it was never created."""
+
+
+def upgrade(conn):
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(users)").fetchall()}
+    if 'role' not in existing:
+        conn.execute("ALTER TABLE users ADD COLUMN role TEXT NOT NULL DEFAULT 'user'")
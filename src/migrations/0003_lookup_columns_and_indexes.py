@@ -0,0 +1,30 @@
+"""users.username_lower plus the indexes behind the hot lookups in src/utils/hot_queries.py."""
+import sqlite3
+
+# Frozen as shipped: src/utils/hot_queries.py may change, this migration may not
+LOOKUP_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_users_username_lower ON users(username_lower)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_user_email_address ON claims(user_email_address)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_field2_name ON claims(field2_name)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_created_at ON claims(created_at)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_claims_filled_pdf_filename ON claims(filled_pdf_filename)",
+]
+# Used instead of the unique index when existing rows already share a filename
+FILENAME_LOOKUP_INDEX_FALLBACK = "CREATE INDEX IF NOT EXISTS idx_claims_filled_pdf_filename_lookup ON claims(filled_pdf_filename)"
+
+
+def upgrade(conn):
+    user_columns = [row[1] for row in conn.execute("PRAGMA table_info(users)").fetchall()]
+    if user_columns and 'username_lower' not in user_columns:
+        conn.execute("ALTER TABLE users ADD COLUMN username_lower TEXT")
+    if user_columns:
+        conn.execute(
+            "UPDATE users SET username_lower = LOWER(TRIM(username)) WHERE username_lower IS NULL OR username_lower != LOWER(TRIM(username))"
+        )
+    for index_sql in LOOKUP_INDEXES:
+        try:
+            conn.execute(index_sql)
+        except sqlite3.IntegrityError:
+            conn.execute(FILENAME_LOOKUP_INDEX_FALLBACK)
+        except sqlite3.OperationalError:
+            pass  # The table may not exist yet on a brand-new database
@@ -0,0 +1,17 @@
+"""Expression indexes for the /admin/claims.json sort orders and dropdown filters."""
+
+# Frozen as shipped: the expressions are those ADMIN_SORT_EXPRESSIONS in src/utils/claims_query.py had at the time
+ADMIN_QUERY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_claims_sort_created ON claims(COALESCE(created_at, ''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_sort_name ON claims(COALESCE(field2_name, '') COLLATE NOCASE, id)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_sort_total_amount ON claims("
+    "COALESCE(CAST(REPLACE(REPLACE(REPLACE(field12d_total_claim_amount, '$', ''), ',', ''), ' ', '') AS REAL), 0), id)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_sort_signed ON claims(COALESCE(field18_date_of_signature, ''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_state ON claims(field2_state)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_employment ON claims(field3_type_employment COLLATE NOCASE)",
+]
+
+
+def upgrade(conn):
+    for index_sql in ADMIN_QUERY_INDEXES:
+        conn.execute(index_sql)
@@ -0,0 +1,64 @@
+"""UTC epoch companions for created_at/updated_at/field18_date_of_signature, kept in step by triggers and backfilled."""
+from datetime import datetime, timezone
+
+# Frozen as shipped: the admin queries and display code may change, this migration may not
+EPOCH_COLUMNS = {
+    'created_at_epoch': 'created_at',
+    'updated_at_epoch': 'updated_at',
+    'signed_at_epoch': 'field18_date_of_signature',
+}
+_EPOCH_ASSIGNMENTS = ', '.join(f"{epoch_column} = COALESCE(CAST(strftime('%s', NEW.{column}) AS INTEGER), 0)"
+                               for epoch_column, column in EPOCH_COLUMNS.items())
+EPOCH_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_claims_epoch_insert AFTER INSERT ON claims
+        BEGIN UPDATE claims SET {_EPOCH_ASSIGNMENTS} WHERE id = NEW.id; END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_claims_epoch_update AFTER UPDATE OF {', '.join(EPOCH_COLUMNS.values())} ON claims
+        BEGIN UPDATE claims SET {_EPOCH_ASSIGNMENTS} WHERE id = NEW.id; END""",
+]
+EPOCH_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_claims_created_at_epoch ON claims(created_at_epoch, id)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_signed_at_epoch ON claims(signed_at_epoch, id)",
+]
+# Text-column sort indexes (migrations 0003 and 0004) the epoch indexes replace
+SUPERSEDED_INDEXES = ['idx_claims_sort_created', 'idx_claims_sort_signed', 'idx_claims_created_at']
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _to_epoch(text):
+    """UTC epoch seconds for a stored timestamp string (naive = UTC), or 0 if it is empty or can't be parsed."""
+    text = (text or '').strip()
+    if text.endswith('Z'):
+        text = text[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return 0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def upgrade(conn):
+    existing = [row[1] for row in conn.execute("PRAGMA table_info(claims)").fetchall()]
+    for epoch_column in EPOCH_COLUMNS:
+        if epoch_column not in existing:
+            conn.execute(f"ALTER TABLE claims ADD COLUMN {epoch_column} INTEGER NOT NULL DEFAULT 0")
+    for trigger_sql in EPOCH_TRIGGERS:
+        conn.execute(trigger_sql)
+    for index_name in SUPERSEDED_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {index_name}")
+    for index_sql in EPOCH_INDEXES:
+        conn.execute(index_sql)
+
+    # Backfill by id in batches; CAST reads the values as stored (the timestamp converter drops UTC offsets)
+    source_columns = ', '.join(f"CAST({column} AS TEXT)" for column in EPOCH_COLUMNS.values())
+    assignments = ', '.join(f"{epoch_column} = ?" for epoch_column in EPOCH_COLUMNS)
+    last_id = 0
+    while True:
+        rows = conn.execute(f"SELECT id, {source_columns} FROM claims WHERE id > ? ORDER BY id LIMIT ?",
+                            (last_id, BACKFILL_BATCH_SIZE)).fetchall()
+        if not rows:
+            break
+        conn.executemany(f"UPDATE claims SET {assignments} WHERE id = ?",
+                         [tuple(_to_epoch(value) for value in row[1:]) + (row[0],) for row in rows])
+        last_id = rows[-1][0]
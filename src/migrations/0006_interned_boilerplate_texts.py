@@ -0,0 +1,91 @@
+"""boilerplate_texts plus per-claim boilerplate references and deviation flags; splits the boilerplate out of existing rows."""
+import re
+import time
+
+# Frozen as shipped: src/utils/boilerplate_texts.py and DEFAULT_VALUES may change, this migration may not.
+# Claim text column -> (boilerplate reference column, deviation flag column)
+BOILERPLATE_COLUMNS = {
+    'field8_basis_of_claim': ('field8_boilerplate_id', 'field8_deviates_from_boilerplate'),
+    'field10_nature_of_injury': ('field10_boilerplate_id', 'field10_deviates_from_boilerplate'),
+}
+# The standard box 8/10 texts at the time; existing claims are split against these
+BOILERPLATES = {
+    'field8_basis_of_claim': 'While the claimant was protesting on January 6, 2021 at the West side of the U.S. Capitol, the Capitol Police and D.C. Metropolitan Police acting on behalf of the Capitol Police used excessive force against the claimant causing claimant physical injuries. The excessive force took the form of various munitions launched against the protesters including but not limited to: pepper balls, rubber balls or bullets some filled with Oleoresin Capsicum ("OC"), FM 303 projectiles, sting balls, flash bang, sting bomb and tear gas grenades, tripple chasers,pepper spray, CS Gas and physical strikes with firsts or batons.',
+    'field10_nature_of_injury': 'The claimant went to the U.S. Capitol to peacefully protest the presidential election. While the claimant was in the area of the West Side of the U.S. Capitol building police launched weapons referenced above and used excessive force. The claimant was struck and or exposed to the launched munitions and/or OC or CS Gas and suffered injuries as a result. The legal ramifications of these actions are currently under review and form part of the ongoing damages being claimed.',
+}
+CREATE_BOILERPLATE_TEXTS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS boilerplate_texts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    field TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    UNIQUE (field, text)
+)
+"""
+BOILERPLATE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_claims_field8_deviates_from_boilerplate ON claims(field8_deviates_from_boilerplate)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_field10_deviates_from_boilerplate ON claims(field10_deviates_from_boilerplate)",
+]
+SPLIT_BATCH_SIZE = 1000
+
+
+def _normalize_whitespace(text):
+    return re.sub(r'\s+', ' ', (text or '').strip()).lower()
+
+
+def _split_stored_text(text, boilerplate):
+    """The claimant's addition in "<boilerplate>[\\n<addition>]", or None if the text does not start with the boilerplate."""
+    text = text or ''
+    if text.startswith(boilerplate) and text[len(boilerplate):len(boilerplate) + 1] in ('', '\n'):
+        return text[len(boilerplate):].strip()
+    if _normalize_whitespace(text) == _normalize_whitespace(boilerplate):
+        return ''
+    return None
+
+
+def _boilerplate_id(conn, field, text):
+    row = conn.execute("SELECT id FROM boilerplate_texts WHERE field = ? AND text = ?", (field, text)).fetchone()
+    if row:
+        return row[0]
+    return conn.execute("INSERT INTO boilerplate_texts (field, text, created_at) VALUES (?, ?, ?)",
+                        (field, text, time.time())).lastrowid
+
+
+def upgrade(conn):
+    conn.execute(CREATE_BOILERPLATE_TEXTS_TABLE_SQL)
+    existing = [row[1] for row in conn.execute("PRAGMA table_info(claims)").fetchall()]
+    for id_column, flag_column in BOILERPLATE_COLUMNS.values():
+        if id_column not in existing:
+            conn.execute(f"ALTER TABLE claims ADD COLUMN {id_column} INTEGER REFERENCES boilerplate_texts(id)")
+        if flag_column not in existing:
+            conn.execute(f"ALTER TABLE claims ADD COLUMN {flag_column} INTEGER NOT NULL DEFAULT 0")
+    for index_sql in BOILERPLATE_INDEXES:
+        conn.execute(index_sql)
+
+    # Split existing rows by id in batches. Texts that don't start with the boilerplate are kept whole, with no
+    # reference, and count as deviating; each set of updated columns is one executemany
+    boilerplate_ids = {field: _boilerplate_id(conn, field, text) for field, text in BOILERPLATES.items()}
+    fields = list(BOILERPLATE_COLUMNS)
+    id_columns = [id_column for id_column, _ in BOILERPLATE_COLUMNS.values()]
+    last_id = 0
+    while True:
+        rows = conn.execute(f"SELECT id, {', '.join(fields + id_columns)} FROM claims WHERE id > ? ORDER BY id LIMIT ?",
+                            (last_id, SPLIT_BATCH_SIZE)).fetchall()
+        if not rows:
+            break
+        updates = {}
+        for row in rows:
+            values = {}
+            for i, (field, (id_column, flag_column)) in enumerate(BOILERPLATE_COLUMNS.items()):
+                if row[1 + len(fields) + i] is not None:
+                    continue  # Already saved against a boilerplate
+                addition = _split_stored_text(row[1 + i], BOILERPLATES[field])
+                if addition is None:
+                    values.update({field: row[1 + i], id_column: None, flag_column: 1})
+                else:
+                    values.update({field: addition, id_column: boilerplate_ids[field], flag_column: int(bool(addition))})
+            if values:
+                updates.setdefault(tuple(values), []).append(tuple(values.values()) + (row[0],))
+        for columns, params in updates.items():
+            conn.executemany(f"UPDATE claims SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?", params)
+        last_id = rows[-1][0]
@@ -0,0 +1,33 @@
+"""pdf_render_jobs: the persistent background PDF render queue (src/utils/render_queue.py)."""
+
+# Job lifecycle: queued -> running -> done | failed; a queued job is 'cancelled' when a newer one for the same file supersedes it
+CREATE_RENDER_JOBS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS pdf_render_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        claim_id INTEGER,
+        template_path TEXT NOT NULL,
+        output_path TEXT NOT NULL,
+        pdf_data TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL DEFAULT 3,
+        last_error TEXT,
+        run_after REAL NOT NULL DEFAULT 0,
+        locked_by TEXT,
+        locked_at REAL,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL
+    )
+"""
+RENDER_JOBS_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_pdf_render_jobs_status ON pdf_render_jobs(status, run_after)",
+    "CREATE INDEX IF NOT EXISTS idx_pdf_render_jobs_output_path ON pdf_render_jobs(output_path)",
+]
+
+
+def upgrade(conn):
+    # IF NOT EXISTS: databases that ran the queue before this migration already have the table
+    conn.execute(CREATE_RENDER_JOBS_TABLE_SQL)
+    for index_sql in RENDER_JOBS_INDEXES:
+        conn.execute(index_sql)
@@ -0,0 +1,3 @@
+# Numbered schema migrations (NNNN_description.py, each with upgrade(conn)), applied by src/utils/migrations.py.
+# Never edit a migration that has shipped; add a new one. A migration keeps its own SQL and data instead of importing
+# them from src/utils, whose constants go on changing with the code.
@@ -1,5 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from src.utils.helpers import get_db
+from src.utils.hot_queries import SQL_USER_ID_BY_USERNAME
 
 reset_password_bp = Blueprint('reset_password_bp', __name__)
 
@@ -14,7 +15,7 @@ def reset_password():
         else:
             db = get_db()
             cursor = db.cursor()
-            user_row = cursor.execute('SELECT id FROM users WHERE username = ?', (email,)).fetchone()
+            user_row = cursor.execute(SQL_USER_ID_BY_USERNAME, (email,)).fetchone()
             if user_row:
                 # For now, redirect to set_password page (no email delivery yet)
                 return redirect(url_for('set_password', user_id=user_row['id']))
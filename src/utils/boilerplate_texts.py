@@ -0,0 +1,116 @@
+import re
+import time
+
+# --- Interned field 8/10 boilerplate ---
+# Boxes 8 and 10 of every claim open with the same standard text (DEFAULT_VALUES), which used to be saved in full in
+# each row ahead of the claimant's own addition. The standard texts now live once in boilerplate_texts, one row per
+# version of each field's text. A claim keeps only the claimant's addition in field8_basis_of_claim /
+# field10_nature_of_injury, the id of the boilerplate version it was filed with, and a precomputed
+# *_deviates_from_boilerplate flag (the claimant added to or replaced the standard text) that the admin
+# "Show deviations" filters look up through an index. The table, columns and indexes come from migration 0006.
+
+# Claim text column -> (boilerplate reference column, deviation flag column)
+BOILERPLATE_COLUMNS = {
+    'field8_basis_of_claim': ('field8_boilerplate_id', 'field8_deviates_from_boilerplate'),
+    'field10_nature_of_injury': ('field10_boilerplate_id', 'field10_deviates_from_boilerplate'),
+}
+
+
+def normalize_whitespace(text):
+    """Trims, collapses runs of whitespace and lowercases, so whitespace-only edits of a boilerplate are not deviations."""
+    return re.sub(r'\s+', ' ', (text or '').strip()).lower()
+
+
+def intern_boilerplate(conn, field, text):
+    """Id of `text` as a boilerplate version of `field`, adding it the first time it is seen. The caller commits."""
+    row = conn.execute("SELECT id FROM boilerplate_texts WHERE field = ? AND text = ?", (field, text)).fetchone()
+    if row:
+        return row[0]
+    return conn.execute("INSERT INTO boilerplate_texts (field, text, created_at) VALUES (?, ?, ?)",
+                        (field, text, time.time())).lastrowid
+
+
+def current_boilerplate_ids(conn, boilerplates):
+    """{claim text column: boilerplate_texts id} for the current standard texts (DEFAULT_VALUES)."""
+    return {field: intern_boilerplate(conn, field, boilerplates.get(field, '')) for field in BOILERPLATE_COLUMNS}
+
+
+def interned_claim_texts(additions, boilerplate_ids):
+    """
+    Column values saving the claimant's own box 8/10 text (additions: {claim text column: text}) against the
+    boilerplate versions in boilerplate_ids: the current ones for a new claim, the claim's own ones for an edit.
+    A None id saves the text whole, as a replacement of the boilerplate.
+    """
+    values = {}
+    for field, (id_column, flag_column) in BOILERPLATE_COLUMNS.items():
+        if field not in additions:
+            continue
+        if boilerplate_ids[field] is None:
+            # A claim that replaced the boilerplate (see split_claim_texts) keeps its whole text
+            values.update({field: additions[field] or '', id_column: None, flag_column: 1})
+        else:
+            addition = (additions[field] or '').strip()
+            values.update({field: addition, id_column: boilerplate_ids[field], flag_column: int(bool(addition))})
+    return values
+
+
+def split_stored_text(text, boilerplate):
+    """
+    The claimant's addition in a full stored text ("<boilerplate>" or "<boilerplate>\\n<addition>"), or None if the
+    text does not start with this boilerplate. Whitespace-only differences from the boilerplate count as no addition.
+    """
+    text = text or ''
+    if not boilerplate:
+        return None
+    if text.startswith(boilerplate) and text[len(boilerplate):len(boilerplate) + 1] in ('', '\n'):
+        return text[len(boilerplate):].strip()
+    if normalize_whitespace(text) == normalize_whitespace(boilerplate):
+        return ''
+    return None
+
+
+def split_claim_texts(texts, boilerplates, boilerplate_ids):
+    """
+    Column values for full box 8/10 texts as claims used to store them (texts: {claim text column: text}). Texts
+    that don't start with the current boilerplate are kept whole, with no reference, and count as deviating.
+    """
+    values = {}
+    for field, (id_column, flag_column) in BOILERPLATE_COLUMNS.items():
+        if field not in texts:
+            continue
+        addition = split_stored_text(texts[field], boilerplates.get(field, ''))
+        if addition is None:
+            values.update({field: texts[field], id_column: None, flag_column: 1})
+        else:
+            values.update({field: addition, id_column: boilerplate_ids[field], flag_column: int(bool(addition))})
+    return values
+
+
+def claimant_text(claim, field):
+    """
+    The claimant's own box 8/10 text in a stored claims row, without the boilerplate. A row with no boilerplate
+    reference replaced the standard text, so its whole text is the claimant's.
+    """
+    text = claim[field] or ''
+    id_column = BOILERPLATE_COLUMNS[field][0]
+    if id_column in claim.keys() and claim[id_column] is not None:
+        return text.strip()
+    return text
+
+
+def boilerplate_texts_by_id(conn):
+    """{boilerplate_texts id: text} for every version of every field's boilerplate; the table holds a handful of rows."""
+    return dict(conn.execute("SELECT id, text FROM boilerplate_texts").fetchall())
+
+
+def stored_claim_text(claim, field, texts_by_id):
+    """
+    The full box 8/10 text of a stored claims row as it was filed: the boilerplate version it references (looked up
+    in texts_by_id, see boilerplate_texts_by_id) followed by the claimant's addition, or its whole text if it has
+    no reference. Later edits of DEFAULT_VALUES don't change it.
+    """
+    addition = claimant_text(claim, field)
+    id_column = BOILERPLATE_COLUMNS[field][0]
+    boilerplate_id = claim[id_column] if id_column in claim.keys() else None
+    boilerplate = texts_by_id.get(boilerplate_id, '') if boilerplate_id is not None else ''
+    return f"{boilerplate}\n{addition}" if boilerplate and addition else boilerplate or addition
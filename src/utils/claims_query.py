@@ -0,0 +1,190 @@
+import json
+import base64
+from datetime import datetime, timedelta
+
+from src.utils.datetime_display import get_timezone
+
+# --- Admin claims query: filters, sorting and keyset pagination for /admin/claims.json ---
+
+ADMIN_PAGE_SIZE = 100
+ADMIN_MAX_PAGE_SIZE = 500
+
+
+def amount_sql(column):
+    """SQL expression that reads a stored amount ('90000', '$90,000.00', '') as a number."""
+    return f"CAST(REPLACE(REPLACE(REPLACE({column}, '$', ''), ',', ''), ' ', '') AS REAL)"
+
+
+# Sortable admin columns (by display header) -> SQL expression. Expressions must match the indexes created by the
+# migrations (src/migrations/0004_admin_query_indexes.py, 0005) exactly for SQLite to walk an index instead of sorting.
+ADMIN_SORT_EXPRESSIONS = {
+    'ID': "COALESCE(filled_pdf_filename, '') COLLATE NOCASE",
+    'Claimant Name': "COALESCE(field2_name, '') COLLATE NOCASE",
+    'Email Address': "COALESCE(user_email_address, '') COLLATE NOCASE",
+    'Phone Number': "COALESCE(field_pdf_13b_phone, '')",
+    'Basis of Claim': "COALESCE(field8_basis_of_claim, '') COLLATE NOCASE",
+    'Nature of Injury': "COALESCE(field10_nature_of_injury, '') COLLATE NOCASE",
+    'Capitol Experience': "COALESCE(supplemental_question_1_capitol_experience, '') COLLATE NOCASE",
+    'Injuries/Damages': "COALESCE(supplemental_question_2_injuries_damages, '') COLLATE NOCASE",
+    'Entry/Exit Time': "COALESCE(supplemental_question_3_entry_exit_time, '') COLLATE NOCASE",
+    'Inside Capitol Details': "COALESCE(supplemental_question_4_inside_capitol_details, '') COLLATE NOCASE",
+    'Property Damage Amount': f"COALESCE({amount_sql('field12a_property_damage_amount')}, 0)",
+    'Personal Injury Amount': f"COALESCE({amount_sql('field12b_personal_injury_amount')}, 0)",
+    'Wrongful Death Amount': f"COALESCE({amount_sql('field12c_wrongful_death_amount')}, 0)",
+    'Total Claim Amount': f"COALESCE({amount_sql('field12d_total_claim_amount')}, 0)",
+    'Signature': "COALESCE(field13a_signature, '') COLLATE NOCASE",
+    'Type of Employment': "COALESCE(field3_type_employment, '') COLLATE NOCASE",
+    'Marital Status': "COALESCE(field_pdf_5_marital_status, '') COLLATE NOCASE",
+    'Street Address': "COALESCE(field2_address, '') COLLATE NOCASE",
+    'City': "COALESCE(field2_city, '') COLLATE NOCASE",
+    'State': "COALESCE(field2_state, '')",
+    'Zip Code': "COALESCE(field2_zip, '')",
+    'Date and Time Created': "created_at_epoch",  # UTC epoch seconds; see src/migrations/0005_claim_epoch_timestamps.py
+    'Date and Time Signed': "signed_at_epoch",  # 0 while unsigned
+}
+ADMIN_DEFAULT_SORT = ('Date and Time Created', 'desc')
+
+# Substring filters (case-insensitive, like the old client-side "includes" filters): query param -> column
+ADMIN_TEXT_FILTERS = {
+    'name': 'field2_name',
+    'email': 'user_email_address',
+    'phone': 'field_pdf_13b_phone',
+    'street': 'field2_address',
+    'city': 'field2_city',
+    'zip': 'field2_zip',
+    'basis': 'field8_basis_of_claim',
+    'injury': 'field10_nature_of_injury',
+    'capitol_experience': 'supplemental_question_1_capitol_experience',
+    'injuries_damages': 'supplemental_question_2_injuries_damages',
+    'entry_exit_time': 'supplemental_question_3_entry_exit_time',
+    'inside_capitol_details': 'supplemental_question_4_inside_capitol_details',
+    'signature_text': 'field13a_signature',
+}
+# Exact-match dropdown filters: query param -> column
+ADMIN_EXACT_FILTERS = {
+    'state': 'field2_state',
+    'marital_status': 'field_pdf_5_marital_status',
+}
+# Amount range filters: query param prefix (<prefix>_min / <prefix>_max) -> column
+ADMIN_AMOUNT_FILTERS = {
+    'amount': 'field12d_total_claim_amount',
+    'prop_dmg': 'field12a_property_damage_amount',
+    'pers_inj': 'field12b_personal_injury_amount',
+    'wrongful_death': 'field12c_wrongful_death_amount',
+}
+# "Show deviations" toggles: query param -> precomputed, indexed flag column (see src/utils/boilerplate_texts.py)
+ADMIN_DEVIATION_FILTERS = {
+    'basis_deviation': 'field8_deviates_from_boilerplate',
+    'injury_deviation': 'field10_deviates_from_boilerplate',
+}
+
+PENDING_SIGNATURE_SQL = "LOWER(TRIM(COALESCE(field13a_signature, ''))) = 'pending signature'"
+
+
+def encode_cursor(sort_value, claim_id):
+    raw = json.dumps([sort_value, claim_id], default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        sort_value, claim_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return sort_value, int(claim_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def _local_day_start_epoch(date_str, tz, days=0):
+    """UTC epoch seconds of local midnight on date_str (plus `days`), comparable with the *_epoch columns."""
+    local_midnight = tz.localize(datetime.strptime(date_str, '%Y-%m-%d') + timedelta(days=days))
+    return int(local_midnight.timestamp())
+
+
+def build_admin_claims_filters(params, tz_name='America/New_York'):
+    """WHERE clauses and their args for the filter params. Raises ValueError for malformed values."""
+    where, args = [], []
+    for param, column in ADMIN_TEXT_FILTERS.items():
+        value = (params.get(param) or '').strip()
+        if value:
+            where.append(f"{column} LIKE ? ESCAPE '\\'")
+            args.append('%' + value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    for param, column in ADMIN_EXACT_FILTERS.items():
+        value = (params.get(param) or '').strip()
+        if value:
+            where.append(f"{column} = ?")
+            args.append(value)
+    employment = (params.get('employment') or '').strip()
+    if employment:
+        where.append("field3_type_employment = ? COLLATE NOCASE")
+        args.append(employment)
+    for prefix, column in ADMIN_AMOUNT_FILTERS.items():
+        for bound, operator in (('min', '>='), ('max', '<=')):
+            value = (params.get(f'{prefix}_{bound}') or '').strip()
+            if value:
+                # A blank amount never matches an active range, as in the old client-side filter
+                where.append(f"TRIM(COALESCE({column}, '')) != '' AND {amount_sql(column)} {operator} ?")
+                args.append(float(value))
+
+    # Date ranges are whole days in tz_name (the timezone the table displays), compared as UTC epoch seconds
+    tz = get_timezone(tz_name)
+    for prefix, column in (('created', 'created_at_epoch'), ('signed', 'signed_at_epoch')):
+        start = (params.get(f'{prefix}_start') or '').strip()
+        end = (params.get(f'{prefix}_end') or '').strip()
+        if start or end:
+            where.append(f"{column} > 0")
+        if start:
+            where.append(f"{column} >= ?")
+            args.append(_local_day_start_epoch(start, tz))
+        if end:
+            where.append(f"{column} < ?")
+            args.append(_local_day_start_epoch(end, tz, days=1))
+
+    signature_status = (params.get('signature_status') or 'all').lower()
+    if signature_status == 'pending':
+        where.append(PENDING_SIGNATURE_SQL)
+    elif signature_status == 'signed':
+        where.append(f"NOT {PENDING_SIGNATURE_SQL} AND TRIM(COALESCE(field13a_signature, '')) != ''")
+
+    for param, column in ADMIN_DEVIATION_FILTERS.items():
+        if (params.get(param) or '').lower() in ('1', 'true', 'on'):
+            where.append(f"{column} = 1")
+    return where, args
+
+
+def build_admin_claims_count(params, tz_name='America/New_York'):
+    where, args = build_admin_claims_filters(params, tz_name)
+    sql = "SELECT COUNT(*) FROM claims"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return sql, args
+
+
+def build_admin_claims_query(params, select_columns, tz_name='America/New_York', limit=ADMIN_PAGE_SIZE):
+    """
+    Builds one page of the admin claims query from request params.
+    Returns (sql, args, sort_header, direction). The last selected column is the sort value (aliased sort_value),
+    which together with id forms the keyset cursor for the next page.
+    Raises ValueError for malformed params.
+    """
+    sort_header = params.get('sort') or ADMIN_DEFAULT_SORT[0]
+    if sort_header not in ADMIN_SORT_EXPRESSIONS:
+        raise ValueError(f"Unknown sort column: {sort_header}")
+    direction = (params.get('dir') or (ADMIN_DEFAULT_SORT[1] if sort_header == ADMIN_DEFAULT_SORT[0] else 'asc')).lower()
+    if direction not in ('asc', 'desc'):
+        raise ValueError(f"Unknown sort direction: {direction}")
+    sort_expr = ADMIN_SORT_EXPRESSIONS[sort_header]
+
+    where, args = build_admin_claims_filters(params, tz_name)
+    cursor = params.get('cursor')
+    if cursor:
+        last_value, last_id = decode_cursor(cursor)
+        comparison = '>' if direction == 'asc' else '<'
+        where.append(f"({sort_expr} {comparison} ? OR ({sort_expr} = ? AND id {comparison} ?))")
+        args.extend([last_value, last_value, last_id])
+
+    sql = f"SELECT {', '.join(select_columns)}, {sort_expr} AS sort_value FROM claims"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {sort_expr} {direction.upper()}, id {direction.upper()} LIMIT ?"
+    args.append(max(1, min(int(limit), ADMIN_MAX_PAGE_SIZE)))
+    return sql, args, sort_header, direction
@@ -0,0 +1,84 @@
+import os
+import logging
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+# --- Display formatting for stored timestamps ---
+# claims timestamps come back in several shapes: datetime objects (TIMESTAMP columns), 'YYYY-MM-DD HH:MM:SS[.ffffff]
+# [+00:00]' (datetimes stored by sqlite3's adapter) and 'YYYY-MM-DDTHH:MM[:SS][+/-HH:MM]' (signature path).
+# datetime.fromisoformat reads all of them in one pass; naive values are UTC. Integers are UTC epoch seconds (the
+# *_epoch columns, see src/migrations/0005_claim_epoch_timestamps.py).
+
+DISPLAY_TIMEZONE = 'America/New_York'
+DISPLAY_FORMAT = '%m/%d/%Y %I:%M %p'
+DATETIME_DISPLAY_CACHE_SIZE = int(os.environ.get('DATETIME_DISPLAY_CACHE_SIZE', 4096))
+
+
+@lru_cache(maxsize=None)
+def get_timezone(tz_name):
+    """pytz timezone by name, looked up once per process."""
+    return pytz.timezone(tz_name)
+
+
+def parse_stored_datetime(value):
+    """Aware UTC datetime for a stored timestamp (string, datetime or epoch seconds), or None if it can't be parsed."""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        text = str(value).strip()
+        if text.endswith('Z'):
+            text = text[:-1] + '+00:00'
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+@lru_cache(maxsize=DATETIME_DISPLAY_CACHE_SIZE)
+def _format_for_display(value, tz_name):
+    parsed = parse_stored_datetime(value)
+    if parsed is None:
+        # Cached like any other result, so each bad value is only reported once per process
+        logger.warning(f"Unrecognized timestamp '{value}'; shown as stored.")
+        return str(value)
+    return parsed.astimezone(get_timezone(tz_name)).strftime(DISPLAY_FORMAT)
+
+
+def format_datetime_for_display(value, tz_name=DISPLAY_TIMEZONE):
+    """
+    'MM/DD/YYYY hh:mm AM/PM' in tz_name for a stored UTC timestamp; 'Pending' if empty or 0, the value itself if it
+    can't be parsed. Results are memoized (DATETIME_DISPLAY_CACHE_SIZE entries).
+    """
+    if not value:
+        return "Pending"
+    if not isinstance(value, (str, datetime, int, float)):
+        return str(value)
+    return _format_for_display(value, tz_name)
+
+
+def format_datetime_columns(rows, columns, tz_name=DISPLAY_TIMEZONE):
+    """
+    Batch form of format_datetime_for_display for a whole result set: one {column: display value} dict per row.
+    A value repeated within the batch (e.g. created_at == updated_at) is formatted once.
+    """
+    formatted_values = {}
+    formatted_rows = []
+    for row in rows:
+        formatted = {}
+        for column in columns:
+            value = row[column]
+            if value not in formatted_values:
+                formatted_values[value] = format_datetime_for_display(value, tz_name)
+            formatted[column] = formatted_values[value]
+        formatted_rows.append(formatted)
+    return formatted_rows
+
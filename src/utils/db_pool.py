@@ -0,0 +1,234 @@
+import os
+import re
+import time
+import queue
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))  # Seconds to wait for a free connection
+DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))  # How long SQLite retries a locked database
+DB_MMAP_SIZE = int(os.environ.get('DB_MMAP_SIZE', 256 * 1024 * 1024))
+DB_CACHED_STATEMENTS = int(os.environ.get('DB_CACHED_STATEMENTS', 256))
+# Write statements slower than this are counted as lock waits (see PooledCursor)
+DB_SLOW_WRITE_MS = float(os.environ.get('DB_SLOW_WRITE_MS', 100))
+
+WRITE_STATEMENT_RE = re.compile(r'^\s*(INSERT|UPDATE|DELETE|REPLACE|BEGIN\s+(IMMEDIATE|EXCLUSIVE)|COMMIT|END)\b', re.IGNORECASE)
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes free within the pool timeout."""
+
+
+def is_lock_error(error):
+    """True for the OperationalError SQLite raises once busy_timeout runs out ("database is locked")."""
+    return isinstance(error, sqlite3.OperationalError) and 'locked' in str(error).lower()
+
+
+class PooledCursor(sqlite3.Cursor):
+    """
+    Times write statements for the pool that opened the connection. In WAL mode a write first takes the database's
+    single write lock, and while another connection holds it SQLite sleeps inside the statement for up to
+    busy_timeout, so slow writes (and "database is locked" errors) are where lock contention shows up.
+    """
+
+    def execute(self, sql, parameters=()):
+        return self._observe(sqlite3.Cursor.execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._observe(sqlite3.Cursor.executemany, sql, seq_of_parameters)
+
+    def _observe(self, method, sql, parameters):
+        pool = self.connection.pool
+        if pool is None or not WRITE_STATEMENT_RE.match(sql):
+            return method(self, sql, parameters)
+        started = time.monotonic()
+        try:
+            result = method(self, sql, parameters)
+        except sqlite3.OperationalError as e:
+            if is_lock_error(e):
+                pool.observe_write(time.monotonic() - started, locked=True)
+            raise
+        pool.observe_write(time.monotonic() - started)
+        return result
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose cursors, including the ones conn.execute() and conn.executemany() create, are PooledCursors."""
+
+    pool = None  # Set by the ConnectionPool that opened it
+
+    def cursor(self, factory=PooledCursor):
+        return super().cursor(factory)
+
+    # sqlite3's own shortcuts build a plain Cursor in C without going through cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class ConnectionPool:
+    """
+    Long-lived SQLite connections shared by request threads. Each connection runs in WAL mode with
+    synchronous=NORMAL, a busy timeout and mmap reads, and keeps its own prepared-statement cache, so a
+    request borrows a warm connection instead of opening the file again. Readers no longer block the
+    writer (and vice versa); writers still take turns, waiting on busy_timeout rather than failing.
+    stats() reports both kinds of waiting: for a free pooled connection (waits, wait_seconds) and, with a
+    PooledConnection factory, for SQLite's write lock (slow_writes, slow_write_seconds, locked_errors).
+    The pool is per process: a forked worker discards connections inherited from its parent.
+    """
+
+    def __init__(self, db_path, max_size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT, busy_timeout_ms=DB_BUSY_TIMEOUT_MS,
+                 mmap_size=DB_MMAP_SIZE, cached_statements=DB_CACHED_STATEMENTS, connection_factory=PooledConnection,
+                 slow_write_ms=DB_SLOW_WRITE_MS):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+        self.connection_factory = connection_factory
+        self.slow_write_seconds = slow_write_ms / 1000
+        self._lock = threading.Lock()
+        self._reset_state()
+
+    def _reset_state(self):
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue()  # LIFO keeps the hottest connections (and their caches) in use
+        self._created = 0
+        self._in_use = 0
+        self._stats = {'acquired': 0, 'created': 0, 'waits': 0, 'wait_seconds': 0.0, 'timeouts': 0, 'discarded': 0,
+                       'slow_writes': 0, 'slow_write_seconds': 0.0, 'locked_errors': 0}
+
+    def _check_pid(self):
+        # Connections must not cross a fork; the child starts with an empty pool
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset_state()
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES, timeout=self.busy_timeout_ms / 1000,
+                               check_same_thread=False, cached_statements=self.cached_statements,
+                               factory=self.connection_factory)
+        conn.row_factory = sqlite3.Row
+        if isinstance(conn, PooledConnection):
+            conn.pool = self
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        return conn
+
+    def acquire(self):
+        """Borrows a connection, opening a new one while the pool is below max_size. Raises PoolTimeout."""
+        self._check_pid()
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                can_create = self._created < self.max_size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+                with self._lock:
+                    self._stats['created'] += 1
+            else:
+                wait_started = time.monotonic()
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self._stats['timeouts'] += 1
+                    raise PoolTimeout(f"No database connection free after {self.timeout}s (pool size {self.max_size}).")
+                finally:
+                    with self._lock:
+                        self._stats['waits'] += 1
+                        self._stats['wait_seconds'] += time.monotonic() - wait_started
+        with self._lock:
+            self._in_use += 1
+            self._stats['acquired'] += 1
+        return conn
+
+    def observe_write(self, seconds, locked=False):
+        """Records one timed write statement; called by PooledCursor."""
+        if not locked and seconds < self.slow_write_seconds:
+            return
+        with self._lock:
+            if locked:
+                self._stats['locked_errors'] += 1
+            else:
+                self._stats['slow_writes'] += 1
+                self._stats['slow_write_seconds'] += seconds
+
+    def release(self, conn):
+        """Returns a borrowed connection. Any transaction left open is rolled back first."""
+        if conn is None:
+            return
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
+        if self._pid != os.getpid():
+            return  # Borrowed before a fork; never hand it to this process's pool
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding pooled connection that failed to roll back: {e}")
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._created -= 1
+            self._stats['discarded'] += 1
+
+    def warm(self, count):
+        """Opens connections until `count` (at most max_size) exist, so the first requests don't wait to open them."""
+        borrowed = []
+        try:
+            while len(borrowed) < min(count, self.max_size):
+                borrowed.append(self.acquire())
+        finally:
+            for conn in borrowed:
+                self.release(conn)
+        return len(borrowed)
+
+    def close_all(self):
+        """Closes every idle connection; used at shutdown and by tests."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'max_size': self.max_size,
+                'open': self._created,
+                'in_use': self._in_use,
+                'idle': self._idle.qsize(),
+            })
+        stats['wait_seconds'] = round(stats['wait_seconds'], 4)
+        stats['slow_write_seconds'] = round(stats['slow_write_seconds'], 4)
+        return stats
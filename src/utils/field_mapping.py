@@ -0,0 +1,192 @@
+import string
+import logging
+
+from src.utils.helpers import format_phone
+
+logger = logging.getLogger(__name__)
+
+# --- Declarative field mapping ---
+# Two pipelines take a claim from the submitted form to the pdfcpu payload both fill backends consume:
+#   form data --FORM_FIELD_SPEC--> PDF data (what is stored in the session/DB) --PDF_FIELD_MAP--> pdfcpu payload
+# Each spec is compiled once, when the module defining it loads, into a flat list of (key, callable) pairs, so a
+# fill is a single loop of plain function calls: no per-call imports, spec lookups or type checks.
+
+# Form data -> PDF data. Each entry is (PDF data key, (transform, *args)); the transforms are in FORM_TRANSFORMS.
+FORM_FIELD_SPEC = [
+    ('field2_claimant_info_combined', ('format', "{field2_name}\n{field2_address}\n{field2_city}, {field2_state} {field2_zip}")),
+    ('field2_name', ('copy', 'field2_name')),
+    ('field2_address', ('copy', 'field2_address')),
+    ('field2_city', ('copy', 'field2_city')),
+    ('field2_state', ('copy', 'field2_state')),
+    ('field2_zip', ('copy', 'field2_zip')),
+    ('field3_type_employment', ('choice', 'field3_type_employment', 'Other', 'field3_other_specify')),
+    ('field3_checkbox_civilian', ('equals', 'field3_type_employment', 'Civilian')),
+    ('field3_checkbox_military', ('equals', 'field3_type_employment', 'Military')),
+    ('field_pdf_4_dob', ('copy', 'field_pdf_4_dob')),
+    ('field_pdf_5_marital_status', ('copy', 'field_pdf_5_marital_status')),
+    ('field8_basis_of_claim', ('boilerplate', 'field8_basis_of_claim', 'field8_basis_of_claim')),
+    ('field9_property_damage_description', ('join_or_default', ['field9_property_damage_description_vehicle', 'field9_property_damage_description_other'], 'field9_property_damage_description')),
+    ('field9_owner_name_address', ('default', 'field9_owner_name_address', 'field9_owner_name_address')),
+    ('field10_nature_of_injury', ('boilerplate', 'field10_nature_of_injury', 'field10_nature_of_injury')),
+    ('field11_witness_name', ('default', 'field11_witness_name', 'field11_witness_name')),
+    ('field11_witness_address', ('default', 'field11_witness_address', 'field11_witness_address')),
+    ('field12a_property_damage', ('default', 'field12a_property_damage_amount', 'field12a_property_damage')),
+    ('field12b_personal_injury', ('default', 'field12b_personal_injury_amount', 'field12b_personal_injury')),
+    ('field12c_wrongful_death', ('default', 'field12c_wrongful_death_amount', 'field12c_wrongful_death')),
+    ('field12d_total_claim_amount', ('first', ['field12d_total_amount', 'field12d_total_claim_amount'], 'field12d_total_claim_amount')),
+    ('field13a_signature', ('copy', 'field13a_signature', 'Pending Signature')),
+    ('field_pdf_13b_phone', ('copy', 'field_pdf_13b_phone')),
+    ('field14_date_signed', ('copy', 'field14_date_signed')),
+    ('field15_accident_insurance', ('copy', 'field15_accident_insurance')),
+    ('field15_insurer_name_address_policy', ('copy', 'field15_insurer_name_address_policy')),
+    ('field16_filed_claim', ('copy', 'field16_filed_claim')),
+    ('field16_claim_details', ('copy', 'field16_claim_details')),
+    ('field17_deductible_amount', ('copy', 'field17_deductible_amount')),
+    ('field18_insurer_action', ('copy', 'field18_insurer_action')),
+    ('field19_liability_insurance', ('copy', 'field19_liability_insurance')),
+    ('field19_insurer_name_address', ('copy', 'field19_insurer_name_address')),
+]
+
+# PDF data -> pdfcpu payload: how PDF_FIELD_MAP keys are typed/formatted (everything else is a plain textfield)
+CHECKBOX_FIELDS = ('field3_checkbox_civilian', 'field3_checkbox_military')
+MONEY_FIELDS = ('field12a_property_damage', 'field12b_personal_injury', 'field12c_wrongful_death', 'field12d_total_claim_amount')
+PHONE_FIELDS = ('field_pdf_13b_phone',)
+
+
+# --- Form transforms: factory(defaults, *args) -> callable(form_data) ---
+
+def _copy(defaults, source, default=''):
+    return lambda form: form.get(source, default)
+
+
+def _default(defaults, source, default_key):
+    # A missing key falls back to the default; a submitted blank stays blank
+    default = defaults.get(default_key, '')
+    return lambda form: form.get(source, default)
+
+
+def _first(defaults, sources, default_key):
+    default = defaults.get(default_key, '')
+    def transform(form):
+        for source in sources:
+            if source in form:
+                return form[source]
+        return default
+    return transform
+
+
+def _format(defaults, template):
+    # The template's {field} names are resolved once; each call only fills the slots (missing keys read as '')
+    sources = [name for _, name, _, _ in string.Formatter().parse(template) if name]
+    slots = template
+    for index, name in enumerate(sources):
+        slots = slots.replace('{' + name + '}', '{' + str(index) + '}', 1)
+    return lambda form: slots.format(*[form.get(source, '') for source in sources]).strip()
+
+
+def _choice(defaults, source, other_value, other_source):
+    def transform(form):
+        value = form.get(source, '')
+        return form.get(other_source, '') if value == other_value else value
+    return transform
+
+
+def _equals(defaults, source, value):
+    return lambda form: form.get(source, '') == value
+
+
+def _boilerplate(defaults, source, default_key):
+    # The standard text always comes first; anything the claimant typed is appended below it
+    boilerplate = defaults.get(default_key, '')
+    def transform(form):
+        user_text = form.get(source, '').strip()
+        return f"{boilerplate}\n{user_text}" if user_text else boilerplate
+    return transform
+
+
+def _join_or_default(defaults, sources, default_key):
+    default = defaults.get(default_key, '')
+    def transform(form):
+        joined = '\n'.join(form.get(source, '') for source in sources).strip()
+        return joined if joined else default
+    return transform
+
+
+FORM_TRANSFORMS = {
+    'copy': _copy,
+    'default': _default,
+    'first': _first,
+    'format': _format,
+    'choice': _choice,
+    'equals': _equals,
+    'boilerplate': _boilerplate,
+    'join_or_default': _join_or_default,
+}
+
+
+def compile_form_spec(spec, defaults):
+    """Compiles a FORM_FIELD_SPEC-style list into [(PDF data key, callable(form_data))]."""
+    return [(key, FORM_TRANSFORMS[transform](defaults, *args)) for key, (transform, *args) in spec]
+
+
+def run_form_pipeline(pipeline, form_data):
+    return {key: transform(form_data) for key, transform in pipeline}
+
+
+# --- Payload transforms: callable(value) -> value written to the PDF ---
+
+def _money(app_key):
+    def transform(value):
+        try:
+            return f"${float(value):,.2f}"
+        except ValueError:
+            logger.warning(f"Could not convert monetary field '{app_key}' value '{value}' to float. Using original value.")
+            return value
+    return transform
+
+
+def _checkbox(app_key):
+    def transform(value):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            lowered = value.lower()
+            if lowered not in ('true', 'false'):
+                logger.warning(f"Checkbox '{app_key}' received ambiguous string '{value}'. Interpreting as False.")
+            return lowered == 'true'
+        return bool(value)
+    return transform
+
+
+def compile_payload_spec(field_map, defaults):
+    """
+    Compiles PDF_FIELD_MAP (PDF data key -> PDF field name) and DEFAULT_VALUES into
+    [(PDF data key, PDF field name, pdfcpu field type, default, callable(value) or None)].
+    """
+    pipeline = []
+    for app_key, pdf_field_name in field_map.items():
+        if app_key in CHECKBOX_FIELDS:
+            field_type, transform = 'checkbox', _checkbox(app_key)
+        elif app_key in MONEY_FIELDS:
+            field_type, transform = 'textfield', _money(app_key)
+        elif app_key in PHONE_FIELDS:
+            field_type, transform = 'textfield', format_phone
+        else:
+            field_type, transform = 'textfield', None
+        pipeline.append((app_key, pdf_field_name, field_type, defaults.get(app_key), transform))
+    return pipeline
+
+
+def run_payload_pipeline(pipeline, pdf_data):
+    """pdfcpu-style payload ({"forms": [{"textfield": [...], "checkbox": [...]}]}) for mapped PDF data."""
+    fields_by_type = {}
+    for app_key, pdf_field_name, field_type, default, transform in pipeline:
+        value = pdf_data.get(app_key)
+        if value is None or (value.strip() == '' if isinstance(value, str) else str(value).strip() == ''):
+            value = default  # Blank or missing: use the default, or leave the field out if there is none
+            if value is None:
+                continue
+        if transform is not None:
+            value = transform(value)
+        fields_by_type.setdefault(field_type, []).append({"name": pdf_field_name, "value": value})
+    return {"forms": [fields_by_type]}
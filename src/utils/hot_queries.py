@@ -0,0 +1,19 @@
+# --- Hot lookup queries ---
+# Every per-request lookup on claims/users lives here so tests/test_hot_queries.py can check each one against
+# EXPLAIN QUERY PLAN and fail if it falls back to a full table scan.
+
+SQL_USER_BY_USERNAME = "SELECT * FROM users WHERE username_lower = ?"
+SQL_USER_ID_BY_USERNAME = "SELECT id FROM users WHERE username_lower = ?"
+SQL_CLAIM_ID_BY_CLAIMANT_NAME = "SELECT id FROM claims WHERE field2_name = ?"
+SQL_CLAIM_BY_FILENAME = "SELECT * FROM claims WHERE filled_pdf_filename = ?"
+SQL_CLAIM_EMAIL_BY_FILENAME = "SELECT user_email_address FROM claims WHERE filled_pdf_filename = ?"
+SQL_CLAIMS_NEWEST_FIRST = "SELECT {columns} FROM claims ORDER BY created_at_epoch DESC, id DESC"  # .format(columns=...)
+
+HOT_QUERIES = {
+    'user_by_username': (SQL_USER_BY_USERNAME, ('someone@example.com',)),
+    'user_id_by_username': (SQL_USER_ID_BY_USERNAME, ('someone@example.com',)),
+    'claim_id_by_claimant_name': (SQL_CLAIM_ID_BY_CLAIMANT_NAME, ('Jane Doe',)),
+    'claim_by_filename': (SQL_CLAIM_BY_FILENAME, ('claim_SF95.pdf',)),
+    'claim_email_by_filename': (SQL_CLAIM_EMAIL_BY_FILENAME, ('claim_SF95.pdf',)),
+    'claims_newest_first': (SQL_CLAIMS_NEWEST_FIRST.format(columns='*'), ()),
+}
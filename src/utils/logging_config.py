@@ -1,42 +1,374 @@
 import logging
+import logging.handlers
 import sys
 import os
+import copy
+import gzip
+import json
+import time
+import queue
+import atexit
+import shutil
+import threading
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
-def setup_logging(log_level_str='INFO', log_file='app.log'):
+# --- Asynchronous logging ---
+# With LOG_ASYNC on (the default), loggers only put records on a bounded in-memory queue; one background thread
+# writes them to the real handlers in batches. A full queue drops records (counted) instead of blocking the request.
+LOG_ASYNC = os.environ.get('LOG_ASYNC', '1').lower() not in ('0', 'false', 'no')
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+LOG_BATCH_SIZE = int(os.environ.get('LOG_BATCH_SIZE', 256))
+
+# --- app.log format, rotation and retention ---
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json').lower()  # 'json' (one event per line) or 'text'
+LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 5 * 1024 * 1024))  # Rotate app.log at this size
+LOG_RETENTION_BYTES = int(os.environ.get('LOG_RETENTION_BYTES', 50 * 1024 * 1024))  # Total size of kept .gz files
+LOG_MAX_BACKUPS = int(os.environ.get('LOG_MAX_BACKUPS', 200))
+
+# --- Sampling of verbose per-request events (log_event(..., sample=True)) ---
+LOG_EVENT_RATE = float(os.environ.get('LOG_EVENT_RATE', 1))  # Events per second allowed per event name
+LOG_EVENT_BURST = int(os.environ.get('LOG_EVENT_BURST', 10))
+
+
+class AsyncLogDispatcher:
+    """
+    Single queue + listener thread shared by every logger that logs asynchronously. Each BoundedQueueHandler
+    tags its records with a route, and the listener hands them to that route's handlers, flushing each handler
+    once per batch instead of once per record.
+    """
+
+    def __init__(self, maxsize=LOG_QUEUE_SIZE, batch_size=LOG_BATCH_SIZE):
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self._routes = {}
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.queue = queue.Queue(self.maxsize)
+        self._thread = None
+        self._pid = os.getpid()
+        self._stats = {'enqueued': 0, 'written': 0, 'batches': 0, 'max_batch': 0, 'max_depth': 0, 'dropped': 0, 'handler_errors': 0}
+        self._dropped_by_level = {}
+        self._unreported_drops = 0
+
+    def add_route(self, handlers):
+        with self._lock:
+            route = len(self._routes)
+            self._routes[route] = list(handlers)
+        return route
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='log-listener', daemon=True)
+            self._thread.start()
+
+    def after_fork_in_child(self):
+        # The parent's listener thread does not survive fork (and its queue lock may be held); start afresh
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._reset()
+        self.start()
+
+    def enqueue(self, record):
+        if self._pid != os.getpid():
+            self.after_fork_in_child()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._stats_lock:
+                self._stats['dropped'] += 1
+                self._unreported_drops += 1
+                self._dropped_by_level[record.levelname] = self._dropped_by_level.get(record.levelname, 0) + 1
+            return
+        with self._stats_lock:
+            self._stats['enqueued'] += 1
+            depth = self.queue.qsize()
+            if depth > self._stats['max_depth']:
+                self._stats['max_depth'] = depth
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                break
+            batch = [record]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                    break
+                batch.append(record)
+            self._write_batch(batch)
+            if stop:
+                break
+
+    def _write_batch(self, batch):
+        with self._stats_lock:
+            dropped, self._unreported_drops = self._unreported_drops, 0
+        if dropped:
+            # Make lost records visible in the log itself, not just in logging_stats()
+            batch.append(logging.LogRecord(__name__, logging.WARNING, __file__, 0,
+                                           f"Log queue full: dropped {dropped} record(s).", None, None))
+        by_route = {}
+        for record in batch:
+            by_route.setdefault(getattr(record, 'log_route', 0), []).append(record)
+        written = 0
+        for route, records in by_route.items():
+            for handler in self._routes.get(route, []):
+                written += self._write_to_handler(handler, records)
+        with self._stats_lock:
+            self._stats['batches'] += 1
+            self._stats['written'] += written
+            if len(batch) > self._stats['max_batch']:
+                self._stats['max_batch'] = len(batch)
+
+    def _write_to_handler(self, handler, records):
+        written = 0
+        deferred_flush = isinstance(handler, logging.StreamHandler)
+        if deferred_flush:
+            handler.flush = lambda: None  # StreamHandler.emit flushes per record; flush once for the batch instead
+        try:
+            for record in records:
+                if record.levelno >= handler.level:
+                    try:
+                        handler.handle(record)
+                        written += 1
+                    except Exception:
+                        with self._stats_lock:
+                            self._stats['handler_errors'] += 1
+        finally:
+            if deferred_flush:
+                del handler.flush
+                try:
+                    handler.flush()
+                except Exception:
+                    with self._stats_lock:
+                        self._stats['handler_errors'] += 1
+        return written
+
+    def stop(self, timeout=5):
+        """Writes everything still queued, then stops the listener (registered with atexit)."""
+        thread = self._thread
+        if thread and thread.is_alive() and self._pid == os.getpid():
+            try:
+                self.queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            thread.join(timeout)
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats['dropped_by_level'] = dict(self._dropped_by_level)
+        stats.update({'async': True, 'queue_depth': self.queue.qsize(), 'queue_size': self.maxsize, 'batch_size': self.batch_size})
+        return stats
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: records go to the shared dispatcher and are dropped when it is full."""
+
+    def __init__(self, dispatcher, route):
+        super().__init__(dispatcher.queue)
+        self.dispatcher = dispatcher
+        self.route = route
+
+    def prepare(self, record):
+        if hasattr(record, 'event_fields'):
+            # log_event already snapshotted the fields; formatting them is left to the listener thread
+            record = copy.copy(record)
+        else:
+            record = super().prepare(record)  # Merges args into msg so later mutation of e.g. session can't change it
+        record.log_route = self.route
+        return record
+
+    def enqueue(self, record):
+        self.dispatcher.enqueue(record)
+
+
+_dispatcher = AsyncLogDispatcher()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=lambda: _dispatcher.after_fork_in_child() if _dispatcher._thread else None)
+atexit.register(_dispatcher.stop)
+
+
+# --- Structured events ---
+
+class EventRateLimiter:
+    """Token bucket per event name: `burst` events at once, then `rate` per second. Counts what it suppresses."""
+
+    def __init__(self, rate=LOG_EVENT_RATE, burst=LOG_EVENT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.suppressed_total = 0
+
+    def allow(self, key):
+        """Returns (allowed, suppressed_since_last_allowed)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last, suppressed = self._buckets.get(key, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now, 0)
+                return True, suppressed
+            self._buckets[key] = (tokens, now, suppressed + 1)
+            self.suppressed_total += 1
+            return False, 0
+
+
+_event_limiter = EventRateLimiter()
+
+
+def log_event(target_logger, event, level=logging.INFO, sample=False, exc_info=None, **fields):
+    """
+    Logs `event` with structured fields instead of an interpolated message. Nothing is built when the level is
+    disabled or the event is sampled out; a field given as a zero-argument callable (e.g. `session=lambda:
+    dict(session)`) is only called once the event will actually be written. Pass snapshots (copies), not live
+    objects: with async logging the fields are encoded later, on the listener thread.
+    sample=True rate-limits the event per name (LOG_EVENT_RATE/LOG_EVENT_BURST); the next event that gets
+    through carries `suppressed` with the number skipped.
+    """
+    if not target_logger.isEnabledFor(level):
+        return
+    suppressed = 0
+    if sample:
+        allowed, suppressed = _event_limiter.allow(event)
+        if not allowed:
+            return
+    event_fields = {key: (value() if callable(value) else value) for key, value in fields.items()}
+    if suppressed:
+        event_fields['suppressed'] = suppressed
+    target_logger.log(level, event, exc_info=exc_info, extra={'event_fields': event_fields}, stacklevel=2)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, then the record's event fields."""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        entry.update(getattr(record, 'event_fields', {}))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class EventTextFormatter(logging.Formatter):
+    """Plain-text formatter that appends a record's event fields as key=value pairs."""
+
+    def formatMessage(self, record):
+        message = super().formatMessage(record)
+        fields = getattr(record, 'event_fields', None)
+        if fields:
+            message += ' ' + ' '.join(f"{key}={json.dumps(value, default=str, ensure_ascii=False)}" for key, value in fields.items())
+        return message
+
+
+class CompressedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler that gzips each rotated file (app.log.1.gz, app.log.2.gz, ...) and, after every
+    rollover, deletes the oldest ones once together they exceed retention_bytes.
+    """
+
+    def __init__(self, filename, maxBytes=LOG_MAX_BYTES, retention_bytes=LOG_RETENTION_BYTES,
+                 backupCount=LOG_MAX_BACKUPS, encoding='utf-8'):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding)
+        self.retention_bytes = retention_bytes
+
+    def rotation_filename(self, default_name):
+        return default_name + '.gz'
+
+    def rotate(self, source, dest):
+        with open(source, 'rb') as src, gzip.open(dest, 'wb') as out:
+            shutil.copyfileobj(src, out)
+        os.remove(source)
+
+    def doRollover(self):
+        super().doRollover()
+        kept = 0
+        for i in range(1, self.backupCount + 1):
+            backup = self.rotation_filename(f"{self.baseFilename}.{i}")
+            if not os.path.exists(backup):
+                continue
+            kept += os.path.getsize(backup)
+            if kept > self.retention_bytes:
+                os.remove(backup)
+
+
+def attach_handlers(target_logger, handlers):
+    """
+    Adds handlers to a logger. In async mode they are wrapped behind one BoundedQueueHandler and run on the
+    listener thread; otherwise they are attached directly.
+    """
+    if not LOG_ASYNC:
+        for handler in handlers:
+            target_logger.addHandler(handler)
+        return
+    target_logger.addHandler(BoundedQueueHandler(_dispatcher, _dispatcher.add_route(handlers)))
+    _dispatcher.start()
+
+
+def logging_stats():
+    """Queue depth, batch sizes and drop counters for the async pipeline."""
+    stats = _dispatcher.stats() if LOG_ASYNC else {'async': False}
+    stats['events_suppressed'] = _event_limiter.suppressed_total
+    return stats
+
+
+def setup_logging(log_level_str='INFO', log_file='app.log', log_format=LOG_FORMAT, max_bytes=LOG_MAX_BYTES,
+                  retention_bytes=LOG_RETENTION_BYTES):
     """
     Configures unified logging for the application.
-    All logs from all modules go to a single rotating app.log file (max 0.5MB, 1 backup).
-    Only app.log (latest) and app.log.1 (previous) will exist at any time.
-    Console logging is also enabled for development.
+    All logs from all modules go to a single rotating app.log file, one JSON event per line unless
+    LOG_FORMAT=text. It rotates at LOG_MAX_BYTES; rotated files are gzipped and the oldest are deleted once
+    they add up to more than LOG_RETENTION_BYTES.
+    Console logging (plain text) is also enabled for development.
+    File and console writes happen on the async listener thread unless LOG_ASYNC=0.
     """
-    import logging.handlers
     log_level = getattr(logging, log_level_str.upper(), logging.INFO)
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    log_format_text = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     date_format = '%Y-%m-%d %H:%M:%S'
 
     # Remove all existing handlers from root logger
     for handler in logging.root.handlers[:]:
         logging.root.removeHandler(handler)
 
-    # Rotating file handler: maxBytes=0.5MB, backupCount=1
-    file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=524288, backupCount=1, encoding='utf-8')
-    file_handler.setFormatter(logging.Formatter(log_format, datefmt=date_format))
+    file_handler = CompressedRotatingFileHandler(log_file, maxBytes=max_bytes, retention_bytes=retention_bytes)
+    if log_format == 'json':
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(EventTextFormatter(log_format_text, datefmt=date_format))
     file_handler.setLevel(log_level)
 
     # Console handler (for dev)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(logging.Formatter(log_format, datefmt=date_format))
+    console_handler.setFormatter(EventTextFormatter(log_format_text, datefmt=date_format))
     console_handler.setLevel(log_level)
 
-    logging.basicConfig(level=log_level, handlers=[file_handler, console_handler], force=True)
+    logging.basicConfig(level=log_level, handlers=[], force=True)
+    attach_handlers(logging.root, [file_handler, console_handler])
 
     # Ensure all loggers propagate to root
     logging.captureWarnings(True)
     logging.getLogger().propagate = True
     # Startup confirmation
-    logging.info(f"Unified logging initialized: log_file={os.path.abspath(log_file)}, maxBytes=524288, backupCount=1")
+    log_event(logging.getLogger(), "Unified logging initialized", log_file=os.path.abspath(log_file), format=log_format,
+              max_bytes=max_bytes, retention_bytes=retention_bytes, log_async=LOG_ASYNC)
 
     # Example: You can get a specific logger for your app module
     # logger = logging.getLogger('src.app') # Or just __name__ in the module using it
@@ -0,0 +1,332 @@
+import os
+import json
+import time
+import atexit
+import bisect
+import secrets
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: dead workers' files are simply never folded into the archive
+    fcntl = None
+
+from src.utils.db_pool import PooledCursor, PooledConnection
+
+logger = logging.getLogger(__name__)
+
+# --- Latency metrics, aggregated across worker processes ---
+# Each process keeps its histograms and counters in memory and every METRICS_FLUSH_INTERVAL seconds (at most)
+# writes a snapshot to METRICS_DIR/metrics-<pid>-<token>.json. /metrics merges the snapshots of every process
+# into Prometheus text format, so any worker can answer a scrape. A snapshot whose process has exited is folded
+# into _archive.json under a file lock, which keeps totals from dropping when workers are recycled.
+
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'metrics'))
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+METRICS_PREFIX = 'sf95_'
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_HELP = {
+    'request_duration_seconds': 'Time to handle a request, by endpoint, method and status.',
+    'request_db_seconds': 'Time a request spent in SQLite execute and fetch calls, by endpoint.',
+    'db_queries_total': 'SQLite execute and fetch calls made while handling requests, by endpoint.',
+    'pdf_fill_seconds': 'fill_sf95_pdf wall time, by backend (cache = served from the PDF cache).',
+    'pdf_fill_batch_seconds': 'fill_many wall time for a whole batch of claims, by backend.',
+    'pdfcpu_subprocess_seconds': 'Wall time of a pdfcpu form fill or multifill process alone.',
+    'session_seconds': 'Server-side session load and save time.',
+    'template_render_seconds': 'Jinja template render time, by template.',
+}
+
+ARCHIVE_FILENAME = '_archive.json'
+LOCK_FILENAME = '.lock'
+
+
+def _series_key(name, labels):
+    return (name, tuple(sorted((key, str(value)) for key, value in labels.items())))
+
+
+class MetricsRegistry:
+    """Histograms (LATENCY_BUCKETS, in seconds) and counters for this process, persisted for /metrics."""
+
+    def __init__(self, directory=METRICS_DIR, flush_interval=METRICS_FLUSH_INTERVAL, buckets=LATENCY_BUCKETS):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._token = secrets.token_hex(4)
+        self._histograms = {}  # (name, labels) -> [per-bucket counts (last is +Inf), sum, count]
+        self._counters = {}  # (name, labels) -> value
+        self._last_flush = time.monotonic()
+
+    def _check_pid(self):
+        # A forked worker starts empty; its parent's counts stay in the parent's snapshot
+        if self._pid != os.getpid():
+            self._reset()
+
+    @property
+    def snapshot_path(self):
+        return os.path.join(self.directory, f"metrics-{self._pid}-{self._token}.json")
+
+    def observe(self, name, seconds, **labels):
+        index = bisect.bisect_left(self.buckets, seconds)
+        key = _series_key(name, labels)
+        with self._lock:
+            self._check_pid()
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def inc(self, name, amount=1, **labels):
+        key = _series_key(name, labels)
+        with self._lock:
+            self._check_pid()
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            self._check_pid()
+            return {
+                'buckets': list(self.buckets),
+                'histograms': [{'name': name, 'labels': dict(labels), 'counts': list(series[0]), 'sum': series[1], 'count': series[2]}
+                               for (name, labels), series in self._histograms.items()],
+                'counters': [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in self._counters.items()],
+            }
+
+    def flush(self, force=False):
+        """Writes this process's snapshot if the flush interval has passed (or force). Never raises."""
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        if not self._histograms and not self._counters:
+            return  # Nothing recorded (e.g. a CLI command or a bare import): leave no snapshot behind
+        try:
+            _write_json(self.snapshot_path, self.snapshot())
+        except OSError as e:
+            logger.warning(f"Could not write metrics snapshot {self.snapshot_path}: {e}")
+
+    def collect(self):
+        """Merged snapshot of every process (this one flushed first), with exited processes folded into the archive."""
+        self.flush(force=True)
+        with _DirectoryLock(self.directory):
+            self._fold_exited_processes()
+            merged = _empty_snapshot(self.buckets)
+            for filename in sorted(os.listdir(self.directory)):
+                if filename == ARCHIVE_FILENAME or (filename.startswith('metrics-') and filename.endswith('.json')):
+                    _merge_into(merged, _read_json(os.path.join(self.directory, filename)))
+        return merged
+
+    def _fold_exited_processes(self):
+        archive_path = os.path.join(self.directory, ARCHIVE_FILENAME)
+        exited = [filename for filename in os.listdir(self.directory)
+                  if filename.startswith('metrics-') and filename.endswith('.json') and not _pid_alive(_pid_from_filename(filename))]
+        if not exited:
+            return
+        archive = _read_json(archive_path) or _empty_snapshot(self.buckets)
+        for filename in exited:
+            _merge_into(archive, _read_json(os.path.join(self.directory, filename)))
+        _write_json(archive_path, archive)
+        for filename in exited:
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except OSError:
+                pass
+        logger.info(f"Folded metrics of {len(exited)} exited process(es) into {ARCHIVE_FILENAME}.")
+
+
+class _DirectoryLock:
+    def __init__(self, directory):
+        self.directory = directory
+        self._fd = None
+
+    def __enter__(self):
+        os.makedirs(self.directory, exist_ok=True)
+        if fcntl is not None:
+            self._fd = os.open(os.path.join(self.directory, LOCK_FILENAME), os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+def _pid_from_filename(filename):
+    try:
+        return int(filename.split('-')[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def _pid_alive(pid):
+    if pid is None or pid == os.getpid():
+        return True
+    if fcntl is None:
+        return True  # No safe liveness check on Windows (os.kill would terminate the process)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _empty_snapshot(buckets):
+    return {'buckets': list(buckets), 'histograms': [], 'counters': []}
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Skipping unreadable metrics snapshot {path}: {e}")
+        return None
+
+
+def _merge_into(target, snapshot):
+    """Adds snapshot's series to target's. Snapshots taken with different buckets are skipped."""
+    if not snapshot:
+        return
+    if snapshot.get('buckets') != target['buckets']:
+        logger.warning("Skipping metrics snapshot recorded with different histogram buckets.")
+        return
+    histograms = {_series_key(item['name'], item['labels']): item for item in target['histograms']}
+    for item in snapshot.get('histograms', []):
+        existing = histograms.get(_series_key(item['name'], item['labels']))
+        if existing is None:
+            existing = {'name': item['name'], 'labels': dict(item['labels']), 'counts': [0] * len(item['counts']), 'sum': 0.0, 'count': 0}
+            histograms[_series_key(item['name'], item['labels'])] = existing
+            target['histograms'].append(existing)
+        existing['counts'] = [a + b for a, b in zip(existing['counts'], item['counts'])]
+        existing['sum'] += item['sum']
+        existing['count'] += item['count']
+    counters = {_series_key(item['name'], item['labels']): item for item in target['counters']}
+    for item in snapshot.get('counters', []):
+        existing = counters.get(_series_key(item['name'], item['labels']))
+        if existing is None:
+            existing = {'name': item['name'], 'labels': dict(item['labels']), 'value': 0}
+            counters[_series_key(item['name'], item['labels'])] = existing
+            target['counters'].append(existing)
+        existing['value'] += item['value']
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None):
+    items = sorted(labels.items()) + (extra or [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape_label_value(value)}"' for key, value in items) + '}'
+
+
+def _format_bound(bound):
+    return f"{bound:g}"
+
+
+def render_prometheus(snapshot, prefix=METRICS_PREFIX):
+    """Prometheus text exposition (version 0.0.4) of a merged snapshot."""
+    lines = []
+    buckets = snapshot['buckets']
+    by_name = {}
+    for item in snapshot['histograms']:
+        by_name.setdefault(('histogram', item['name']), []).append(item)
+    for item in snapshot['counters']:
+        by_name.setdefault(('counter', item['name']), []).append(item)
+    for (kind, name), items in sorted(by_name.items(), key=lambda entry: entry[0][1]):
+        metric = prefix + name
+        if name in METRIC_HELP:
+            lines.append(f"# HELP {metric} {METRIC_HELP[name]}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for item in sorted(items, key=lambda entry: sorted(entry['labels'].items())):
+            labels = item['labels']
+            if kind == 'counter':
+                lines.append(f"{metric}{_format_labels(labels)} {item['value']}")
+                continue
+            cumulative = 0
+            for bound, count in zip(list(buckets) + [None], item['counts']):
+                cumulative += count
+                le = '+Inf' if bound is None else _format_bound(bound)
+                lines.append(f"{metric}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {item['sum']:.6f}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {item['count']}")
+    return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+atexit.register(metrics.flush, True)
+
+
+# --- SQLite time per request ---
+# Pooled connections are created as TimedConnection, whose cursors add the wall time of every execute/fetch call
+# to a per-thread tally; the request hooks reset it before a request and read it afterwards.
+
+_db_tally = threading.local()
+
+
+def reset_db_timing():
+    _db_tally.seconds = 0.0
+    _db_tally.calls = 0
+
+
+def db_timing():
+    """(seconds, calls) spent in SQLite on this thread since the last reset_db_timing()."""
+    return getattr(_db_tally, 'seconds', 0.0), getattr(_db_tally, 'calls', 0)
+
+
+def _timed(method):
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _db_tally.seconds = getattr(_db_tally, 'seconds', 0.0) + time.perf_counter() - started
+            _db_tally.calls = getattr(_db_tally, 'calls', 0) + 1
+    wrapper.__name__ = method.__name__
+    return wrapper
+
+
+class TimedCursor(PooledCursor):
+    execute = _timed(PooledCursor.execute)
+    executemany = _timed(PooledCursor.executemany)
+    fetchone = _timed(sqlite3.Cursor.fetchone)
+    fetchmany = _timed(sqlite3.Cursor.fetchmany)
+    fetchall = _timed(sqlite3.Cursor.fetchall)
+
+
+class TimedConnection(PooledConnection):
+    """Pooled connection whose cursors, including the ones conn.execute() and conn.executemany() create, are TimedCursors."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
@@ -0,0 +1,89 @@
+import os
+import re
+import time
+import sqlite3
+import importlib.util
+
+# --- Versioned schema migrations ---
+# Each src/migrations/NNNN_description.py defines upgrade(conn). Applied versions are recorded in schema_version,
+# so a migration runs exactly once per database, from `flask --app src.app migrate-db`. Workers only read the version.
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+MIGRATION_FILENAME_RE = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+CREATE_SCHEMA_VERSION_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at REAL NOT NULL
+)
+"""
+
+
+def discover_migrations(migrations_dir=MIGRATIONS_DIR):
+    """[(version, name, path)] for every migration script, in version order."""
+    migrations = []
+    for filename in os.listdir(migrations_dir):
+        match = MIGRATION_FILENAME_RE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(migrations_dir, filename)))
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration version numbers in {migrations_dir}: {versions}")
+    return migrations
+
+
+def _load_migration(version, name, path):
+    # Module names can't start with a digit, so migrations are loaded by path rather than imported
+    spec = importlib.util.spec_from_file_location(f"src.migrations.m{version:04d}_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def latest_schema_version(migrations_dir=MIGRATIONS_DIR):
+    migrations = discover_migrations(migrations_dir)
+    return migrations[-1][0] if migrations else 0
+
+
+def current_schema_version(conn):
+    """Highest applied migration, or 0 for a database that has never been migrated."""
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0  # No schema_version table yet
+    return row[0] or 0
+
+
+def apply_migrations(conn, logger=None, target=None, migrations_dir=MIGRATIONS_DIR):
+    """
+    Applies every migration newer than the database's version (up to target), each in its own transaction.
+    Returns the list of (version, name) applied. A failing migration is rolled back and re-raised.
+    """
+    conn.execute(CREATE_SCHEMA_VERSION_TABLE_SQL)
+    conn.commit()
+    current = current_schema_version(conn)
+    applied = []
+    for version, name, path in discover_migrations(migrations_dir):
+        if version <= current or (target is not None and version > target):
+            continue
+        module = _load_migration(version, name, path)
+        if logger:
+            logger.info(f"Applying migration {version:04d}_{name}.")
+        started = time.time()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            module.upgrade(conn)
+            conn.execute("INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)", (version, name, time.time()))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            if logger:
+                logger.error(f"Migration {version:04d}_{name} failed; database left at version {current}.", exc_info=True)
+            raise
+        if logger:
+            logger.info(f"Applied migration {version:04d}_{name} in {time.time() - started:.2f}s.")
+        applied.append((version, name))
+        current = version
+    return applied
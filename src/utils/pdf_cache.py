@@ -0,0 +1,128 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Cached PDFs live next to the filled forms, in a hidden subdirectory so they never collide with claim filenames
+PDF_CACHE_DIR = os.environ.get('PDF_CACHE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'filled_forms', '.cache'))
+PDF_CACHE_MAX_BYTES = int(os.environ.get('PDF_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+PDF_CACHE_ENABLED = os.environ.get('PDF_CACHE_ENABLED', '1').lower() not in ('0', 'false', 'no')
+
+
+class PdfCache:
+    """
+    Content-addressed store of filled PDFs. The key is a hash of the mapped field payload plus the
+    template's contents, so an identical claim never has to be rendered twice. Entries are evicted
+    least-recently-used first once the directory grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._template_digests = {}
+
+    def template_digest(self, template_path):
+        """sha256 of the template file, recomputed only when its mtime or size changes."""
+        stat = os.stat(template_path)
+        signature = (stat.st_mtime, stat.st_size)
+        cached = self._template_digests.get(template_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        with open(template_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self._template_digests[template_path] = (signature, digest)
+        return digest
+
+    def key_for(self, form_data, template_path, salt=''):
+        payload = json.dumps(dict(form_data), sort_keys=True, default=str)
+        hasher = hashlib.sha256()
+        hasher.update(self.template_digest(template_path).encode('utf-8'))
+        hasher.update(salt.encode('utf-8'))
+        hasher.update(payload.encode('utf-8'))
+        return hasher.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def fetch(self, key, output_path):
+        """Copies the cached PDF for key to output_path. Returns True on a hit, False on a miss."""
+        entry_path = self._entry_path(key)
+        try:
+            tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(entry_path, tmp_path)
+            os.replace(tmp_path, output_path)
+            os.utime(entry_path)  # Mark as recently used for LRU eviction
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        logger.info(f"PDF cache hit {key[:12]} -> {output_path}")
+        return True
+
+    def store(self, key, rendered_path):
+        """Adds a freshly rendered PDF to the cache, then evicts old entries if over budget."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entry_path = self._entry_path(key)
+            tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(rendered_path, tmp_path)
+            os.replace(tmp_path, entry_path)
+            self.evict()
+        except OSError as e:
+            logger.error(f"PDF cache: could not store {rendered_path}: {e}")
+
+    def _entries(self):
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith('.pdf'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def evict(self):
+        """Deletes least-recently-used entries until the cache fits in max_bytes. Returns how many were removed."""
+        entries = sorted(self._entries())
+        total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            removed += 1
+        if removed:
+            logger.info(f"PDF cache evicted {removed} entr{'y' if removed == 1 else 'ies'}; {total_bytes} bytes remain.")
+        return removed
+
+    def stats(self):
+        entries = self._entries()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+        }
+
+
+pdf_cache = PdfCache(PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES)
@@ -0,0 +1,261 @@
+import io
+import os
+import re
+import logging
+import threading
+from functools import lru_cache
+
+from pdfrw import PdfReader, PdfWriter, PdfName, PdfString, PdfObject, PdfDict, PdfArray
+
+logger = logging.getLogger(__name__)
+
+# Parsed templates, keyed by absolute path. Each entry is reparsed only when the file on disk changes.
+_TEMPLATE_CACHE = {}
+_TEMPLATE_CACHE_LOCK = threading.Lock()
+
+# --- Text field appearances ---
+# Setting /V alone leaves each widget's existing (blank) /AP in place, and viewers, printers and flatteners that
+# draw the stored appearance would show an empty form. Every filled text widget therefore gets its own /AP /N
+# stream, laid out the way Acrobat does for the template's default appearance: Helvetica, auto size (DA size 0),
+# 2pt padding, multiline fields word-wrapped and shrunk until they fit.
+
+# Helvetica advance widths (1/1000 em) for character codes 32-126, from the standard Type 1 metrics
+_HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+_DEFAULT_WIDTH = 556
+# Characters outside ASCII that the template's /Helv encoding (its /DR /Encoding /Differences) can show
+_HELV_EXTRA_CODES = {'\u2022': 128, '\u2026': 131, '\u2014': 132, '\u2013': 133, '\u201c': 141, '\u201d': 142,
+                     '\u2018': 143, '\u2019': 144, '\u2122': 146, '\u20ac': 160}
+# Part of every python-backend PDF cache key; bump it when the engine's output changes so cached PDFs are re-rendered
+ENGINE_VERSION = 2
+TEXT_PADDING = 2
+MAX_AUTO_FONT_SIZE = 12
+MIN_AUTO_FONT_SIZE = 4
+LINE_HEIGHT = 1.15  # Leading as a multiple of the font size
+MULTILINE_FLAG = 1 << 12
+
+
+def _encode_helv(text):
+    """text as /Helv character codes (a latin-1 str); characters the font can't show become '?'."""
+    codes = []
+    for char in text:
+        code = ord(char)
+        if 32 <= code <= 126 or 161 <= code <= 255:
+            codes.append(char)
+        elif char in _HELV_EXTRA_CODES:
+            codes.append(chr(_HELV_EXTRA_CODES[char]))
+        else:
+            codes.append('?')
+    return ''.join(codes)
+
+
+def _text_width(encoded, font_size):
+    return sum(_HELVETICA_WIDTHS[ord(c) - 32] if 32 <= ord(c) <= 126 else _DEFAULT_WIDTH for c in encoded) * font_size / 1000
+
+
+def _wrap(encoded_paragraphs, width, font_size):
+    """Lines of the paragraphs word-wrapped to width; words longer than a line are broken."""
+    lines = []
+    for paragraph in encoded_paragraphs:
+        line = ''
+        for word in paragraph.split(' '):
+            candidate = f"{line} {word}" if line else word
+            if _text_width(candidate, font_size) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            line = word
+            while _text_width(line, font_size) > width and len(line) > 1:
+                cut = len(line) - 1
+                while cut > 1 and _text_width(line[:cut], font_size) > width:
+                    cut -= 1
+                lines.append(line[:cut])
+                line = line[cut:]
+        lines.append(line)
+    return lines
+
+
+def _pdf_literal(encoded):
+    return '(' + re.sub(r'([\\()])', r'\\\1', encoded) + ')'
+
+
+@lru_cache(maxsize=1024)
+def text_appearance_stream(value, width, height, multiline, da_font_size=0):
+    """
+    Content stream drawing value in a width x height text widget (Helvetica, DA size or auto size). Memoized: the
+    box 8/10 boilerplate and other defaults are laid out once per process, not once per fill.
+    """
+    inner_width = max(width - 2 * TEXT_PADDING, 1)
+    inner_height = max(height - 2 * TEXT_PADDING, 1)
+    if multiline:
+        paragraphs = [_encode_helv(part) for part in str(value).replace('\r\n', '\n').replace('\r', '\n').split('\n')]
+        font_size = da_font_size or MAX_AUTO_FONT_SIZE
+        lines = _wrap(paragraphs, inner_width, font_size)
+        while not da_font_size and font_size > MIN_AUTO_FONT_SIZE and len(lines) * font_size * LINE_HEIGHT > inner_height:
+            font_size = max(font_size - 0.5, MIN_AUTO_FONT_SIZE)
+            lines = _wrap(paragraphs, inner_width, font_size)
+        baseline = height - TEXT_PADDING - font_size * 0.9
+    else:
+        lines = [_encode_helv(' '.join(str(value).split('\n')))]
+        font_size = da_font_size
+        if not font_size:
+            font_size = min(MAX_AUTO_FONT_SIZE, inner_height / LINE_HEIGHT)
+            text_width = _text_width(lines[0], font_size)
+            if text_width > inner_width:
+                font_size = max(font_size * inner_width / text_width, MIN_AUTO_FONT_SIZE)
+        baseline = (height - font_size) / 2 + font_size * 0.22
+    leading = font_size * LINE_HEIGHT
+    commands = [f"/Tx BMC q {TEXT_PADDING - 1} {TEXT_PADDING - 1} {width - 2 * (TEXT_PADDING - 1):.2f} {height - 2 * (TEXT_PADDING - 1):.2f} re W n",
+                f"BT /Helv {font_size:.2f} Tf 0 g {TEXT_PADDING} {baseline:.2f} Td {leading:.2f} TL"]
+    for i, line in enumerate(lines):
+        commands.append(f"{_pdf_literal(line)} {'Tj' if i == 0 else chr(39)}")
+    commands.append("ET Q EMC")
+    return '\n'.join(commands)
+
+
+class FormField:
+    """One terminal AcroForm field plus the widget annotations that display it."""
+
+    def __init__(self, name, node, widgets, helv_font=None):
+        self.name = name
+        self.node = node
+        self.widgets = widgets
+        self.field_type = node.inheritable.FT
+        self.multiline = bool(int(node.inheritable.Ff or 0) & MULTILINE_FLAG)
+        da_size = re.search(r'/Helv\s+([\d.]+)\s+Tf', (node.inheritable.DA or '').strip('()'))
+        self.da_font_size = float(da_size.group(1)) if da_size else 0
+        self.helv_font = helv_font
+        # Remember the template's own values so every fill starts from a clean form
+        self._original_value = node.V
+        self._original_states = [widget.AS for widget in widgets]
+        self._original_appearances = [widget.AP for widget in widgets]
+
+    @property
+    def on_state(self):
+        """Name of the 'checked' appearance state for checkbox widgets (e.g. /On, /Yes_2)."""
+        for widget in self.widgets:
+            normal_appearances = widget.AP.N if widget.AP else None
+            if normal_appearances is not None and hasattr(normal_appearances, 'keys'):
+                for state in normal_appearances.keys():
+                    if state != '/Off':
+                        return state
+        return '/On'
+
+    def set_text(self, value):
+        text = '' if value is None else str(value)
+        self.node.V = PdfString.from_unicode(text)
+        if not text:
+            return  # The template's blank appearance already shows an empty field
+        for widget in self.widgets:
+            llx, lly, urx, ury = (float(v) for v in widget.Rect)
+            width, height = abs(urx - llx), abs(ury - lly)
+            appearance = PdfDict(
+                Type=PdfName('XObject'), Subtype=PdfName('Form'), BBox=PdfArray([0, 0, round(width, 2), round(height, 2)]),
+                Resources=PdfDict(Font=PdfDict(Helv=self.helv_font)) if self.helv_font is not None else None,
+            )
+            appearance.stream = text_appearance_stream(text, width, height, self.multiline, self.da_font_size)
+            widget.AP = PdfDict(N=appearance)
+
+    def set_checked(self, checked):
+        state = PdfName(self.on_state[1:]) if checked else PdfName('Off')
+        self.node.V = state
+        for widget in self.widgets:
+            widget.AS = state
+
+    def reset(self):
+        self.node.V = self._original_value
+        for widget, state, appearance in zip(self.widgets, self._original_states, self._original_appearances):
+            widget.AS = state
+            widget.AP = appearance
+
+
+class PdfFormTemplate:
+    """An AcroForm PDF parsed once and kept in memory so it can be filled repeatedly without reparsing."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.mtime = os.path.getmtime(self.path)
+        self._lock = threading.Lock()
+        self._reader = PdfReader(self.path)
+        # pdfrw resolves objects lazily; load everything now so fills never touch the parser again
+        self._reader.read_all()
+        self.fields = {}
+        acroform = self._reader.Root.AcroForm
+        if acroform is None:
+            raise ValueError(f"PDF template has no AcroForm: {self.path}")
+        self._helv_font = acroform.DR.Font.Helv if acroform.DR and acroform.DR.Font else None
+        for field_node in acroform.Fields or []:
+            self._index_field(field_node, None)
+        # Viewers that lay out fields themselves still do; the rest draw the appearances render() generates
+        acroform.NeedAppearances = PdfObject('true')
+        logger.info(f"Parsed PDF template {self.path}: {len(self.fields)} fields indexed.")
+
+    def _index_field(self, node, parent_name):
+        partial_name = node.T.to_unicode() if node.T is not None else None
+        if parent_name and partial_name:
+            full_name = f"{parent_name}.{partial_name}"
+        else:
+            full_name = partial_name or parent_name
+        kids = node.Kids or []
+        if any(kid.T is not None for kid in kids):
+            for kid in kids:
+                self._index_field(kid, full_name)
+            return
+        # Terminal field: either a merged field/widget, or a field whose kids are bare widgets
+        self.fields[full_name] = FormField(full_name, node, list(kids) if kids else [node], self._helv_font)
+
+    def render(self, pdfcpu_data):
+        """Apply a pdfcpu-style form payload and return the filled PDF as bytes."""
+        forms = pdfcpu_data.get('forms') or [{}]
+        with self._lock:
+            touched_fields = []
+            try:
+                for field_kind, entries in forms[0].items():
+                    for entry in entries:
+                        field = self.fields.get(entry.get('name'))
+                        if field is None:
+                            logger.warning(f"PDF engine: field '{entry.get('name')}' not found in template {self.path}; skipping.")
+                            continue
+                        touched_fields.append(field)
+                        if field_kind == 'checkbox':
+                            field.set_checked(bool(entry.get('value')))
+                        elif field_kind == 'textfield':
+                            field.set_text(entry.get('value'))
+                        else:
+                            logger.warning(f"PDF engine: unsupported field type '{field_kind}' for '{field.name}'; skipping.")
+                buffer = io.BytesIO()
+                PdfWriter(buffer, trailer=self._reader).write()
+                return buffer.getvalue()
+            finally:
+                for field in touched_fields:
+                    field.reset()
+
+
+def get_template(template_path):
+    """Returns the cached parsed template for template_path, reparsing it only if the file changed."""
+    abs_path = os.path.abspath(template_path)
+    mtime = os.path.getmtime(abs_path)
+    with _TEMPLATE_CACHE_LOCK:
+        template = _TEMPLATE_CACHE.get(abs_path)
+        if template is None or template.mtime != mtime:
+            template = PdfFormTemplate(abs_path)
+            _TEMPLATE_CACHE[abs_path] = template
+        return template
+
+
+def fill_pdf_template(template_path, pdfcpu_data, output_pdf_path):
+    """Fills template_path with a pdfcpu-style payload and writes the result to output_pdf_path."""
+    pdf_bytes = get_template(template_path).render(pdfcpu_data)
+    # Write next to the destination and rename so readers never see a half-written PDF
+    tmp_path = f"{output_pdf_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(pdf_bytes)
+    os.replace(tmp_path, output_pdf_path)
+    return output_pdf_path
@@ -1,27 +1,35 @@
 import os
+import re
 import json
+import time
 import subprocess
+import shutil
+import hashlib
 import tempfile
+from collections import namedtuple
+from functools import lru_cache
 from datetime import datetime
 import logging
 import traceback
 
+from src.utils.pdf_engine import fill_pdf_template, ENGINE_VERSION
+from src.utils.pdf_cache import pdf_cache, PDF_CACHE_ENABLED
+from src.utils.logging_config import log_event
+from src.utils.metrics import metrics
+from src.utils.field_mapping import compile_payload_spec, run_payload_pipeline
+
 logger = logging.getLogger(__name__)
 
+# Which filler fill_sf95_pdf uses by default: 'python' (in-process engine) or 'pdfcpu' (external binary)
+PDF_FILL_BACKENDS = ('python', 'pdfcpu')
+PDF_FILL_BACKEND = os.environ.get('PDF_FILL_BACKEND', 'python').lower()
+
+# Claims per pdfcpu multifill invocation in fill_many; a failed chunk is split to find the claims that broke it
+PDF_MULTIFILL_CHUNK_SIZE = int(os.environ.get('PDF_MULTIFILL_CHUNK_SIZE', 200))
+
 # Path to the new PDF field map
 PDF_FIELD_MAP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'pdf_field_map.json')
 
-# Load the PDF field map from JSON
-try:
-    with open(PDF_FIELD_MAP_PATH, 'r') as f:
-        PDF_FIELD_MAP = json.load(f)
-except FileNotFoundError:
-    logger.error(f"Critical: PDF field map file not found at {PDF_FIELD_MAP_PATH}")
-    PDF_FIELD_MAP = {} # Fallback to empty map to prevent crash, but filling will fail
-except json.JSONDecodeError:
-    logger.error(f"Critical: Error decoding JSON from PDF field map file at {PDF_FIELD_MAP_PATH}")
-    PDF_FIELD_MAP = {} # Fallback
-
 # Default values for fields that are pre-filled or have fallbacks
 # These keys should match the application-side keys used in PDF_FIELD_MAP
 DEFAULT_VALUES = {
@@ -41,93 +49,123 @@ DEFAULT_VALUES = {
     # field13a_signature, field_pdf_13b_phone, field14_date_signed are user-input
 }
 
-def fill_sf95_pdf(form_data, pdf_template_path_param, output_pdf_full_path_param):
+# The field map is read on first use rather than at import (see load_fill_config)
+FillConfig = namedtuple('FillConfig', ['field_map', 'digest', 'payload_pipeline'])
+
+
+@lru_cache(maxsize=None)
+def load_fill_config():
+    """
+    Reads PDF_FIELD_MAP_PATH once per process and returns FillConfig(field_map, digest, payload_pipeline). digest
+    covers the field map and DEFAULT_VALUES, which both change the rendered output, so it is part of every cache
+    key; payload_pipeline is the PDF data -> pdfcpu payload mapping compiled from them (see src/utils/field_mapping.py).
+    """
+    try:
+        with open(PDF_FIELD_MAP_PATH, 'r') as f:
+            field_map = json.load(f)
+    except FileNotFoundError:
+        logger.error(f"Critical: PDF field map file not found at {PDF_FIELD_MAP_PATH}")
+        field_map = {} # Fallback to empty map to prevent crash, but filling will fail
+    except json.JSONDecodeError:
+        logger.error(f"Critical: Error decoding JSON from PDF field map file at {PDF_FIELD_MAP_PATH}")
+        field_map = {} # Fallback
+    digest = hashlib.sha256(json.dumps([field_map, DEFAULT_VALUES], sort_keys=True).encode('utf-8')).hexdigest()
+    return FillConfig(field_map, digest, compile_payload_spec(field_map, DEFAULT_VALUES))
+
+
+def __getattr__(name):
+    # PDF_FIELD_MAP, FILL_CONFIG_DIGEST and PAYLOAD_PIPELINE stay importable, loaded on first access
+    if name == 'PDF_FIELD_MAP':
+        return load_fill_config().field_map
+    if name == 'FILL_CONFIG_DIGEST':
+        return load_fill_config().digest
+    if name == 'PAYLOAD_PIPELINE':
+        return load_fill_config().payload_pipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def build_pdfcpu_payload(form_data):
+    """
+    Builds the pdfcpu-style form payload ({"forms": [{"textfield": [...], "checkbox": [...]}]})
+    from mapped form data. Both fill backends consume this same payload.
+    """
+    return run_payload_pipeline(load_fill_config().payload_pipeline, form_data)
+
+def fill_sf95_pdf(form_data, pdf_template_path_param, output_pdf_full_path_param, backend=None, use_cache=None):
+    """
+    Fills the SF-95 template with form_data and writes it to output_pdf_full_path_param.
+    backend selects 'python' (in-process, default) or 'pdfcpu' (external process); defaults to PDF_FILL_BACKEND.
+    An identical payload that was rendered before is copied from the PDF cache instead of re-rendered.
+    Returns the resolved output path, or None if filling failed.
+    """
     logger.info(f"-------------------- Entering fill_sf95_pdf --------------------")
     logger.info(f"PDF Template Path: {pdf_template_path_param}")
     logger.info(f"Output PDF Path: {output_pdf_full_path_param}")
-    logger.debug(f'Raw form_data received by fill_sf95_pdf: {form_data}')
-
-    # Initialize pdfcpu_data to match the structure from 'pdfcpu form export'
-    pdfcpu_data = {
-        "forms": [
-            {
-                # We will populate field types like "textfield", "checkbox" here
-            }
-        ]
-    }
-    logger.debug(f'Initial pdfcpu_data structure: {json.dumps(pdfcpu_data, indent=2)}')
+    log_event(logger, 'Raw form_data received by fill_sf95_pdf', level=logging.DEBUG, form_data=lambda: dict(form_data))
 
-    logger.info("Starting general field processing loop based on PDF_FIELD_MAP.")
-    form_fields_dict = pdfcpu_data["forms"][0] # Get a reference to the dictionary holding field type lists
+    backend = (backend or PDF_FILL_BACKEND).lower()
+    if backend not in PDF_FILL_BACKENDS:
+        logger.warning(f"Unknown PDF fill backend '{backend}'. Using 'python'.")
+        backend = 'python'
 
-    for app_field_key, pdf_field_name_from_map in PDF_FIELD_MAP.items():
-        # Get value from form_data first (data submitted by user)
-        submitted_value = form_data.get(app_field_key)
+    pdfcpu_data = build_pdfcpu_payload(form_data)
+    log_event(logger, 'Final pdfcpu_data before filling', sample=True, pdfcpu_data=pdfcpu_data)
 
-        # If submitted_value is None (key not in form) or an empty string, try to use default
-        if submitted_value is None or str(submitted_value).strip() == '':
-            field_value = DEFAULT_VALUES.get(app_field_key)
-        else:
-            field_value = submitted_value
-
-        if field_value is not None: # Only add if there's a value (from form or default)
-            # Format phone number for PDF if this is the phone field
-            if app_field_key == 'field_pdf_13b_phone':
-                from src.utils.helpers import format_phone
-                final_json_value = format_phone(field_value)
-            else:
-                final_json_value = field_value # Value that will actually be put into the JSON
-
-            # Monetary field formatting for section 12
-            monetary_fields = [
-                'field12a_property_damage',
-                'field12b_personal_injury',
-                'field12c_wrongful_death',
-                'field12d_total_claim_amount'
-            ]
-            if app_field_key in monetary_fields:
-                try:
-                    # Convert to float first to handle potential string inputs and ensure numeric format
-                    numeric_value = float(field_value)
-                    final_json_value = f"${numeric_value:,.2f}" # Format as $xxx,xxx.xx
-                except ValueError:
-                    logger.warning(f"Could not convert monetary field '{app_field_key}' value '{field_value}' to float. Using original value: {final_json_value}")
-                    # If conversion fails, final_json_value remains the original field_value
-
-            # Determine pdfcpu_field_type based on the app_field_key
-            if app_field_key in ['field3_checkbox_civilian', 'field3_checkbox_military']:
-                pdfcpu_field_type = 'checkbox'
-                # Ensure the final_json_value is a Python boolean for checkboxes
-                if isinstance(field_value, str):
-                    if field_value.lower() == 'true':
-                        final_json_value = True
-                    elif field_value.lower() == 'false':
-                        final_json_value = False
-                    else:
-                        logger.warning(f"Checkbox '{app_field_key}' received ambiguous string '{field_value}'. Interpreting as False.")
-                        final_json_value = False
-                elif not isinstance(field_value, bool):
-                    # If it's not a string and not a bool (e.g., int 1), convert to bool
-                    final_json_value = bool(field_value)
-                # If it's already a bool, final_json_value is already correct (as field_value)
-            else:
-                pdfcpu_field_type = 'textfield' 
-
-            # Log processed value (original field_value for context, final_json_value for what's used)
-            logger.info(f"Processing '{app_field_key}': PDF Target='{pdf_field_name_from_map}', Original Value='{field_value}', JSON Value='{final_json_value}'")
-
-            if pdfcpu_field_type not in form_fields_dict:
-                form_fields_dict[pdfcpu_field_type] = []
-            form_fields_dict[pdfcpu_field_type].append({
-                "name": pdf_field_name_from_map,
-                "value": final_json_value # Use the explicitly typed boolean for checkboxes
-            })
-            logger.debug(f"Added to pdfcpu_data: {{'name': '{pdf_field_name_from_map}', 'value': {final_json_value}, 'type': '{pdfcpu_field_type}'}}")
-        else:
-            logger.debug(f"Skipping '{app_field_key}': No value in form_data and no default_value specified in DEFAULT_VALUES.")
+    # Resolve paths to be absolute and normalized
+    resolved_output_pdf_path = os.path.abspath(output_pdf_full_path_param)
+    resolved_template_path = os.path.abspath(pdf_template_path_param)
+    logger.info(f"Resolved PDF Template Path: {resolved_template_path}")
+    logger.info(f"Resolved Output PDF Path: {resolved_output_pdf_path}")
 
-    logger.info(f"Final pdfcpu_data before conversion to JSON:\n{json.dumps(pdfcpu_data, indent=2)}")
+    use_cache = PDF_CACHE_ENABLED if use_cache is None else use_cache
+    fill_started = time.perf_counter()
+    served_by = backend
+    try:
+        # Ensure output directory for the resolved path exists
+        os.makedirs(os.path.dirname(resolved_output_pdf_path), exist_ok=True)
+        cache_key = None
+        if use_cache:
+            try:
+                cache_key = pdf_cache.key_for(form_data, resolved_template_path, _cache_salt(backend))
+                if pdf_cache.fetch(cache_key, resolved_output_pdf_path):
+                    served_by = 'cache'
+                    return resolved_output_pdf_path
+            except OSError as e:
+                logger.warning(f"PDF cache lookup failed, rendering instead: {e}")
+                cache_key = None
+        result = _fill_with_backend(backend, pdfcpu_data, resolved_template_path, resolved_output_pdf_path)
+        if result and cache_key:
+            pdf_cache.store(cache_key, result)
+        return result
+    finally:
+        metrics.observe('pdf_fill_seconds', time.perf_counter() - fill_started, backend=served_by)
+        logger.info("-"*20 + " Exiting fill_sf95_pdf " + "-"*20 + "\n")
 
+def _cache_salt(backend):
+    """PDF cache salt: the field mapping config plus the backend, so each engine's output is cached separately."""
+    if backend == 'python':
+        backend = f"python{ENGINE_VERSION}"
+    return f"{backend}:{load_fill_config().digest}"
+
+def _fill_with_backend(backend, pdfcpu_data, resolved_template_path, resolved_output_pdf_path):
+    if backend == 'python':
+        try:
+            return _fill_with_python(pdfcpu_data, resolved_template_path, resolved_output_pdf_path)
+        except Exception as e:
+            logger.error(f"In-process PDF fill failed: {e}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            if not shutil.which('pdfcpu'):
+                return None
+            logger.warning("Falling back to the pdfcpu backend.")
+    return _fill_with_pdfcpu(pdfcpu_data, resolved_template_path, resolved_output_pdf_path)
+
+def _fill_with_python(pdfcpu_data, resolved_template_path, resolved_output_pdf_path):
+    """Fills the PDF in-process from the parsed, cached template. No subprocess or temp JSON file."""
+    fill_pdf_template(resolved_template_path, pdfcpu_data, resolved_output_pdf_path)
+    logger.info(f"PDF filled successfully (python backend): {resolved_output_pdf_path}")
+    return resolved_output_pdf_path
+
+def _fill_with_pdfcpu(pdfcpu_data, resolved_template_path, resolved_output_pdf_path):
+    """Fills the PDF by running 'pdfcpu form fill' on a temporary JSON file."""
     # Convert the dictionary to a JSON string
     try:
         pdfcpu_data_json = json.dumps(pdfcpu_data) # No indent for simpler XFA JSON
@@ -146,16 +184,7 @@ def fill_sf95_pdf(form_data, pdf_template_path_param, output_pdf_full_path_param
             temp_json_file_path = tmp_json_file.name
         logger.info(f"Temporary JSON file created at: {temp_json_file_path}")
 
-        # Resolve paths to be absolute and normalized
-        resolved_output_pdf_path = os.path.abspath(output_pdf_full_path_param)
-        resolved_template_path = os.path.abspath(pdf_template_path_param)
-
-        logger.info(f"Resolved PDF Template Path: {resolved_template_path}")
-        logger.info(f"Resolved Output PDF Path: {resolved_output_pdf_path}")
-
-        # Ensure output directory for the resolved path exists
         output_dir = os.path.dirname(resolved_output_pdf_path)
-        os.makedirs(output_dir, exist_ok=True)
 
         # Additional diagnostics before calling pdfcpu
         logger.info(f"Absolute path of temp JSON file: {os.path.abspath(temp_json_file_path)}")
@@ -173,9 +202,10 @@ def fill_sf95_pdf(form_data, pdf_template_path_param, output_pdf_full_path_param
         ]
         logger.info(f"Executing pdfcpu command: {' '.join(pdfcpu_command)}")
 
-        process_result = subprocess.run(pdfcpu_command, capture_output=True, text=True, check=False)
+        with metrics.timer('pdfcpu_subprocess_seconds'):
+            process_result = subprocess.run(pdfcpu_command, capture_output=True, text=True, check=False)
         if process_result.returncode == 0:
-            logger.info(f"PDF filled successfully: {resolved_output_pdf_path}")
+            logger.info(f"PDF filled successfully (pdfcpu backend): {resolved_output_pdf_path}")
             return resolved_output_pdf_path
         else:
             logger.error(f"Error filling PDF with pdfcpu. Return code: {process_result.returncode}")
@@ -193,7 +223,158 @@ def fill_sf95_pdf(form_data, pdf_template_path_param, output_pdf_full_path_param
                 logger.info(f"Temporary JSON file {temp_json_file_path} removed.")
             except OSError as e_remove:
                 logger.error(f"Error removing temporary file {temp_json_file_path}: {e_remove.strerror}")
-        logger.info("-"*20 + " Exiting fill_sf95_pdf " + "-"*20 + "\n")
+
+
+# --- Batch filling ---
+# fill_many renders many claims per call: the python backend fills them one after another from the parsed template,
+# the pdfcpu backend hands pdfcpu one combined multi-form payload per chunk ('form multifill'), so a chunk costs one
+# process instead of one per claim. Each claim gets its own result, so one bad record never fails the others.
+
+BatchFillResult = namedtuple('BatchFillResult', ['filename', 'path', 'error'])
+
+MULTIFILL_OUTPUT_RE = re.compile(r'_(\d+)\.pdf$')
+
+
+def fill_many(claims, template_path, out_dir, backend=None, chunk_size=None, use_cache=None):
+    """
+    Fills the SF-95 template once per (output filename, pdf_data) pair in claims, writing each PDF into out_dir.
+    Returns a BatchFillResult(filename, path, error) per claim, in order: path is the written PDF (None on
+    failure) and error says why that claim failed. Cached payloads are copied from the PDF cache as in fill_sf95_pdf.
+    """
+    backend = (backend or PDF_FILL_BACKEND).lower()
+    if backend not in PDF_FILL_BACKENDS:
+        logger.warning(f"Unknown PDF fill backend '{backend}'. Using 'python'.")
+        backend = 'python'
+    chunk_size = max(1, chunk_size or PDF_MULTIFILL_CHUNK_SIZE)
+    use_cache = PDF_CACHE_ENABLED if use_cache is None else use_cache
+    resolved_template_path = os.path.abspath(template_path)
+    resolved_out_dir = os.path.abspath(out_dir)
+    os.makedirs(resolved_out_dir, exist_ok=True)
+
+    claims = list(claims)
+    results = [None] * len(claims)
+    cache_keys = {}
+    pending = []  # (index, payload, output path) still to render
+    fill_started = time.perf_counter()
+    for index, (filename, pdf_data) in enumerate(claims):
+        output_path = os.path.join(resolved_out_dir, filename)
+        try:
+            payload = build_pdfcpu_payload(pdf_data)
+        except Exception as e:
+            results[index] = BatchFillResult(filename, None, f"Could not build the field payload: {e}")
+            continue
+        if use_cache:
+            try:
+                cache_keys[index] = pdf_cache.key_for(pdf_data, resolved_template_path, _cache_salt(backend))
+                if pdf_cache.fetch(cache_keys[index], output_path):
+                    results[index] = BatchFillResult(filename, output_path, None)
+                    continue
+            except OSError as e:
+                logger.warning(f"PDF cache lookup failed for {filename}, rendering instead: {e}")
+                cache_keys.pop(index, None)
+        pending.append((index, payload, output_path))
+
+    if backend == 'python':
+        errors = _fill_many_with_python(pending, resolved_template_path)
+        if errors and shutil.which('pdfcpu'):
+            logger.warning(f"Retrying {len(errors)} claim(s) with the pdfcpu backend.")
+            retry = [entry for entry in pending if entry[0] in errors]
+            errors = _fill_many_with_pdfcpu(retry, resolved_template_path, chunk_size)
+    else:
+        errors = _fill_many_with_pdfcpu(pending, resolved_template_path, chunk_size)
+
+    for index, payload, output_path in pending:
+        filename = claims[index][0]
+        if index in errors:
+            results[index] = BatchFillResult(filename, None, errors[index])
+            logger.error(f"Batch fill failed for {filename}: {errors[index]}")
+            continue
+        results[index] = BatchFillResult(filename, output_path, None)
+        if index in cache_keys:
+            pdf_cache.store(cache_keys[index], output_path)
+
+    elapsed = time.perf_counter() - fill_started
+    metrics.observe('pdf_fill_batch_seconds', elapsed, backend=backend)
+    failed = sum(1 for result in results if result.error)
+    logger.info(f"fill_many: {len(claims)} claim(s), {len(pending)} rendered with {backend}, {failed} failed, in {elapsed:.2f}s")
+    return results
+
+def _fill_many_with_python(entries, resolved_template_path):
+    """Fills each entry in-process. Returns {index: error} for the entries that failed."""
+    errors = {}
+    for index, payload, output_path in entries:
+        try:
+            fill_pdf_template(resolved_template_path, payload, output_path)
+        except Exception as e:
+            logger.error(f"In-process PDF fill failed for {output_path}: {e}")
+            errors[index] = f"In-process PDF fill failed: {e}"
+    return errors
+
+def _fill_many_with_pdfcpu(entries, resolved_template_path, chunk_size):
+    """Fills the entries chunk by chunk with 'pdfcpu form multifill'. Returns {index: error} for the entries that failed."""
+    errors = {}
+    if entries and not shutil.which('pdfcpu'):
+        return {index: "pdfcpu is not installed" for index, _, _ in entries}
+    for start in range(0, len(entries), chunk_size):
+        errors.update(_multifill_chunk(entries[start:start + chunk_size], resolved_template_path))
+    return errors
+
+def _multifill_chunk(entries, resolved_template_path):
+    """
+    Runs pdfcpu once for the whole chunk and moves each output into place. If pdfcpu fails the chunk is split in
+    half and each half retried, down to single claims, so the error lands on the claims that caused it.
+    """
+    if not entries:
+        return {}
+    error = _run_multifill(entries, resolved_template_path)
+    if error is None:
+        return {}
+    if len(entries) == 1:
+        return {entries[0][0]: error}
+    logger.warning(f"pdfcpu multifill failed for a chunk of {len(entries)} claims, splitting it: {error}")
+    middle = len(entries) // 2
+    errors = _multifill_chunk(entries[:middle], resolved_template_path)
+    errors.update(_multifill_chunk(entries[middle:], resolved_template_path))
+    return errors
+
+def _run_multifill(entries, resolved_template_path):
+    """One 'pdfcpu form multifill' run for entries. Returns None once every output is in place, else the error."""
+    # Written next to the outputs so they can be moved into place with os.replace
+    work_dir = tempfile.mkdtemp(prefix='.multifill-', dir=os.path.dirname(entries[0][2]))
+    try:
+        json_path = os.path.join(work_dir, 'forms.json')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({'forms': [payload['forms'][0] for _, payload, _ in entries]}, f)
+        pdfcpu_command = [
+            'pdfcpu',
+            'form', 'multifill',
+            '-mode', 'single',          # One output PDF per form
+            resolved_template_path,
+            json_path,
+            work_dir,
+            'claim'                     # Outputs are named claim_<n>.pdf, in form order
+        ]
+        logger.info(f"Executing pdfcpu multifill for {len(entries)} claim(s): {' '.join(pdfcpu_command)}")
+        with metrics.timer('pdfcpu_subprocess_seconds'):
+            process_result = subprocess.run(pdfcpu_command, capture_output=True, text=True, check=False)
+        if process_result.returncode != 0:
+            return f"pdfcpu exited with {process_result.returncode}: {process_result.stderr.strip()}"
+        outputs = sorted(
+            (int(match.group(1)), name)
+            for name in os.listdir(work_dir)
+            for match in [MULTIFILL_OUTPUT_RE.search(name)] if match
+        )
+        if len(outputs) != len(entries):
+            return f"pdfcpu wrote {len(outputs)} PDF(s) for {len(entries)} form(s)"
+        for (_, name), (_, _, output_path) in zip(outputs, entries):
+            os.replace(os.path.join(work_dir, name), output_path)
+        return None
+    except Exception as e:
+        logger.error(f"Exception during pdfcpu multifill: {e}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return f"pdfcpu multifill failed: {e}"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,155 @@
+import os
+import re
+import sys
+import json
+import time
+import logging
+import threading
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# --- On-demand profiling of slow requests ---
+# A StackSampler thread records the handling thread's call stack every few milliseconds while a profiled request
+# runs. Requests that finish faster than the threshold are discarded; slower ones are saved to PROFILE_DIR as JSON
+# (request details plus sampled stacks) and can be downloaded as collapsed stacks ("frame;frame;frame count"), the
+# input format of flamegraph.pl, speedscope and inferno. Sampling only costs anything while a request is profiled.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(BASE_DIR, 'data', 'profiles'))
+PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 50))
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', 5)) / 1000
+PROFILE_MAX_DEPTH = 128
+
+PROFILE_NAME_RE = re.compile(r'^profile-\d+-\d+-[A-Za-z0-9_.]+\.json$')
+
+
+def _frame_label(code):
+    """'function (path:first line)', with paths shortened to the repo or site-packages."""
+    filename = code.co_filename
+    if filename.startswith(BASE_DIR + os.sep):
+        filename = os.path.relpath(filename, BASE_DIR)
+    elif 'site-packages' + os.sep in filename:
+        filename = filename.split('site-packages' + os.sep, 1)[1]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(';', ':')
+
+
+class StackSampler:
+    """Samples one thread's call stack every `interval` seconds from a background thread until stop()."""
+
+    def __init__(self, thread_id=None, interval=PROFILE_SAMPLE_INTERVAL, max_depth=PROFILE_MAX_DEPTH):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops sampling and returns the Counter of collapsed stack -> samples."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.stacks
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break  # The profiled thread has gone away
+            labels = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            del frame
+            self.stacks[';'.join(reversed(labels))] += 1
+            self.samples += 1
+
+
+def collapsed_stacks(profile):
+    """A saved profile as flamegraph collapsed-stack text, heaviest stacks first."""
+    stacks = sorted(profile.get('stacks', {}).items(), key=lambda item: (-item[1], item[0]))
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks)
+
+
+class ProfileStore:
+    """Saved profiles in one directory, pruned to the newest `max_files`."""
+
+    def __init__(self, directory=PROFILE_DIR, max_files=PROFILE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def save(self, endpoint, method, path, duration_seconds, interval, stacks, samples):
+        """Writes one profile and prunes the oldest beyond max_files. Returns the profile's name, or None on failure."""
+        started_ms = int(time.time() * 1000)
+        safe_endpoint = re.sub(r'[^A-Za-z0-9_.]', '_', endpoint or 'unmatched')
+        name = f"profile-{started_ms}-{os.getpid()}-{safe_endpoint}.json"
+        profile = {
+            'name': name,
+            'endpoint': endpoint,
+            'method': method,
+            'path': path,
+            'duration_ms': round(duration_seconds * 1000, 1),
+            'recorded_at': started_ms / 1000,
+            'sample_interval_ms': interval * 1000,
+            'samples': samples,
+            'stacks': dict(stacks),
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = os.path.join(self.directory, f".{name}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(profile, f)
+            os.replace(tmp_path, os.path.join(self.directory, name))
+        except OSError as e:
+            logger.warning(f"Could not save request profile {name}: {e}")
+            return None
+        self._prune()
+        return name
+
+    def _names(self):
+        try:
+            names = [name for name in os.listdir(self.directory) if PROFILE_NAME_RE.match(name)]
+        except OSError:
+            return []
+        # Newest first by the millisecond timestamp in the name
+        return sorted(names, key=lambda name: int(name.split('-')[1]), reverse=True)
+
+    def _prune(self):
+        with self._lock:
+            for name in self._names()[self.max_files:]:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def list(self):
+        """Summaries (everything except the stacks) of the saved profiles, newest first."""
+        summaries = []
+        for name in self._names():
+            profile = self.load(name)
+            if profile:
+                profile.pop('stacks', None)
+                summaries.append(profile)
+        return summaries
+
+    def load(self, name):
+        """The saved profile called `name`, or None if it does not exist (or the name is not a profile name)."""
+        if not PROFILE_NAME_RE.match(name or ''):
+            return None
+        try:
+            with open(os.path.join(self.directory, name), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+
+profile_store = ProfileStore()
@@ -0,0 +1,302 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import logging
+import threading
+import traceback
+
+from src.utils.pdf_filler import fill_sf95_pdf
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle: queued -> running -> done | failed. A queued job is 'cancelled' when a newer job
+# for the same output file supersedes it before it starts. The pdf_render_jobs table lives in the claims
+# database and is created by migration 0007.
+JOB_PENDING_STATUSES = ('queued', 'running')
+
+
+class RenderQueue:
+    """
+    Persistent PDF rendering queue stored in SQLite, drained by a bounded pool of worker threads.
+    Several processes may share one queue: jobs are claimed atomically, and jobs left 'running'
+    by a dead process are put back in the queue.
+    """
+
+    def __init__(self, db_path, workers=2, max_attempts=3, lease_seconds=300, poll_interval=0.5, recover_interval=30):
+        self.db_path = db_path
+        self.workers = max(1, int(workers))
+        self.max_attempts = max(1, int(max_attempts))
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.recover_interval = recover_interval
+        self._last_recovery = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._threads = []
+        self._started_pid = None
+
+    @property
+    def worker_id(self):
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        # Same journaling as the request pool (src.utils.db_pool) so job polling never blocks claim writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def start(self):
+        """Starts this process's worker threads once. Safe to call on every request, and after a fork."""
+        if self._started_pid == os.getpid():
+            return
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            try:
+                self.recover_unfinished()
+            except sqlite3.Error as e:
+                logger.error(f"Could not recover unfinished PDF render jobs (is the schema migrated?): {e}")
+            self._threads = []
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"pdf-render-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            self._started_pid = os.getpid()
+            logger.info(f"PDF render queue started with {self.workers} worker(s) in process {os.getpid()}.")
+
+    def enqueue(self, kind, pdf_data, template_path, output_path, claim_id=None):
+        """Queues a render of pdf_data into output_path and returns the job id. Does not wait for it."""
+        self.start()
+        now = time.time()
+        conn = self._connect()
+        try:
+            # Any job still waiting for the same file is now stale; only the newest data matters
+            conn.execute(
+                "UPDATE pdf_render_jobs SET status = 'cancelled', updated_at = ? WHERE output_path = ? AND status = 'queued'",
+                (now, output_path)
+            )
+            cursor = conn.execute(
+                "INSERT INTO pdf_render_jobs (kind, claim_id, template_path, output_path, pdf_data, max_attempts, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, claim_id, template_path, output_path, json.dumps(pdf_data), self.max_attempts, now, now)
+            )
+            conn.commit()
+            job_id = cursor.lastrowid
+        finally:
+            conn.close()
+        logger.info(f"Queued {kind} PDF render job {job_id} for {output_path}")
+        self._wakeup.set()
+        return job_id
+
+    def get_job(self, job_id):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT id, kind, claim_id, output_path, status, attempts, last_error, created_at, updated_at FROM pdf_render_jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def latest_job_for_output(self, output_path):
+        """Returns the newest non-cancelled job that writes output_path, or None."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT id, kind, claim_id, output_path, status, attempts, last_error, created_at, updated_at FROM pdf_render_jobs "
+                "WHERE output_path = ? AND status != 'cancelled' ORDER BY id DESC LIMIT 1",
+                (output_path,)
+            ).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def wait_for_job(self, job_id, timeout):
+        """Polls until the job is no longer queued/running or timeout seconds pass. Returns the last job state."""
+        deadline = time.time() + timeout
+        job = self.get_job(job_id)
+        while job and job['status'] in JOB_PENDING_STATUSES and time.time() < deadline:
+            time.sleep(self.poll_interval)
+            job = self.get_job(job_id)
+        return job
+
+    def recover_unfinished(self):
+        """Re-queues jobs whose worker died mid-render: expired leases, or dead processes on this host."""
+        now = time.time()
+        host_prefix = f"{socket.gethostname()}:"
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT id, locked_by, locked_at FROM pdf_render_jobs WHERE status = 'running'").fetchall()
+            recovered = []
+            for row in rows:
+                lease_expired = (row['locked_at'] or 0) < now - self.lease_seconds
+                owner_dead = False
+                if row['locked_by'] and row['locked_by'].startswith(host_prefix):
+                    owner_dead = not _pid_alive(int(row['locked_by'][len(host_prefix):]))
+                if lease_expired or owner_dead:
+                    recovered.append(row['id'])
+            for job_id in recovered:
+                conn.execute(
+                    "UPDATE pdf_render_jobs SET status = 'queued', locked_by = NULL, locked_at = NULL, updated_at = ? WHERE id = ? AND status = 'running'",
+                    (now, job_id)
+                )
+            conn.commit()
+        finally:
+            conn.close()
+        self._last_recovery = now
+        if recovered:
+            logger.warning(f"Recovered {len(recovered)} unfinished PDF render job(s): {recovered}")
+        return recovered
+
+    def _claim_next_job(self, conn):
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Skip files that another worker is writing so renders of one file never overlap
+            row = conn.execute(
+                "SELECT * FROM pdf_render_jobs WHERE status = 'queued' AND run_after <= ? "
+                "AND output_path NOT IN (SELECT output_path FROM pdf_render_jobs WHERE status = 'running') "
+                "ORDER BY id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE pdf_render_jobs SET status = 'running', attempts = attempts + 1, locked_by = ?, locked_at = ?, updated_at = ? WHERE id = ?",
+                (self.worker_id, now, now, row['id'])
+            )
+            conn.execute("COMMIT")
+            job = dict(row)
+            job['attempts'] += 1
+            return job
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def cancel_for_output(self, output_path):
+        """
+        Cancels every queued or running job that writes output_path, e.g. before the file is deleted because its data
+        changed. A running job still finishes its render but discards it instead of replacing the file.
+        Returns the cancelled job ids.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            cancelled = [row['id'] for row in conn.execute(
+                "SELECT id FROM pdf_render_jobs WHERE output_path = ? AND status IN (?, ?)", (output_path,) + JOB_PENDING_STATUSES
+            ).fetchall()]
+            conn.executemany("UPDATE pdf_render_jobs SET status = 'cancelled', updated_at = ? WHERE id = ? AND status IN (?, ?)",
+                             [(now, job_id) + JOB_PENDING_STATUSES for job_id in cancelled])
+            conn.commit()
+        finally:
+            conn.close()
+        if cancelled:
+            logger.info(f"Cancelled PDF render job(s) {cancelled} for {output_path}")
+        return cancelled
+
+    @staticmethod
+    def _render_path(job):
+        """Where a job renders before _finish_job moves the file into place (unless the job was cancelled meanwhile)."""
+        return f"{job['output_path']}.job{job['id']}.pdf"
+
+    def _finish_job(self, conn, job, error=None):
+        """Records the result inside the caller's write transaction, which also makes the cancel check and the move atomic."""
+        now = time.time()
+        render_path = self._render_path(job)
+        row = conn.execute("SELECT status FROM pdf_render_jobs WHERE id = ?", (job['id'],)).fetchone()
+        if row is None or row['status'] != 'running':
+            # Cancelled (or re-queued after its lease expired) while rendering: the output would be stale
+            _remove_quietly(render_path)
+            conn.commit()
+            logger.info(f"PDF render job {job['id']} was {row['status'] if row else 'removed'} while rendering; discarded its output.")
+            return
+        if error is None:
+            try:
+                os.replace(render_path, job['output_path'])
+            except OSError as e:
+                error = f"Could not move the rendered PDF into place: {e}"
+        else:
+            _remove_quietly(render_path)
+        if error is None:
+            conn.execute(
+                "UPDATE pdf_render_jobs SET status = 'done', last_error = NULL, locked_by = NULL, locked_at = NULL, updated_at = ? WHERE id = ?",
+                (now, job['id'])
+            )
+            logger.info(f"PDF render job {job['id']} done: {job['output_path']}")
+        elif job['attempts'] < job['max_attempts']:
+            retry_delay = 2 ** job['attempts']
+            conn.execute(
+                "UPDATE pdf_render_jobs SET status = 'queued', last_error = ?, run_after = ?, locked_by = NULL, locked_at = NULL, updated_at = ? WHERE id = ?",
+                (error, now + retry_delay, now, job['id'])
+            )
+            logger.warning(f"PDF render job {job['id']} failed (attempt {job['attempts']}/{job['max_attempts']}), retrying in {retry_delay}s: {error}")
+        else:
+            conn.execute(
+                "UPDATE pdf_render_jobs SET status = 'failed', last_error = ?, locked_by = NULL, locked_at = NULL, updated_at = ? WHERE id = ?",
+                (error, now, job['id'])
+            )
+            logger.error(f"PDF render job {job['id']} failed permanently after {job['attempts']} attempt(s): {error}")
+        conn.commit()
+
+    def _run_job(self, job):
+        try:
+            result = fill_sf95_pdf(json.loads(job['pdf_data']), job['template_path'], self._render_path(job))
+        except Exception as e:
+            logger.error(f"PDF render job {job['id']} raised: {e}\n{traceback.format_exc()}")
+            return str(e)
+        if not result:
+            return "fill_sf95_pdf returned no output (see pdf_filler log for details)"
+        return None
+
+    def _worker_loop(self):
+        conn = self._connect()
+        conn.isolation_level = None  # Transactions are managed explicitly in _claim_next_job
+        while True:
+            try:
+                job = self._claim_next_job(conn)
+                if job is None:
+                    # Expired leases are reclaimed while idle too, not only when a process starts
+                    if time.time() - self._last_recovery >= self.recover_interval:
+                        self.recover_unfinished()
+                    self._wakeup.wait(self.poll_interval)
+                    self._wakeup.clear()
+                    continue
+                error = self._run_job(job)
+                conn.execute("BEGIN IMMEDIATE")
+                self._finish_job(conn, job, error)
+            except Exception as e:
+                # Anything escaping here would end the thread and silently stall this process's queue
+                if isinstance(e, sqlite3.Error):
+                    logger.error(f"PDF render worker database error: {e}")
+                else:
+                    logger.error(f"PDF render worker error: {e}\n{traceback.format_exc()}")
+                # A failed UPDATE leaves the transaction open, and every later BEGIN IMMEDIATE would fail on it
+                try:
+                    if conn.in_transaction:
+                        conn.rollback()
+                except sqlite3.Error as rollback_error:
+                    logger.error(f"PDF render worker rollback failed: {rollback_error}")
+                time.sleep(self.poll_interval)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,157 @@
+import os
+import mmap
+import time
+import struct
+import logging
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are still serialized within a process, just not across processes
+    fcntl = None
+
+# --- Ring-buffer debug log ---
+# A fixed-size, memory-mapped file. Appending costs the same no matter how much has been logged: the entry is
+# copied in at the write head and the oldest entries are simply overwritten, so nothing is ever read back or
+# rewritten. Workers append under an exclusive flock, so concurrent processes can't interleave or lose entries.
+#
+# Layout: 64-byte header (magic, capacity, head, next sequence number), then `capacity` bytes of entries.
+# Entry: [u32 length][u64 seq][f64 unix time][payload][u32 length]. The trailing length lets the reader walk
+# backwards from the head to the oldest surviving entry. `head` counts every byte ever written and is only
+# advanced after the entry is complete, so a crash mid-append never exposes a torn entry.
+
+DEBUG_LOG_PATH = os.environ.get('DEBUG_LOG_PATH', os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'debugging-logs.ring'))
+DEBUG_LOG_BYTES = int(os.environ.get('DEBUG_LOG_BYTES', 4 * 1024 * 1024))
+
+MAGIC = b'RINGLOG1'
+HEADER = struct.Struct('<8sQQQ')  # magic, capacity, head, next_seq
+HEADER_SIZE = 64
+ENTRY_PREFIX = struct.Struct('<IQd')  # length, seq, timestamp
+ENTRY_SUFFIX = struct.Struct('<I')
+ENTRY_OVERHEAD = ENTRY_PREFIX.size + ENTRY_SUFFIX.size
+
+
+class RingLog:
+    """Append-only text log of fixed size; see the module comment for the file layout."""
+
+    def __init__(self, path=DEBUG_LOG_PATH, capacity=DEBUG_LOG_BYTES):
+        self.path = path
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._mm = None
+        self._fd = None
+        self._pid = None
+
+    def _open(self):
+        if self._mm is not None and self._pid == os.getpid():
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._flock(fd, exclusive=True)
+        try:
+            size = os.fstat(fd).st_size
+            if size >= HEADER_SIZE:
+                os.lseek(fd, 0, os.SEEK_SET)
+                magic, capacity, _, _ = HEADER.unpack(os.read(fd, HEADER.size))
+                if magic != MAGIC:
+                    raise ValueError(f"{self.path} is not a ring log")
+                self.capacity = capacity  # An existing file keeps the size it was created with
+            else:
+                os.ftruncate(fd, HEADER_SIZE + self.capacity)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, HEADER.pack(MAGIC, self.capacity, 0, 1))
+        finally:
+            self._flock(fd, unlock=True)
+        self._fd = fd
+        self._mm = mmap.mmap(fd, HEADER_SIZE + self.capacity)
+        self._pid = os.getpid()
+
+    @staticmethod
+    def _flock(fd, exclusive=False, unlock=False):
+        if fcntl is None:
+            return
+        if unlock:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+    def _write_wrapped(self, position, data):
+        offset = position % self.capacity
+        first = min(len(data), self.capacity - offset)
+        self._mm[HEADER_SIZE + offset:HEADER_SIZE + offset + first] = data[:first]
+        if first < len(data):
+            self._mm[HEADER_SIZE:HEADER_SIZE + len(data) - first] = data[first:]
+
+    def _read_wrapped(self, position, length):
+        offset = position % self.capacity
+        first = min(length, self.capacity - offset)
+        data = self._mm[HEADER_SIZE + offset:HEADER_SIZE + offset + first]
+        if first < length:
+            data += self._mm[HEADER_SIZE:HEADER_SIZE + length - first]
+        return data
+
+    def append(self, text):
+        """Adds one entry. Entries longer than a quarter of the ring are truncated."""
+        with self._lock:
+            self._open()
+            payload = text.encode('utf-8', errors='replace')[:self.capacity // 4]
+            self._flock(self._fd, exclusive=True)
+            try:
+                _, _, head, seq = HEADER.unpack(self._mm[:HEADER.size])
+                entry = ENTRY_PREFIX.pack(len(payload), seq, time.time()) + payload + ENTRY_SUFFIX.pack(len(payload))
+                self._write_wrapped(head, entry)
+                self._mm[:HEADER.size] = HEADER.pack(MAGIC, self.capacity, head + len(entry), seq + 1)
+            finally:
+                self._flock(self._fd, unlock=True)
+
+    def entries(self):
+        """Every surviving entry, oldest first, as (seq, unix_time, text)."""
+        with self._lock:
+            self._open()
+            self._flock(self._fd)
+            try:
+                _, _, head, _ = HEADER.unpack(self._mm[:HEADER.size])
+                oldest_allowed = max(0, head - self.capacity)
+                found = []
+                position = head
+                while position - ENTRY_OVERHEAD >= oldest_allowed:
+                    (length,) = ENTRY_SUFFIX.unpack(self._read_wrapped(position - ENTRY_SUFFIX.size, ENTRY_SUFFIX.size))
+                    start = position - ENTRY_OVERHEAD - length
+                    if start < oldest_allowed:
+                        break  # Partly overwritten by newer entries
+                    prefix_length, seq, timestamp = ENTRY_PREFIX.unpack(self._read_wrapped(start, ENTRY_PREFIX.size))
+                    if prefix_length != length:
+                        break
+                    payload = self._read_wrapped(start + ENTRY_PREFIX.size, length)
+                    found.append((seq, timestamp, payload.decode('utf-8', errors='replace')))
+                    position = start
+            finally:
+                self._flock(self._fd, unlock=True)
+        found.reverse()
+        return found
+
+    def close(self):
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                os.close(self._fd)
+                self._mm = None
+                self._fd = None
+
+
+class RingLogHandler(logging.Handler):
+    """logging handler that appends each formatted record to a RingLog."""
+
+    def __init__(self, ring_log, level=logging.NOTSET):
+        super().__init__(level)
+        self.ring_log = ring_log
+
+    def emit(self, record):
+        try:
+            self.ring_log.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+debug_ring_log = RingLog()
@@ -0,0 +1,304 @@
+import os
+import copy
+import json
+import time
+import zlib
+import hashlib
+import secrets
+import logging
+import threading
+
+from flask.json.tag import JSONTag, TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from src.utils.db_pool import ConnectionPool
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# --- Server-side sessions in SQLite ---
+# One row per session: id (the cookie value), a zlib-compressed tagged-JSON payload and an expiry time. Values equal
+# to a registered default (e.g. the field 8/10 boilerplate) are stored as a reference to it, and dicts that mostly
+# match a default dict (form_data vs. the form defaults) as just their differences. Each version of the defaults is
+# kept in session_defaults, so a session written before the defaults changed still decodes against the defaults it
+# was written with (and is rewritten against the current ones); a version is dropped once no session references it.
+# A row is only rewritten when the payload actually changed; expired rows are deleted in bulk through the expires_at
+# index.
+
+SESSION_SWEEP_INTERVAL = int(os.environ.get('SESSION_SWEEP_INTERVAL', 300))  # Seconds between expiry sweeps
+SESSION_TOUCH_INTERVAL = int(os.environ.get('SESSION_TOUCH_INTERVAL', 3600))  # How stale expires_at may get before an unchanged session is re-saved
+SESSION_POOL_SIZE = int(os.environ.get('SESSION_POOL_SIZE', 4))
+MIN_DEFAULT_TEXT_LENGTH = 32  # Shorter default strings are not worth a reference
+
+SESSION_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS sessions (
+        id TEXT PRIMARY KEY,
+        data BLOB NOT NULL,
+        defaults_version TEXT NOT NULL,
+        expires_at INTEGER NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_defaults_version ON sessions(defaults_version)",
+    """CREATE TABLE IF NOT EXISTS session_defaults (
+        version TEXT PRIMARY KEY,
+        defaults TEXT NOT NULL
+    )""",
+]
+
+
+class TagDefaultText(JSONTag):
+    """A string equal to a registered default string, stored as [default name, key]."""
+    __slots__ = ()
+    key = ' dt'
+
+    def check(self, value):
+        return isinstance(value, str) and len(value) >= MIN_DEFAULT_TEXT_LENGTH and value in self.serializer.default_texts
+
+    def to_json(self, value):
+        return list(self.serializer.default_texts[value])
+
+    def to_python(self, value):
+        name, key = value
+        return self.serializer.defaults[name][key]
+
+
+class TagDefaultsDelta(JSONTag):
+    """A dict sharing most items with a registered default dict, stored as [default name, changed, removed keys]."""
+    __slots__ = ()
+    key = ' dd'
+
+    def check(self, value):
+        return isinstance(value, dict) and self.serializer.closest_default(value) is not None
+
+    def to_json(self, value):
+        name = self.serializer.closest_default(value)
+        base = self.serializer.defaults[name]
+        changed = {key: self.serializer.tag(item) for key, item in value.items() if key not in base or base[key] != item}
+        removed = [key for key in base if key not in value]
+        return [name, changed, removed]
+
+    def to_python(self, value):
+        name, changed, removed = value
+        result = copy.deepcopy(self.serializer.defaults[name])
+        for key in removed:
+            result.pop(key, None)
+        result.update(changed)
+        return result
+
+
+class SessionDefaultsSerializer(TaggedJSONSerializer):
+    """Flask's tagged JSON, plus references to the registered defaults (name -> str or dict of str keys)."""
+
+    def __init__(self, defaults):
+        self.defaults = defaults
+        self.default_dicts = {name: value for name, value in defaults.items() if isinstance(value, dict)}
+        self.default_texts = {}
+        for name, value in defaults.items():
+            for key, text in (value.items() if isinstance(value, dict) else ()):
+                if isinstance(text, str) and len(text) >= MIN_DEFAULT_TEXT_LENGTH:
+                    self.default_texts.setdefault(text, (name, key))
+        super().__init__()
+        self.register(TagDefaultsDelta, index=0)
+        self.register(TagDefaultText)
+        self.snapshot = json.dumps(defaults, sort_keys=True, default=str)
+        self.version = hashlib.sha256(self.snapshot.encode('utf-8')).hexdigest()[:16]
+
+    def closest_default(self, value):
+        """Name of the default dict `value` shares the most items with, if that is at least half of them."""
+        best_name, best_shared = None, 0
+        for name, base in self.default_dicts.items():
+            shared = sum(1 for key, item in value.items() if key in base and base[key] == item)
+            if shared > best_shared:
+                best_name, best_shared = name, shared
+        return best_name if best_shared and best_shared * 2 >= len(value) else None
+
+
+class SqliteSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False, stored_data=None, expires_at=0):
+        def on_update(self):
+            self.modified = True
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.stored_data = stored_data  # Payload as loaded, to detect changes made through nested objects
+        self.expires_at = expires_at
+
+
+class SqliteSessionInterface(SessionInterface):
+    """Flask session interface storing sessions in their own SQLite database (see the module comment)."""
+
+    def __init__(self, db_path, defaults=None, sweep_interval=SESSION_SWEEP_INTERVAL, touch_interval=SESSION_TOUCH_INTERVAL):
+        self.db_path = db_path
+        self.serializer = SessionDefaultsSerializer(defaults or {})
+        self._serializers = {self.serializer.version: self.serializer}  # Defaults version -> serializer, loaded on demand
+        self.sweep_interval = sweep_interval
+        self.touch_interval = touch_interval
+        self.pool = ConnectionPool(db_path, max_size=SESSION_POOL_SIZE)
+        self._schema_ready = False
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+        self._stats = {'loaded': 0, 'written': 0, 'unchanged': 0, 'touched': 0, 'deleted': 0, 'swept': 0}
+
+    def _connection(self):
+        conn = self.pool.acquire()
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    for statement in SESSION_SCHEMA:
+                        conn.execute(statement)
+                    conn.execute("INSERT OR IGNORE INTO session_defaults (version, defaults) VALUES (?, ?)",
+                                 (self.serializer.version, self.serializer.snapshot))
+                    conn.commit()
+                    self._schema_ready = True
+        return conn
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def encode(self, data):
+        return zlib.compress(self.serializer.dumps(dict(data)).encode('utf-8'))
+
+    def decode(self, blob, serializer=None):
+        return (serializer or self.serializer).loads(zlib.decompress(blob).decode('utf-8'))
+
+    def _serializer_for(self, conn, version):
+        """Serializer for the defaults a session was written with; the current one if that snapshot is gone."""
+        with self._lock:
+            serializer = self._serializers.get(version)
+        if serializer is None:
+            row = conn.execute("SELECT defaults FROM session_defaults WHERE version = ?", (version,)).fetchone()
+            if row is None:
+                logger.warning(f"No snapshot of session defaults version {version}; decoding against the current defaults.")
+                return self.serializer
+            serializer = SessionDefaultsSerializer(json.loads(row['defaults']))
+            with self._lock:
+                self._serializers[version] = serializer
+        return serializer
+
+    def _lifetime_seconds(self, app):
+        return int(app.permanent_session_lifetime.total_seconds())
+
+    def open_session(self, app, request):
+        with metrics.timer('session_seconds', operation='load'):
+            return self._open_session(app, request)
+
+    def save_session(self, app, session, response):
+        with metrics.timer('session_seconds', operation='save'):
+            self._save_session(app, session, response)
+
+    def _open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            now = int(time.time())
+            conn = self._connection()
+            try:
+                row = conn.execute("SELECT data, defaults_version, expires_at FROM sessions WHERE id = ?", (sid,)).fetchone()
+                serializer = self._serializer_for(conn, row['defaults_version']) if row and row['expires_at'] > now else None
+            finally:
+                self.pool.release(conn)
+            if serializer is not None:
+                try:
+                    data = self.decode(row['data'], serializer)
+                    self._count('loaded')
+                    # A session written against older defaults is saved again against the current ones
+                    stored_data = row['data'] if row['defaults_version'] == self.serializer.version else None
+                    return SqliteSession(data, sid=sid, stored_data=stored_data, expires_at=row['expires_at'])
+                except (zlib.error, ValueError, KeyError, TypeError) as e:
+                    logger.error(f"Discarding unreadable session: {e}")
+        return SqliteSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def _save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+        if session.accessed:
+            response.vary.add('Cookie')
+        self._maybe_sweep()
+
+        if not session:
+            if not session.new:
+                conn = self._connection()
+                try:
+                    conn.execute("DELETE FROM sessions WHERE id = ?", (session.sid,))
+                    conn.commit()
+                finally:
+                    self.pool.release(conn)
+                self._count('deleted')
+                response.delete_cookie(name, domain=domain, path=path, secure=secure, samesite=samesite, httponly=httponly)
+            return
+
+        now = int(time.time())
+        expires_at = now + self._lifetime_seconds(app)
+        data = self.encode(session)
+        if data == session.stored_data:
+            if session.expires_at - now > self._lifetime_seconds(app) - self.touch_interval:
+                self._count('unchanged')
+            else:
+                self._write("UPDATE sessions SET expires_at = ? WHERE id = ?", (expires_at, session.sid))
+                self._count('touched')
+        else:
+            self._write(
+                "INSERT INTO sessions (id, data, defaults_version, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET data = excluded.data, defaults_version = excluded.defaults_version, expires_at = excluded.expires_at",
+                (session.sid, data, self.serializer.version, expires_at),
+            )
+            self._count('written')
+
+        if session.new or self.should_set_cookie(app, session):
+            response.set_cookie(name, session.sid, expires=self.get_expiration_time(app, session), httponly=httponly,
+                                domain=domain, path=path, secure=secure, samesite=samesite)
+
+    def _write(self, sql, args):
+        conn = self._connection()
+        try:
+            conn.execute(sql, args)
+            conn.commit()
+        finally:
+            self.pool.release(conn)
+
+    def _maybe_sweep(self):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep < self.sweep_interval:
+                return
+            self._last_sweep = now
+        try:
+            self.sweep()
+        except Exception as e:
+            logger.error(f"Session expiry sweep failed: {e}")
+
+    def warm_up(self, connections=1):
+        """Creates the sessions table if needed and opens `connections` pooled connections ahead of the first request."""
+        self.pool.release(self._connection())
+        return self.pool.warm(connections)
+
+    def sweep(self):
+        """
+        Deletes every expired session in one indexed DELETE, then the snapshots of older defaults no session uses any
+        more. Returns the number of sessions removed.
+        """
+        conn = self._connection()
+        try:
+            removed = conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (int(time.time()),)).rowcount
+            conn.execute(
+                "DELETE FROM session_defaults WHERE version != ? "
+                "AND NOT EXISTS (SELECT 1 FROM sessions WHERE sessions.defaults_version = session_defaults.version)",
+                (self.serializer.version,)
+            )
+            conn.commit()
+        finally:
+            self.pool.release(conn)
+        if removed:
+            logger.info(f"Swept {removed} expired session(s).")
+        self._count('swept', removed)
+        return removed
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
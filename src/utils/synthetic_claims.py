@@ -0,0 +1,148 @@
+import re
+import random
+from datetime import datetime, timedelta, timezone
+
+from src.utils.boilerplate_texts import BOILERPLATE_COLUMNS, current_boilerplate_ids, split_claim_texts
+
+# --- Synthetic claims for capacity planning ---
+# Rows shaped like the ones the intake flow writes: claimant details, amounts stored the way /submit stores them
+# (12a-c as typed, 12d as the computed total with two decimals), the standard field 8/10 text with a share of
+# claimants adding to it or replacing it, and created/signed timestamps in the formats the two write paths use.
+# Everything is derived from one seed, so the same arguments always produce the same claims.
+
+US_STATE_CODES = [
+    'AK', 'AL', 'AR', 'AZ', 'CA', 'CO', 'CT', 'DC', 'DE', 'FL', 'GA', 'HI', 'IA', 'ID', 'IL', 'IN', 'KS', 'KY',
+    'LA', 'MA', 'MD', 'ME', 'MI', 'MN', 'MO', 'MS', 'MT', 'NC', 'ND', 'NE', 'NH', 'NJ', 'NM', 'NV', 'NY', 'OH',
+    'OK', 'OR', 'PA', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VA', 'VT', 'WA', 'WI', 'WV', 'WY',
+]
+# Rough weighting towards the states most claimants travelled from
+STATE_WEIGHTS = {'PA': 8, 'TX': 6, 'FL': 6, 'OH': 5, 'NY': 5, 'VA': 5, 'CA': 4, 'GA': 4, 'NC': 4, 'NJ': 3, 'MD': 3}
+
+FIRST_NAMES = ['James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'William', 'Elizabeth',
+               'David', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah', 'Charles', 'Karen']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+              'Hernandez', 'Lopez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin', 'Lee']
+STREETS = ['Main St', 'Oak Ave', 'Maple Dr', 'Cedar Ln', 'Pine St', 'Elm St', 'Washington Blvd', 'Lake Rd', 'Hill St']
+CITIES = ['Springfield', 'Franklin', 'Greenville', 'Bristol', 'Clinton', 'Fairview', 'Salem', 'Madison', 'Georgetown']
+MARITAL_STATUSES = ['Single', 'Married', 'Divorced', 'Widowed']
+PERSONAL_INJURY_AMOUNTS = ['90000', '90000', '90000', '50000', '100000', '150000', '250000']
+
+ADDED_TEXTS = [
+    'I was near the west terrace scaffolding when the munitions were fired.',
+    'I was struck in the leg by a rubber bullet and treated by a medic at the scene.',
+    'Tear gas was deployed directly into the crowd where I was standing.',
+    'I lost my glasses and phone while trying to leave the area.',
+]
+REPLACEMENT_TEXTS = [
+    'I was peacefully present on the Capitol grounds and was injured by police munitions.',
+    'Chemical irritants caused lasting breathing problems.',
+]
+SUPPLEMENTAL_ANSWERS = [
+    'Arrived around noon and stayed on the west side.', 'Stayed near the stage area the whole afternoon.',
+    'Did not enter the building.', 'Entered briefly through the open doors and left within minutes.', '',
+]
+
+
+def _claim_text(rng, boilerplate, deviation_ratio):
+    """The full field 8/10 text of a claim: the boilerplate, the boilerplate plus the claimant's addition, or (rarely) other text."""
+    if rng.random() >= deviation_ratio:
+        return boilerplate
+    if rng.random() < 0.8:
+        return f"{boilerplate}\n{rng.choice(ADDED_TEXTS)}"
+    return rng.choice(REPLACEMENT_TEXTS)
+
+
+def _filename_for(email):
+    # Same result as slugify() in src/app.py for the plain ASCII addresses generated here
+    return f"{re.sub(r'[^a-z0-9_-]', '', email.lower())}_SF95.pdf"
+
+
+def generate_claims(count, boilerplates, seed=0, signed_ratio=0.7, deviation_ratio=0.2, start=None, days=180):
+    """
+    Yields `count` synthetic claims as {column: value} dicts covering the DB_SCHEMA columns. boilerplates supplies
+    the standard field 8/10 text (PDF_FILLER_DEFAULTS); created_at is spread over `days` days from `start`.
+    """
+    rng = random.Random(seed)
+    run_tag = f"{rng.getrandbits(32):08x}"  # Keeps emails and PDF filenames unique across separate seeding runs
+    start = start or datetime(2025, 5, 1, tzinfo=timezone.utc)
+    states = list(US_STATE_CODES)
+    state_weights = [STATE_WEIGHTS.get(state, 1) for state in states]
+    for i in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        name = f"{first} {last}"
+        email = f"{first}.{last}.{run_tag}.{i}@example.com".lower()
+        employment = 'Civilian' if rng.random() < 0.9 else 'Military'
+        property_damage = rng.choice(['0', '0', '0', '150', '500', '1200'])
+        personal_injury = rng.choice(PERSONAL_INJURY_AMOUNTS)
+        created_at = start + timedelta(seconds=rng.randrange(days * 86400))
+        claim = {
+            'field1_agency': '',
+            'field2_name': name,
+            'field2_address': f"{rng.randrange(1, 9999)} {rng.choice(STREETS)}",
+            'field2_city': rng.choice(CITIES),
+            'field2_state': rng.choices(states, weights=state_weights)[0],
+            'field2_zip': f"{rng.randrange(1000, 99999):05d}",
+            'field3_type_employment': employment,
+            'field_pdf_4_dob': (datetime(1945, 1, 1) + timedelta(days=rng.randrange(60 * 365))).strftime('%Y-%m-%d'),
+            'field_pdf_5_marital_status': rng.choice(MARITAL_STATUSES),
+            'field6_checkbox_military': '',
+            'field7_checkbox_civilian': '',
+            'field8_basis_of_claim': _claim_text(rng, boilerplates.get('field8_basis_of_claim', ''), deviation_ratio),
+            'field9_property_damage_description': 'Phone and glasses' if property_damage != '0' else '',
+            'field10_nature_of_injury': _claim_text(rng, boilerplates.get('field10_nature_of_injury', ''), deviation_ratio),
+            'field11_witness_name_1': '',
+            'field11_witness_address_1': '',
+            'field11_witness_name_2': '',
+            'field11_witness_address_2': '',
+            'field12a_property_damage_amount': property_damage,
+            'field12b_personal_injury_amount': personal_injury,
+            'field12c_wrongful_death_amount': '0',
+            'field12d_total_claim_amount': f"{float(property_damage) + float(personal_injury):.2f}",
+            'field13a_signature': 'Pending Signature',
+            'field_pdf_13b_phone': f"{rng.randrange(201, 990)}{rng.randrange(200, 999)}{rng.randrange(10000):04d}",
+            'field14_date_signed': '',
+            'user_email_address': email,
+            'supplemental_question_1_capitol_experience': rng.choice(SUPPLEMENTAL_ANSWERS),
+            'supplemental_question_2_injuries_damages': rng.choice(SUPPLEMENTAL_ANSWERS),
+            'supplemental_question_3_entry_exit_time': rng.choice(SUPPLEMENTAL_ANSWERS),
+            'supplemental_question_4_inside_capitol_details': rng.choice(SUPPLEMENTAL_ANSWERS),
+            'filled_pdf_filename': _filename_for(email),
+            'field17_signature_of_claimant': '',
+            'field18_date_of_signature': '',
+            # /submit stores aware datetimes through sqlite3's adapter
+            'created_at': created_at.isoformat(sep=' '),
+            'updated_at': created_at.isoformat(sep=' '),
+        }
+        if rng.random() < signed_ratio:
+            # Signature finalization stores local ISO times with the browser's offset
+            signed_at = (created_at + timedelta(seconds=rng.randrange(60, 2 * 86400))).astimezone(timezone(timedelta(hours=-5)))
+            signed_at_text = signed_at.isoformat(timespec='seconds')
+            claim.update({
+                'field13a_signature': f"/s/ {name}",
+                'field14_date_signed': signed_at_text,
+                'field17_signature_of_claimant': name,
+                'field18_date_of_signature': signed_at_text,
+                'updated_at': signed_at_text,
+            })
+        yield claim
+
+
+def insert_claims(conn, columns, count, boilerplates, seed=0, **options):
+    """
+    Bulk-inserts `count` generated claims into `columns` of the claims table with one executemany, in a single
+    transaction. When `columns` include the boilerplate references, field 8/10 are stored split from their
+    boilerplate as /submit stores them. Returns the number of rows inserted.
+    """
+    claims = generate_claims(count, boilerplates, seed=seed, **options)
+    sql = f"INSERT INTO claims ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    try:
+        if any(id_column in columns for id_column, _ in BOILERPLATE_COLUMNS.values()):
+            boilerplate_ids = current_boilerplate_ids(conn, boilerplates)
+            claims = (dict(claim, **split_claim_texts(claim, boilerplates, boilerplate_ids)) for claim in claims)
+        rows = [tuple(claim.get(column, '') for column in columns) for claim in claims]
+        conn.executemany(sql, rows)  # sqlite3 opens one transaction for the whole batch
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(rows)
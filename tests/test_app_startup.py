@@ -0,0 +1,98 @@
+import os
+import sys
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_python(code, tmp_path):
+    env = dict(os.environ, PYTHONPATH=BASE_DIR, DATABASE_PATH=str(tmp_path / 'db' / 'form_data.db'),
+               SESSION_DB_PATH=str(tmp_path / 'db' / 'sessions.db'), DEBUG_LOG_PATH=str(tmp_path / 'debug.ring'),
+               METRICS_DIR=str(tmp_path / 'metrics'), PROFILE_DIR=str(tmp_path / 'profiles'), AUTO_MIGRATE='1')
+    cwd = tmp_path / 'cwd'
+    cwd.mkdir(exist_ok=True)
+    return subprocess.run([sys.executable, '-c', code], cwd=str(cwd), env=env, capture_output=True, text=True, timeout=60)
+
+
+def test_importing_the_app_has_no_side_effects(tmp_path):
+    result = _run_python("import src.app", tmp_path)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == ''
+    assert sorted(os.listdir(tmp_path)) == ['cwd']
+    assert os.listdir(tmp_path / 'cwd') == []
+
+
+def test_create_app_runs_the_one_time_setup(tmp_path):
+    result = _run_python(
+        "from src.app import create_app\n"
+        f"app = create_app({{'TESTING': True, 'FILLED_FORMS_DIR': {str(tmp_path / 'filled_forms')!r}}})\n"
+        "assert create_app() is app\n"
+        "assert app.test_client().get('/health').status_code == 200\n",
+        tmp_path)
+    assert result.returncode == 0, result.stderr
+    assert (tmp_path / 'cwd' / 'app.log').exists()
+    assert (tmp_path / 'db' / 'form_data.db').exists()
+    assert (tmp_path / 'filled_forms').is_dir()
+    assert result.stdout.count('Unified logging initialized') == 1
+
+
+def test_metrics_need_a_token_or_an_admin(tmp_path):
+    result = _run_python(
+        "from src.app import create_app\n"
+        f"app = create_app({{'TESTING': True, 'FILLED_FORMS_DIR': {str(tmp_path / 'filled_forms')!r}}})\n"
+        "client = app.test_client()\n"
+        "assert client.get('/metrics').status_code == 404\n"
+        "app.config['METRICS_TOKEN'] = 'secret'\n"
+        "assert client.get('/metrics').status_code == 401\n"
+        "assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401\n"
+        "assert client.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code == 200\n",
+        tmp_path)
+    assert result.returncode == 0, result.stderr
+
+
+def test_render_status_is_scoped_to_the_queuing_session(tmp_path):
+    result = _run_python(
+        "from src.app import create_app, render_queue, PDF_TEMPLATE_PATH\n"
+        f"app = create_app({{'TESTING': True, 'FILLED_FORMS_DIR': {str(tmp_path / 'filled_forms')!r}}})\n"
+        f"job_id = render_queue.enqueue('final', {{}}, PDF_TEMPLATE_PATH, {str(tmp_path / 'out.pdf')!r})\n"
+        "client = app.test_client()\n"
+        "assert client.get(f'/render_status/{job_id}').status_code == 404\n"
+        "with client.session_transaction() as session:\n"
+        "    session['render_job_ids'] = [job_id]\n"
+        "assert client.get(f'/render_status/{job_id}').status_code == 200\n",
+        tmp_path)
+    assert result.returncode == 0, result.stderr
+
+
+def test_regenerate_pdfs_retries_failed_claims_on_resume(tmp_path):
+    result = _run_python(
+        "import os, json\n"
+        "import src.app\n"
+        "from src.app import create_app, get_db\n"
+        "from src.utils.pdf_filler import BatchFillResult\n"
+        f"forms_dir = {str(tmp_path / 'filled_forms')!r}\n"
+        "app = create_app({'TESTING': True, 'FILLED_FORMS_DIR': forms_dir})\n"
+        "with app.app_context():\n"
+        "    db = get_db()\n"
+        "    for name in ('a', 'b'):\n"
+        "        db.execute('INSERT INTO claims (field2_name, filled_pdf_filename) VALUES (?, ?)', (name, f'{name}_SF95.pdf'))\n"
+        "    db.commit()\n"
+        "real_fill_many = src.app.fill_many\n"
+        "def flaky_fill_many(claims, *args, **kwargs):\n"
+        "    return [BatchFillResult(filename, None, 'boom') if filename == 'a_SF95.pdf' else real_fill_many([(filename, data)], *args, **kwargs)[0]\n"
+        "            for filename, data in claims]\n"
+        "src.app.fill_many = flaky_fill_many\n"
+        "runner = app.test_cli_runner()\n"
+        "out = runner.invoke(args=['regenerate-pdfs', '--workers', '1'])\n"
+        "assert out.exit_code == 0, out.output\n"
+        "checkpoint = os.path.join(forms_dir, '.regenerate_checkpoint.json')\n"
+        "assert json.load(open(checkpoint))['failed_claim_ids'] == [1]\n"
+        "assert not os.path.exists(os.path.join(forms_dir, 'a_SF95.pdf'))\n"
+        "src.app.fill_many = real_fill_many\n"
+        "out = runner.invoke(args=['regenerate-pdfs', '--workers', '1'])\n"
+        "assert out.exit_code == 0, out.output\n"
+        "assert 'Retrying 1 claim(s)' in out.output, out.output\n"
+        "assert os.path.exists(os.path.join(forms_dir, 'a_SF95.pdf'))\n"
+        "assert not os.path.exists(checkpoint)\n",
+        tmp_path)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,88 @@
+import os
+import sys
+import sqlite3
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.utils.boilerplate_texts import (
+    current_boilerplate_ids, interned_claim_texts, split_stored_text, split_claim_texts, claimant_text,
+    boilerplate_texts_by_id, stored_claim_text
+)
+from src.utils.migrations import apply_migrations
+
+BOILERPLATES = {'field8_basis_of_claim': 'Standard basis text.', 'field10_nature_of_injury': 'Standard injury text.'}
+
+
+def make_db(rows):
+    """A migrated database holding full box 8/10 texts, split the way synthetic claims are stored."""
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    apply_migrations(conn)
+    boilerplate_ids = current_boilerplate_ids(conn, BOILERPLATES)
+    for basis, injury in rows:
+        values = split_claim_texts({'field8_basis_of_claim': basis, 'field10_nature_of_injury': injury}, BOILERPLATES, boilerplate_ids)
+        conn.execute(f"INSERT INTO claims ({', '.join(values)}) VALUES ({', '.join('?' * len(values))})", tuple(values.values()))
+    return conn
+
+
+def test_split_stored_text():
+    assert split_stored_text('Standard basis text.', 'Standard basis text.') == ''
+    assert split_stored_text('Standard  basis\ttext. ', 'Standard basis text.') == ''  # Whitespace-only edits
+    assert split_stored_text('Standard basis text.\n  I was there too. ', 'Standard basis text.') == 'I was there too.'
+    assert split_stored_text('Standard basis text.s', 'Standard basis text.') is None
+    assert split_stored_text('Something else entirely.', 'Standard basis text.') is None
+    assert split_stored_text(None, 'Standard basis text.') is None
+
+
+def test_full_texts_are_split_and_flagged():
+    conn = make_db([
+        ('Standard basis text.', 'Standard injury text.'),
+        ('Standard basis text.\nI was there too.', 'Standard  injury text.'),
+        ('Old basis text.\nMy own words.', None),
+    ])
+    rows = conn.execute("SELECT field8_basis_of_claim, field10_nature_of_injury, field8_boilerplate_id, field8_deviates_from_boilerplate, "
+                        "field10_boilerplate_id, field10_deviates_from_boilerplate FROM claims ORDER BY id").fetchall()
+    boilerplate_ids = current_boilerplate_ids(conn, BOILERPLATES)
+    assert [tuple(row) for row in rows] == [
+        ('', '', boilerplate_ids['field8_basis_of_claim'], 0, boilerplate_ids['field10_nature_of_injury'], 0),
+        ('I was there too.', '', boilerplate_ids['field8_basis_of_claim'], 1, boilerplate_ids['field10_nature_of_injury'], 0),
+        # Text that doesn't start with the current boilerplate is kept whole and counts as a deviation
+        ('Old basis text.\nMy own words.', None, None, 1, None, 1),
+    ]
+    assert [claimant_text(row, 'field8_basis_of_claim') for row in rows] == ['', 'I was there too.', 'Old basis text.\nMy own words.']
+
+
+def test_new_claims_store_only_the_addition_and_the_flag_is_indexed():
+    conn = make_db([])
+    boilerplate_ids = current_boilerplate_ids(conn, BOILERPLATES)
+    values = interned_claim_texts({'field8_basis_of_claim': ' More detail. ', 'field10_nature_of_injury': ''}, boilerplate_ids)
+    assert values == {
+        'field8_basis_of_claim': 'More detail.', 'field8_boilerplate_id': boilerplate_ids['field8_basis_of_claim'],
+        'field8_deviates_from_boilerplate': 1,
+        'field10_nature_of_injury': '', 'field10_boilerplate_id': boilerplate_ids['field10_nature_of_injury'],
+        'field10_deviates_from_boilerplate': 0,
+    }
+    # A new version of the standard text is interned alongside the old one
+    new_ids = current_boilerplate_ids(conn, dict(BOILERPLATES, field8_basis_of_claim='Revised basis text.'))
+    assert new_ids['field8_basis_of_claim'] != boilerplate_ids['field8_basis_of_claim']
+    assert new_ids['field10_nature_of_injury'] == boilerplate_ids['field10_nature_of_injury']
+    plan = ' '.join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN SELECT id FROM claims WHERE field8_deviates_from_boilerplate = 1"))
+    assert 'idx_claims_field8_deviates_from_boilerplate' in plan
+
+
+def test_stored_claims_keep_the_boilerplate_they_were_filed_with():
+    conn = make_db([('Standard basis text.\nI was there too.', 'Standard injury text.'), ('Old basis text.\nMy own words.', None)])
+    current_boilerplate_ids(conn, dict(BOILERPLATES, field8_basis_of_claim='Revised basis text.'))  # The defaults change
+    texts_by_id = boilerplate_texts_by_id(conn)
+    filed, replaced = conn.execute("SELECT * FROM claims ORDER BY id").fetchall()
+    assert stored_claim_text(filed, 'field8_basis_of_claim', texts_by_id) == 'Standard basis text.\nI was there too.'
+    assert stored_claim_text(filed, 'field10_nature_of_injury', texts_by_id) == 'Standard injury text.'
+    assert stored_claim_text(replaced, 'field8_basis_of_claim', texts_by_id) == 'Old basis text.\nMy own words.'
+    # Edits are saved against the claim's own versions; a replaced boilerplate stays whole
+    own_ids = {'field8_basis_of_claim': filed['field8_boilerplate_id'], 'field10_nature_of_injury': replaced['field10_boilerplate_id']}
+    assert interned_claim_texts({'field8_basis_of_claim': 'Edited. ', 'field10_nature_of_injury': 'New words.'}, own_ids) == {
+        'field8_basis_of_claim': 'Edited.', 'field8_boilerplate_id': filed['field8_boilerplate_id'], 'field8_deviates_from_boilerplate': 1,
+        'field10_nature_of_injury': 'New words.', 'field10_boilerplate_id': None, 'field10_deviates_from_boilerplate': 1,
+    }
@@ -0,0 +1,79 @@
+import os
+import sys
+import sqlite3
+
+# Define the base directory of the project (two levels up from this test script)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.utils.claims_query import build_admin_claims_query, build_admin_claims_count, encode_cursor
+from src.utils.boilerplate_texts import current_boilerplate_ids, split_claim_texts
+from src.utils.migrations import apply_migrations
+
+BOILERPLATES = {'field8_basis_of_claim': 'Standard basis text.', 'field10_nature_of_injury': 'Standard injury text.'}
+COLUMNS = [
+    'field2_name', 'field2_state', 'field3_type_employment', 'field8_basis_of_claim', 'field10_nature_of_injury',
+    'field12a_property_damage_amount', 'field12b_personal_injury_amount', 'field12c_wrongful_death_amount',
+    'field12d_total_claim_amount', 'field13a_signature', 'field18_date_of_signature', 'created_at',
+]
+
+
+def make_db():
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    apply_migrations(conn)  # The migration triggers fill the epoch columns the date sorts and filters use
+    rows = [
+        ('Alice Adams', 'PA', 'Civilian', 'Standard  basis text.', 'Standard injury text.', '', '', '', '$1,000.00', 'Pending Signature', '', '2025-05-01 14:00:00'),
+        ('Bob Brown', 'TX', 'Military', 'Standard basis text.\nI was there too.', 'Standard injury text.', '', '', '', '250000', '/s/ Bob Brown', '2025-05-19T20:42:56-05:00', '2025-05-02 03:30:00'),
+        ('Carol Clark', 'PA', 'civilian', 'Standard basis text.', 'Different injury.', '', '', '', '', '/s/ Carol Clark', '2025-05-20T10:00:00-05:00', '2025-05-03 12:00:00'),
+    ]
+    boilerplate_ids = current_boilerplate_ids(conn, BOILERPLATES)
+    for row in rows:
+        claim = dict(zip(COLUMNS, row))
+        claim.update(split_claim_texts(claim, BOILERPLATES, boilerplate_ids))  # Splits boxes 8/10 and sets the deviation flags
+        conn.execute(f"INSERT INTO claims ({', '.join(claim)}) VALUES ({', '.join('?' * len(claim))})", tuple(claim.values()))
+    return conn
+
+
+def names(conn, params, limit=100):
+    sql, args, _, _ = build_admin_claims_query(params, ['id', 'field2_name'], limit=limit)
+    return [row['field2_name'] for row in conn.execute(sql, args).fetchall()]
+
+
+def test_filters_match_the_old_client_side_behaviour():
+    conn = make_db()
+    assert names(conn, {}) == ['Carol Clark', 'Bob Brown', 'Alice Adams']  # Newest first by default
+    assert names(conn, {'state': 'PA', 'employment': 'Civilian'}) == ['Carol Clark', 'Alice Adams']
+    assert names(conn, {'amount_min': '500', 'amount_max': '2000'}) == ['Alice Adams']  # Blank amounts never match a range
+    assert names(conn, {'signature_status': 'pending'}) == ['Alice Adams']
+    assert names(conn, {'signature_status': 'signed', 'signed_start': '2025-05-20'}) == ['Carol Clark']
+    assert names(conn, {'basis_deviation': '1'}) == ['Bob Brown']  # Whitespace-only differences are not deviations
+    assert names(conn, {'injury_deviation': '1', 'name': 'CAROL'}) == ['Carol Clark']
+    # 2025-05-02 03:30 UTC is the evening of 05/01 in New York
+    assert names(conn, {'created_start': '2025-05-01', 'created_end': '2025-05-01'}) == ['Bob Brown', 'Alice Adams']
+    count_sql, count_args = build_admin_claims_count({'state': 'PA'})
+    assert conn.execute(count_sql, count_args).fetchone()[0] == 2
+
+
+def test_keyset_pagination_walks_every_row_once():
+    conn = make_db()
+    params = {'sort': 'Total Claim Amount', 'dir': 'asc'}
+    seen = []
+    while True:
+        sql, args, _, _ = build_admin_claims_query(params, ['id', 'field2_name'], limit=1)
+        rows = conn.execute(sql, args).fetchall()
+        if not rows:
+            break
+        seen.append(rows[0]['field2_name'])
+        params = dict(params, cursor=encode_cursor(rows[-1]['sort_value'], rows[-1]['id']))
+    assert seen == ['Carol Clark', 'Alice Adams', 'Bob Brown']
+
+
+def test_default_sort_uses_an_index():
+    conn = make_db()
+    sql, args, _, _ = build_admin_claims_query({}, ['id', 'field2_name'])
+    plan = ' '.join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", args).fetchall())
+    assert 'idx_claims_created_at_epoch' in plan
+    assert 'TEMP B-TREE' not in plan
+
@@ -0,0 +1,34 @@
+import os
+import sys
+from datetime import datetime
+
+# Define the base directory of the project (two levels up from this test script)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.utils.datetime_display import format_datetime_for_display, format_datetime_columns, get_timezone
+
+
+def test_every_stored_format_is_parsed():
+    expected = '05/19/2025 09:42 PM'  # 2025-05-20 01:42 UTC in New York (EDT)
+    for stored in ('2025-05-20 01:42:56', '2025-05-20 01:42:56.325351', '2025-05-20 01:42:56.325351+00:00',
+                   '2025-05-20T01:42', '2025-05-20T01:42:56', '2025-05-19T20:42:56-05:00', '2025-05-20T01:42:56Z',
+                   datetime(2025, 5, 20, 1, 42, 56)):
+        assert format_datetime_for_display(stored) == expected, stored
+    assert format_datetime_for_display(None) == 'Pending'
+    assert format_datetime_for_display('') == 'Pending'
+    assert format_datetime_for_display('not a date') == 'not a date'
+
+
+def test_batch_formatting_matches_single_values():
+    rows = [
+        {'created_at': '2025-01-02 15:04:05', 'field18_date_of_signature': '2025-01-02T10:04:05-05:00'},
+        {'created_at': datetime(2025, 7, 1, 12, 0), 'field18_date_of_signature': ''},
+    ]
+    formatted = format_datetime_columns(rows, ['created_at', 'field18_date_of_signature'])
+    assert formatted == [
+        {'created_at': '01/02/2025 10:04 AM', 'field18_date_of_signature': '01/02/2025 10:04 AM'},
+        {'created_at': '07/01/2025 08:00 AM', 'field18_date_of_signature': 'Pending'},
+    ]
+    assert get_timezone('America/New_York') is get_timezone('America/New_York')
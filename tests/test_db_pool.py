@@ -0,0 +1,78 @@
+import os
+import sys
+import sqlite3
+import threading
+
+# Define the base directory of the project (two levels up from this test script)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+import pytest
+
+from src.utils.db_pool import ConnectionPool, PoolTimeout
+
+
+def test_connections_are_reused_and_use_wal(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), max_size=2)
+    conn = pool.acquire()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.execute("INSERT INTO t VALUES (1)")  # Left uncommitted: release must roll it back
+    pool.release(conn)
+    again = pool.acquire()
+    assert again is conn
+    assert again.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.release(again)
+    assert pool.stats()['created'] == 1
+    assert pool.stats()['idle'] == 1
+    pool.close_all()
+
+
+def test_exhausted_pool_waits_then_times_out(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), max_size=1, timeout=0.05)
+    conn = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    threading.Timer(0.01, pool.release, args=(conn,)).start()
+    pool.timeout = 5
+    assert pool.acquire() is conn
+    stats = pool.stats()
+    assert stats['waits'] == 2 and stats['timeouts'] == 1 and stats['in_use'] == 1
+    pool.release(conn)
+    pool.close_all()
+
+
+def test_warm_opens_connections_up_front(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), max_size=3)
+    assert pool.warm(5) == 3
+    stats = pool.stats()
+    assert stats['created'] == 3 and stats['idle'] == 3 and stats['in_use'] == 0
+    assert pool.warm(2) == 2
+    assert pool.stats()['created'] == 3
+    pool.close_all()
+
+
+def test_write_lock_waits_are_counted(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), max_size=2, busy_timeout_ms=2000, slow_write_ms=50)
+    holder, writer = pool.acquire(), pool.acquire()
+    holder.execute("CREATE TABLE t (x INTEGER)")
+    holder.commit()
+    assert pool.stats()['slow_writes'] == 0
+    holder.execute("BEGIN IMMEDIATE")  # Takes the write lock
+    threading.Timer(0.2, holder.commit).start()
+    writer.execute("INSERT INTO t VALUES (1)")  # Waits on busy_timeout until the holder commits
+    writer.commit()
+    stats = pool.stats()
+    assert stats['slow_writes'] == 1 and stats['slow_write_seconds'] >= 0.15 and stats['locked_errors'] == 0
+
+    holder.execute("BEGIN IMMEDIATE")
+    writer.execute("PRAGMA busy_timeout=0")
+    with pytest.raises(sqlite3.OperationalError):
+        writer.cursor().execute("INSERT INTO t VALUES (2)")
+    holder.rollback()
+    assert pool.stats()['locked_errors'] == 1
+    pool.release(holder)
+    pool.release(writer)
+    pool.close_all()
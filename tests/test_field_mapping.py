@@ -0,0 +1,54 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.utils.field_mapping import FORM_FIELD_SPEC, compile_form_spec, run_form_pipeline, compile_payload_spec, run_payload_pipeline
+
+DEFAULTS = {
+    'field8_basis_of_claim': 'Standard basis of claim text.',
+    'field10_nature_of_injury': 'Standard nature of injury text.',
+    'field9_property_damage_description': 'None',
+    'field12d_total_claim_amount': '0',
+}
+
+
+def test_form_pipeline_concatenates_and_defaults():
+    pdf_data = run_form_pipeline(compile_form_spec(FORM_FIELD_SPEC, DEFAULTS), {
+        'field2_name': 'Jane', 'field2_address': '1 Main St', 'field2_city': 'Springfield', 'field2_state': 'VA',
+        'field2_zip': '22150', 'field3_type_employment': 'Other', 'field3_other_specify': 'Contractor',
+        'field8_basis_of_claim': ' More detail. ', 'field12d_total_amount': '100',
+    })
+    assert pdf_data['field2_claimant_info_combined'] == "Jane\n1 Main St\nSpringfield, VA 22150"
+    assert pdf_data['field3_type_employment'] == 'Contractor'
+    assert pdf_data['field3_checkbox_civilian'] is False
+    assert pdf_data['field8_basis_of_claim'] == "Standard basis of claim text.\nMore detail."
+    assert pdf_data['field10_nature_of_injury'] == 'Standard nature of injury text.'
+    assert pdf_data['field9_property_damage_description'] == 'None'
+    assert pdf_data['field12d_total_claim_amount'] == '100'
+    assert pdf_data['field13a_signature'] == 'Pending Signature'
+
+
+def test_payload_pipeline_types_and_formats_fields():
+    field_map = {
+        'field3_checkbox_civilian': 'Civilian',
+        'field12b_personal_injury': 'Personal Injury',
+        'field_pdf_13b_phone': 'Phone',
+        'field12d_total_claim_amount': 'Total',
+        'field11_witness_name': 'Witness',
+    }
+    payload = run_payload_pipeline(compile_payload_spec(field_map, DEFAULTS), {
+        'field3_checkbox_civilian': 'TRUE',
+        'field12b_personal_injury': '1234.5',
+        'field_pdf_13b_phone': '555-123-4567',
+        'field12d_total_claim_amount': '  ',
+    })
+    fields = payload['forms'][0]
+    assert fields['checkbox'] == [{'name': 'Civilian', 'value': True}]
+    assert fields['textfield'] == [
+        {'name': 'Personal Injury', 'value': '$1,234.50'},
+        {'name': 'Phone', 'value': '(555)123-4567'},
+        {'name': 'Total', 'value': '$0.00'},  # Blank falls back to the default; the witness has neither and is left out
+    ]
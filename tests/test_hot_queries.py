@@ -0,0 +1,33 @@
+import os
+import sys
+import sqlite3
+
+# Define the base directory of the project (two levels up from this test script)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.utils.hot_queries import HOT_QUERIES
+from src.utils.migrations import apply_migrations
+
+
+def make_db(target=None):
+    conn = sqlite3.connect(':memory:')
+    apply_migrations(conn, target=target)
+    return conn
+
+
+def test_username_lower_is_backfilled():
+    conn = make_db(target=2)  # Before 0003 adds username_lower
+    conn.execute("INSERT INTO users (username, password_hash) VALUES ('Someone@Example.com ', 'x')")
+    conn.commit()
+    apply_migrations(conn)
+    assert conn.execute("SELECT username_lower FROM users").fetchone()[0] == 'someone@example.com'
+
+
+def test_hot_queries_never_scan_a_table():
+    conn = make_db()
+    for name, (sql, params) in HOT_QUERIES.items():
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+        scans = [step for step in plan if step.startswith('SCAN') and 'USING' not in step]
+        assert not scans, f"{name} falls back to a full scan: {plan}"
@@ -0,0 +1,101 @@
+import os
+import sys
+import json
+import logging
+import threading
+
+# Define the base directory of the project (two levels up from this test script)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.utils.logging_config import (AsyncLogDispatcher, BoundedQueueHandler, CompressedRotatingFileHandler,
+                                      EventRateLimiter, JsonFormatter, log_event)
+import src.utils.logging_config as logging_config
+
+
+class SlowListHandler(logging.StreamHandler):
+    """Collects messages; blocks in emit until released, and counts flushes."""
+
+    def __init__(self, gate):
+        super().__init__()
+        self.gate = gate
+        self.messages = []
+        self.flushes = 0
+
+    def emit(self, record):
+        self.gate.wait()
+        self.messages.append(record.getMessage())
+        self.flush()
+
+    def flush(self):
+        self.flushes += 1
+
+
+def test_full_queue_drops_instead_of_blocking_and_batches_writes():
+    gate = threading.Event()
+    dispatcher = AsyncLogDispatcher(maxsize=5, batch_size=100)
+    handler = SlowListHandler(gate)
+    test_logger = logging.getLogger('test_async_logging')
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    test_logger.addHandler(BoundedQueueHandler(dispatcher, dispatcher.add_route([handler])))
+    dispatcher.start()
+
+    for i in range(50):
+        test_logger.info("record %d", i)  # Never blocks, even though the handler is stuck
+    gate.set()
+    dispatcher.stop()
+
+    stats = dispatcher.stats()
+    assert stats['dropped'] > 0
+    assert stats['enqueued'] + stats['dropped'] == 50
+    assert handler.messages[0] == 'record 0'
+    assert any('dropped' in message for message in handler.messages)  # Drops are reported in the log itself
+    assert handler.flushes == stats['batches']  # One flush per batch, not per record
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_log_event_is_lazy_sampled_and_formats_as_json(monkeypatch):
+    monkeypatch.setattr(logging_config, '_event_limiter', EventRateLimiter(rate=0, burst=2))
+    handler = ListHandler()
+    test_logger = logging.getLogger('test_log_event')
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    test_logger.addHandler(handler)
+    calls = []
+
+    def expensive():
+        calls.append(1)
+        return {'user_email_address': 'someone@example.com'}
+
+    log_event(test_logger, 'disabled', level=logging.DEBUG, session=expensive)
+    assert calls == []  # Below the logger's level: the field is never built
+    for _ in range(5):
+        log_event(test_logger, 'SUBMIT_FORM', sample=True, session=expensive)
+    assert len(handler.records) == 2 and len(calls) == 2  # Sampled-out events are not built either
+
+    entry = json.loads(JsonFormatter().format(handler.records[0]))
+    assert entry['msg'] == 'SUBMIT_FORM' and entry['level'] == 'INFO'
+    assert entry['session'] == {'user_email_address': 'someone@example.com'}
+
+
+def test_rotated_logs_are_gzipped_and_pruned(tmp_path):
+    log_file = str(tmp_path / 'app.log')
+    handler = CompressedRotatingFileHandler(log_file, maxBytes=2000, retention_bytes=300)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    for i in range(200):
+        handler.emit(logging.LogRecord('t', logging.INFO, __file__, 0, f"line {i} " + 'x' * 50, None, None))
+    handler.close()
+    backups = sorted(name for name in os.listdir(tmp_path) if name != 'app.log')
+    assert backups and all(name.endswith('.gz') for name in backups)
+    assert sum(os.path.getsize(tmp_path / name) for name in backups) <= 300
+    assert backups == ['app.log.1.gz', 'app.log.2.gz']  # Five rollovers happened; the oldest three were pruned
@@ -0,0 +1,59 @@
+import os
+import sys
+import sqlite3
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.utils import metrics as metrics_module
+from src.utils.metrics import MetricsRegistry, TimedConnection, render_prometheus, reset_db_timing, db_timing
+
+
+def test_histograms_and_counters_render_as_prometheus_text(tmp_path):
+    registry = MetricsRegistry(directory=str(tmp_path), buckets=(0.1, 1.0))
+    registry.observe('request_duration_seconds', 0.05, endpoint='form', method='GET', status='200')
+    registry.observe('request_duration_seconds', 0.5, endpoint='form', method='GET', status='200')
+    registry.observe('request_duration_seconds', 5.0, endpoint='form', method='GET', status='200')
+    registry.inc('db_queries_total', 3, endpoint='say "hi"\n')
+    text = render_prometheus(registry.collect())
+    assert '# TYPE sf95_request_duration_seconds histogram' in text
+    assert 'sf95_request_duration_seconds_bucket{endpoint="form",method="GET",status="200",le="0.1"} 1' in text
+    assert 'sf95_request_duration_seconds_bucket{endpoint="form",method="GET",status="200",le="1"} 2' in text
+    assert 'sf95_request_duration_seconds_bucket{endpoint="form",method="GET",status="200",le="+Inf"} 3' in text
+    assert 'sf95_request_duration_seconds_sum{endpoint="form",method="GET",status="200"} 5.550000' in text
+    assert 'sf95_request_duration_seconds_count{endpoint="form",method="GET",status="200"} 3' in text
+    assert 'sf95_db_queries_total{endpoint="say \\"hi\\"\\n"} 3' in text
+
+
+def test_collect_merges_live_processes_and_archives_exited_ones(tmp_path, monkeypatch):
+    worker_a = MetricsRegistry(directory=str(tmp_path), buckets=(1.0,))
+    worker_b = MetricsRegistry(directory=str(tmp_path), buckets=(1.0,))
+    worker_a.inc('db_queries_total', 2, endpoint='admin')
+    worker_b.inc('db_queries_total', 5, endpoint='admin')
+    worker_b.flush(force=True)
+    counters = worker_a.collect()['counters']
+    assert counters == [{'name': 'db_queries_total', 'labels': {'endpoint': 'admin'}, 'value': 7}]
+
+    # Once a worker has exited its counts move to the archive instead of disappearing with it
+    exited = {os.path.basename(worker_b.snapshot_path)}
+    monkeypatch.setattr(metrics_module, '_pid_from_filename', lambda filename: None if filename in exited else os.getpid())
+    monkeypatch.setattr(metrics_module, '_pid_alive', lambda pid: pid is not None)
+    counters = worker_a.collect()['counters']
+    assert counters[0]['value'] == 7
+    assert metrics_module.ARCHIVE_FILENAME in os.listdir(str(tmp_path))
+    assert not os.path.exists(worker_b.snapshot_path)
+
+
+def test_timed_connection_tallies_sqlite_calls():
+    conn = sqlite3.connect(':memory:', factory=TimedConnection)
+    reset_db_timing()
+    conn.execute("CREATE TABLE claims (id INTEGER PRIMARY KEY)")
+    conn.executemany("INSERT INTO claims (id) VALUES (?)", [(1,), (2,)])
+    assert conn.execute("SELECT COUNT(*) FROM claims").fetchone()[0] == 2
+    seconds, calls = db_timing()
+    assert calls == 4
+    assert seconds > 0
+    reset_db_timing()
+    assert db_timing() == (0.0, 0)
+    conn.close()
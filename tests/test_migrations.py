@@ -0,0 +1,66 @@
+import os
+import sys
+import sqlite3
+
+# Define the base directory of the project (two levels up from this test script)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.utils.migrations import apply_migrations, current_schema_version, latest_schema_version
+
+
+def test_fresh_database_is_migrated_once(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'fresh.db'))
+    applied = apply_migrations(conn)
+    assert [version for version, _ in applied] == list(range(1, latest_schema_version() + 1))
+    assert current_schema_version(conn) == latest_schema_version()
+    assert apply_migrations(conn) == []  # Nothing left to do
+    user_columns = {row[1] for row in conn.execute("PRAGMA table_info(users)")}
+    assert {'role', 'username_lower'} <= user_columns
+    claim_columns = {row[1] for row in conn.execute("PRAGMA table_info(claims)")}
+    assert {'field8_boilerplate_id', 'field8_deviates_from_boilerplate', 'field10_boilerplate_id', 'field10_deviates_from_boilerplate'} <= claim_columns
+    assert conn.execute("SELECT COUNT(*) FROM boilerplate_texts").fetchone()[0] == 2  # The current field 8 and 10 texts
+    conn.execute("INSERT INTO claims (filled_pdf_filename) VALUES ('a.pdf') ON CONFLICT(filled_pdf_filename) DO NOTHING")
+
+
+def test_legacy_database_is_brought_up_to_date(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'legacy.db'))
+    conn.execute("CREATE TABLE claims (id INTEGER PRIMARY KEY AUTOINCREMENT, field2_name TEXT, filled_pdf_filename TEXT)")
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL, password_hash TEXT NOT NULL)")
+    conn.execute("INSERT INTO users (username, password_hash) VALUES ('Admin@Example.com', 'x')")
+    conn.commit()
+    assert current_schema_version(conn) == 0
+    apply_migrations(conn)
+    claim_columns = {row[1] for row in conn.execute("PRAGMA table_info(claims)")}
+    assert {'created_at', 'field18_date_of_signature', 'supplemental_question_4_inside_capitol_details'} <= claim_columns
+    assert conn.execute("SELECT role, username_lower FROM users").fetchone() == ('user', 'admin@example.com')
+
+
+def test_epoch_columns_are_backfilled_and_kept_in_step(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'epochs.db'), detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.execute("CREATE TABLE claims (id INTEGER PRIMARY KEY AUTOINCREMENT, filled_pdf_filename TEXT, field18_date_of_signature TEXT, "
+                 "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+    conn.executemany("INSERT INTO claims (filled_pdf_filename, field18_date_of_signature, created_at, updated_at) VALUES (?, ?, ?, ?)", [
+        ('a.pdf', '2025-05-19T20:42:56-05:00', '2025-05-20 01:42:56.325351+00:00', '2025-05-20 01:42:56'),
+        ('b.pdf', '', '2025-05-20T01:42', 'garbage'),
+    ])
+    conn.commit()
+    apply_migrations(conn)
+    epochs = conn.execute("SELECT created_at_epoch, updated_at_epoch, signed_at_epoch FROM claims ORDER BY id").fetchall()
+    assert epochs == [(1747705376, 1747705376, 1747705376), (1747705320, 0, 0)]
+
+    conn.execute("INSERT INTO claims (filled_pdf_filename, created_at) VALUES ('c.pdf', '2025-05-20T01:42:56Z')")
+    conn.execute("UPDATE claims SET field18_date_of_signature = '2025-05-20T01:42:56' WHERE filled_pdf_filename = 'b.pdf'")
+    assert conn.execute("SELECT created_at_epoch FROM claims WHERE filled_pdf_filename = 'c.pdf'").fetchone()[0] == 1747705376
+    assert conn.execute("SELECT signed_at_epoch FROM claims WHERE filled_pdf_filename = 'b.pdf'").fetchone()[0] == 1747705376
+
+
+def test_migrations_do_not_import_application_code():
+    """Shipped migrations keep their own SQL and data, so later changes to src/utils can't alter them."""
+    migrations_dir = os.path.join(BASE_DIR, 'src', 'migrations')
+    for filename in sorted(os.listdir(migrations_dir)):
+        if filename[:4].isdigit() and filename.endswith('.py'):
+            with open(os.path.join(migrations_dir, filename)) as f:
+                source = f.read()
+            assert 'from src.' not in source and 'import src.' not in source, filename
@@ -0,0 +1,204 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+import pytest
+from pdfrw import PdfReader
+from PyPDF2 import PdfReader as DecodingPdfReader
+
+# Define the base directory of the project (two levels up from this test script)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+PDF_TEMPLATE_PATH = os.path.join(BASE_DIR, 'data', 'sf95.pdf')
+
+from src.utils.pdf_engine import get_template
+from src.utils import pdf_filler
+from src.utils.pdf_cache import PdfCache
+from src.utils.pdf_filler import fill_sf95_pdf, fill_many, build_pdfcpu_payload, PDF_FIELD_MAP
+
+SAMPLE_PDF_DATA = {
+    'field2_claimant_info_combined': 'Jane Doe\n1 Main St\nSpringfield, IL 62701',
+    'field3_checkbox_civilian': True,
+    'field3_checkbox_military': False,
+    'field_pdf_4_dob': '1970-01-01',
+    'field12a_property_damage': '0',
+    'field12b_personal_injury': '90000',
+    'field12d_total_claim_amount': '90000.00',
+    'field13a_signature': '/s/ Jane Doe',
+    'field_pdf_13b_phone': '3855556123',
+}
+
+
+def read_field_values(pdf_path):
+    """Returns {field name: value} for the terminal fields of a filled PDF, as strings."""
+    values = {}
+    for field in PdfReader(pdf_path).Root.AcroForm.Fields:
+        if field.T is None or field.V is None:
+            continue
+        value = field.V
+        values[field.T.to_unicode()] = value.to_unicode() if hasattr(value, 'to_unicode') else str(value)
+    return values
+
+
+def test_template_is_parsed_once():
+    """The engine reuses the parsed template across fills."""
+    assert get_template(PDF_TEMPLATE_PATH) is get_template(PDF_TEMPLATE_PATH)
+
+
+def test_python_backend_writes_payload_values(tmp_path):
+    """Every text field in the payload ends up in the PDF; checkboxes are set to their on-state."""
+    output_path = str(tmp_path / 'filled.pdf')
+    assert fill_sf95_pdf(SAMPLE_PDF_DATA, PDF_TEMPLATE_PATH, output_path, backend='python', use_cache=False) == output_path
+    values = read_field_values(output_path)
+    payload = build_pdfcpu_payload(SAMPLE_PDF_DATA)['forms'][0]
+    for entry in payload['textfield']:
+        if entry['name'] in values:
+            assert values[entry['name']] == entry['value']
+    assert values[PDF_FIELD_MAP['field2_claimant_info_combined']] == SAMPLE_PDF_DATA['field2_claimant_info_combined']
+    assert values[PDF_FIELD_MAP['field_pdf_13b_phone']] == '(385)555-6123'
+    assert values[PDF_FIELD_MAP['field12b_personal_injury']] == '$90,000.00'
+    assert values['CIVILIAN'] == '/On'
+    assert values['MILITARY'] == '/Off'
+
+
+def test_fills_do_not_leak_between_claims(tmp_path):
+    """A field filled for one claim is back to blank for the next claim that leaves it empty."""
+    first_path = str(tmp_path / 'first.pdf')
+    second_path = str(tmp_path / 'second.pdf')
+    fill_sf95_pdf(SAMPLE_PDF_DATA, PDF_TEMPLATE_PATH, first_path, backend='python', use_cache=False)
+    fill_sf95_pdf({'field2_claimant_info_combined': 'John Roe'}, PDF_TEMPLATE_PATH, second_path, backend='python', use_cache=False)
+    values = read_field_values(second_path)
+    assert values[PDF_FIELD_MAP['field2_claimant_info_combined']] == 'John Roe'
+    assert PDF_FIELD_MAP['field_pdf_4_dob'] not in values
+
+
+def read_field_appearances(pdf_path):
+    """Returns {field name: decoded /AP /N content} for the text widgets of a filled PDF, whatever wrote it."""
+    appearances = {}
+    for page in DecodingPdfReader(pdf_path).pages:
+        annotations = page.get('/Annots')
+        for annotation in (annotations.get_object() if annotations else []):
+            annotation = annotation.get_object()
+            if annotation.get('/FT') == '/Tx' and '/AP' in annotation:
+                appearances[str(annotation['/T'])] = annotation['/AP']['/N'].get_object().get_data().decode('latin-1')
+    return appearances
+
+
+@pytest.mark.parametrize('backend', [
+    'python',
+    pytest.param('pdfcpu', marks=pytest.mark.skipif(shutil.which('pdfcpu') is None, reason="pdfcpu binary not installed")),
+])
+def test_filled_values_are_drawn_in_the_field_appearances(tmp_path, backend):
+    """Viewers that draw stored appearances (printing, flattening) show the filled values, not the blank template."""
+    output_path = str(tmp_path / f"{backend}.pdf")
+    assert fill_sf95_pdf(SAMPLE_PDF_DATA, PDF_TEMPLATE_PATH, output_path, backend=backend, use_cache=False)
+    appearances = read_field_appearances(output_path)
+    checked = 0
+    for entry in build_pdfcpu_payload(SAMPLE_PDF_DATA)['forms'][0]['textfield']:
+        value = entry['value']
+        if value and len(value) < 40 and not set(value) & set('()\\\n'):
+            assert value in appearances[entry['name']], entry['name']
+            checked += 1
+    assert checked >= 5
+
+
+@pytest.mark.skipif(shutil.which('pdfcpu') is None, reason="pdfcpu binary not installed")
+def test_python_and_pdfcpu_backends_match(tmp_path):
+    """Both backends produce the same field values for the same claim."""
+    python_path = str(tmp_path / 'python.pdf')
+    pdfcpu_path = str(tmp_path / 'pdfcpu.pdf')
+    assert fill_sf95_pdf(SAMPLE_PDF_DATA, PDF_TEMPLATE_PATH, python_path, backend='python', use_cache=False)
+    assert fill_sf95_pdf(SAMPLE_PDF_DATA, PDF_TEMPLATE_PATH, pdfcpu_path, backend='pdfcpu', use_cache=False)
+    assert read_field_values(python_path) == read_field_values(pdfcpu_path)
+
+
+def test_identical_payload_is_served_from_cache(tmp_path, monkeypatch):
+    """A second fill with the same payload copies the cached PDF instead of rendering again."""
+    cache = PdfCache(str(tmp_path / 'cache'), max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(pdf_filler, 'pdf_cache', cache)
+    first_path = str(tmp_path / 'first.pdf')
+    second_path = str(tmp_path / 'second.pdf')
+    assert fill_sf95_pdf(SAMPLE_PDF_DATA, PDF_TEMPLATE_PATH, first_path, use_cache=True)
+    monkeypatch.setattr(pdf_filler, '_fill_with_backend', lambda *args: pytest.fail("cache hit should not render"))
+    assert fill_sf95_pdf(dict(SAMPLE_PDF_DATA), PDF_TEMPLATE_PATH, second_path, use_cache=True) == second_path
+    with open(first_path, 'rb') as f1, open(second_path, 'rb') as f2:
+        assert f1.read() == f2.read()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_backends_do_not_share_cache_entries(tmp_path, monkeypatch):
+    """The same payload filled with the python and the pdfcpu backend is cached once per backend."""
+    cache = PdfCache(str(tmp_path / 'cache'), max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(pdf_filler, 'pdf_cache', cache)
+    rendered = []
+
+    def fake_fill(backend, pdfcpu_data, template_path, output_path):
+        rendered.append(backend)
+        with open(output_path, 'wb') as f:
+            f.write(f"%PDF-1.7 rendered by {backend}".encode('ascii'))
+        return output_path
+
+    monkeypatch.setattr(pdf_filler, '_fill_with_backend', fake_fill)
+    for backend in ('python', 'pdfcpu', 'pdfcpu'):
+        output_path = str(tmp_path / f"{backend}.pdf")
+        assert fill_sf95_pdf(SAMPLE_PDF_DATA, PDF_TEMPLATE_PATH, output_path, backend=backend, use_cache=True)
+        with open(output_path, 'rb') as f:
+            assert f.read().endswith(backend.encode('ascii'))
+    assert rendered == ['python', 'pdfcpu']
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Once over budget, the oldest-used entries are removed first."""
+    cache = PdfCache(str(tmp_path / 'cache'), max_bytes=3500)
+    source = tmp_path / 'rendered.pdf'
+    source.write_bytes(b'x' * 1000)
+    for i, key in enumerate(['a', 'b', 'c']):
+        cache.store(key, str(source))
+        os.utime(cache._entry_path(key), (i, i))
+    assert cache.fetch('a', str(tmp_path / 'out.pdf'))  # 'a' becomes most recently used
+    cache.store('d', str(source))
+    assert not os.path.exists(cache._entry_path('b'))
+    assert os.path.exists(cache._entry_path('a'))
+
+
+def test_fill_many_returns_a_result_per_claim(tmp_path):
+    """A claim whose payload cannot be built fails on its own; the rest of the batch is still written."""
+    claims = [
+        ('first.pdf', SAMPLE_PDF_DATA),
+        ('broken.pdf', None),
+        ('second.pdf', {'field2_claimant_info_combined': 'John Roe'}),
+    ]
+    results = fill_many(claims, PDF_TEMPLATE_PATH, str(tmp_path), backend='python', use_cache=False)
+    assert [result.filename for result in results] == ['first.pdf', 'broken.pdf', 'second.pdf']
+    assert results[0].path == str(tmp_path / 'first.pdf') and results[0].error is None
+    assert results[1].path is None and results[1].error
+    assert read_field_values(results[2].path)[PDF_FIELD_MAP['field2_claimant_info_combined']] == 'John Roe'
+
+
+def test_fill_many_pdfcpu_splits_a_failing_chunk_down_to_the_bad_claim(tmp_path, monkeypatch):
+    """pdfcpu multifill renders a chunk in one process; a chunk it rejects is split until the bad claim is found."""
+    runs = []
+
+    def fake_multifill(command, **kwargs):
+        # pdfcpu form multifill -mode single <template> <json> <out dir> <out name>
+        with open(command[-3]) as f:
+            forms = json.load(f)['forms']
+        runs.append(len(forms))
+        if any(entry['value'] == 'BAD' for form in forms for entry in form['textfield']):
+            return subprocess.CompletedProcess(command, 1, '', 'invalid form value')
+        for number, _ in enumerate(forms, start=1):
+            shutil.copyfile(command[-4], os.path.join(command[-2], f"{command[-1]}_{number}.pdf"))
+        return subprocess.CompletedProcess(command, 0, '', '')
+
+    monkeypatch.setattr(pdf_filler.shutil, 'which', lambda name: '/usr/bin/pdfcpu')
+    monkeypatch.setattr(pdf_filler.subprocess, 'run', fake_multifill)
+    claims = [(f"claim{i}.pdf", {'field2_claimant_info_combined': 'BAD' if i == 5 else f"Claimant {i}"}) for i in range(8)]
+    results = fill_many(claims, PDF_TEMPLATE_PATH, str(tmp_path), backend='pdfcpu', chunk_size=4, use_cache=False)
+    assert [result.error is not None for result in results] == [i == 5 for i in range(8)]
+    assert 'invalid form value' in results[5].error
+    assert all(os.path.exists(result.path) for result in results if result.path)
+    assert runs == [4, 4, 2, 1, 1, 2]  # Second chunk fails; its first half holds the bad claim
+    assert sorted(os.listdir(str(tmp_path))) == [f"claim{i}.pdf" for i in range(8) if i != 5]
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.utils.profiling import StackSampler, ProfileStore, collapsed_stacks
+
+
+def _busy_for(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+def test_sampler_records_the_profiled_threads_stacks():
+    sampler = StackSampler(interval=0.001).start()
+    _busy_for(0.1)
+    stacks = sampler.stop()
+    assert sampler.samples > 0
+    assert sum(stacks.values()) == sampler.samples
+    busy_stacks = [stack for stack in stacks if '_busy_for (tests/test_profiling.py:' in stack]
+    assert busy_stacks
+    # Root first, leaf last, as collapsed stacks expect
+    assert busy_stacks[0].index('test_sampler_records_the_profiled_threads_stacks') < busy_stacks[0].index('_busy_for')
+
+
+def test_store_keeps_the_newest_profiles_and_serves_collapsed_stacks(tmp_path):
+    store = ProfileStore(directory=str(tmp_path), max_files=2)
+    names = []
+    for i in range(3):
+        names.append(store.save('submit_form', 'POST', '/submit', 0.8 + i, 0.005, {'a;b': 3, 'a;c': 5 + i}, 8 + i))
+        time.sleep(0.002)  # Distinct millisecond timestamps
+    assert [profile['name'] for profile in store.list()] == [names[2], names[1]]
+    assert 'stacks' not in store.list()[0]
+    assert store.load(names[0]) is None
+    assert collapsed_stacks(store.load(names[2])) == "a;c 7\na;b 3\n"
+
+
+def test_store_only_loads_profile_names(tmp_path):
+    store = ProfileStore(directory=str(tmp_path))
+    (tmp_path / 'notes.json').write_text('{}')
+    assert store.load('notes.json') is None
+    assert store.load('../profile-1-1-x.json') is None
+    assert store.list() == []
@@ -0,0 +1,120 @@
+import os
+import sys
+import sqlite3
+import time
+import threading
+
+import pytest
+
+# Define the base directory of the project (two levels up from this test script)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+PDF_TEMPLATE_PATH = os.path.join(BASE_DIR, 'data', 'sf95.pdf')
+
+from src.utils import pdf_filler
+from src.utils.pdf_cache import PdfCache
+from src.utils.render_queue import RenderQueue
+from src.utils.migrations import apply_migrations
+
+
+def migrated_db(tmp_path):
+    """Path of a claims database migrated to the current schema, pdf_render_jobs included."""
+    db_path = str(tmp_path / 'jobs.db')
+    conn = sqlite3.connect(db_path)
+    apply_migrations(conn)
+    conn.close()
+    return db_path
+
+
+def test_enqueued_job_is_rendered(tmp_path, monkeypatch):
+    """A queued render is picked up by a worker and the PDF lands at the output path."""
+    monkeypatch.setattr(pdf_filler, 'pdf_cache', PdfCache(str(tmp_path / 'cache'), max_bytes=10 * 1024 * 1024))
+    queue = RenderQueue(migrated_db(tmp_path), workers=1, poll_interval=0.05)
+    output_path = str(tmp_path / 'claim_SF95.pdf')
+    job_id = queue.enqueue('draft', {'field2_claimant_info_combined': 'Jane Doe'}, PDF_TEMPLATE_PATH, output_path)
+    job = queue.wait_for_job(job_id, timeout=30)
+    assert job['status'] == 'done'
+    assert os.path.exists(output_path)
+    assert queue.latest_job_for_output(output_path)['id'] == job_id
+
+
+def test_failing_job_is_marked_failed_after_max_attempts(tmp_path):
+    """A render that keeps failing stops being retried once it runs out of attempts."""
+    queue = RenderQueue(migrated_db(tmp_path), workers=1, max_attempts=1, poll_interval=0.05)
+    missing_template = str(tmp_path / 'missing.pdf')
+    job_id = queue.enqueue('final', {}, missing_template, str(tmp_path / 'out.pdf'))
+    job = queue.wait_for_job(job_id, timeout=30)
+    assert job['status'] == 'failed'
+    assert job['attempts'] == 1
+    assert job['last_error']
+
+
+def test_unfinished_jobs_are_recovered(tmp_path):
+    """Jobs left 'running' by a worker whose lease expired go back to the queue."""
+    db_path = migrated_db(tmp_path)
+    queue = RenderQueue(db_path, workers=1, lease_seconds=60)
+    conn = sqlite3.connect(db_path)
+    stale_time = time.time() - 3600
+    conn.execute(
+        "INSERT INTO pdf_render_jobs (kind, template_path, output_path, pdf_data, status, locked_by, locked_at, created_at, updated_at) "
+        "VALUES ('final', ?, ?, '{}', 'running', 'elsewhere:1', ?, ?, ?)",
+        (PDF_TEMPLATE_PATH, str(tmp_path / 'out.pdf'), stale_time, stale_time, stale_time)
+    )
+    conn.commit()
+    conn.close()
+    assert queue.recover_unfinished() == [1]
+    assert queue.get_job(1)['status'] == 'queued'
+
+
+@pytest.mark.parametrize('error', [sqlite3.OperationalError('database is locked'), RuntimeError('unexpected')])
+def test_worker_survives_a_failed_finish(tmp_path, monkeypatch, error):
+    """An error while recording a result does not wedge or kill the worker, and the job's lease is reclaimed."""
+    queue = RenderQueue(migrated_db(tmp_path), workers=1, lease_seconds=0, poll_interval=0.05, recover_interval=0)
+    monkeypatch.setattr(queue, '_run_job', lambda job: open(queue._render_path(job), 'wb').close())
+    finish_job = queue._finish_job
+    failures = []
+
+    def failing_finish_job(conn, job, error=None):
+        if not failures:
+            failures.append(job['id'])
+            conn.execute("UPDATE pdf_render_jobs SET status = 'done' WHERE id = ?", (job['id'],))
+            raise error
+        finish_job(conn, job, error)
+
+    monkeypatch.setattr(queue, '_finish_job', failing_finish_job)
+    first_id = queue.enqueue('final', {}, PDF_TEMPLATE_PATH, str(tmp_path / 'first.pdf'))
+    second_id = queue.enqueue('final', {}, PDF_TEMPLATE_PATH, str(tmp_path / 'second.pdf'))
+    assert queue.wait_for_job(second_id, timeout=30)['status'] == 'done'
+    first = queue.wait_for_job(first_id, timeout=30)
+    assert failures == [first_id]
+    assert first['status'] == 'done'
+    assert first['attempts'] == 2
+
+
+def test_cancelled_running_job_does_not_replace_the_file(tmp_path, monkeypatch):
+    """A job cancelled mid-render (its data changed) discards its output instead of recreating the file."""
+    queue = RenderQueue(migrated_db(tmp_path), workers=1, poll_interval=0.05)
+    started, release, rendered = threading.Event(), threading.Event(), threading.Event()
+
+    def slow_render(job):
+        started.set()
+        release.wait(10)
+        with open(queue._render_path(job), 'wb') as f:
+            f.write(b'%PDF stale')
+        rendered.set()
+
+    monkeypatch.setattr(queue, '_run_job', slow_render)
+    output_path = str(tmp_path / 'claim_SF95.pdf')
+    job_id = queue.enqueue('final', {}, PDF_TEMPLATE_PATH, output_path)
+    assert started.wait(10)
+    assert queue.cancel_for_output(output_path) == [job_id]
+    release.set()
+    assert rendered.wait(10)
+    render_path = queue._render_path({'output_path': output_path, 'id': job_id})
+    deadline = time.time() + 10
+    while os.path.exists(render_path) and time.time() < deadline:
+        time.sleep(0.05)
+    assert not os.path.exists(render_path)
+    assert not os.path.exists(output_path)
+    assert queue.get_job(job_id)['status'] == 'cancelled'
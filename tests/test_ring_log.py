@@ -0,0 +1,30 @@
+import os
+import sys
+
+# Define the base directory of the project (two levels up from this test script)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.utils.ring_log import RingLog
+
+
+def test_entries_come_back_in_order_after_wrapping(tmp_path):
+    path = str(tmp_path / 'debug.ring')
+    ring = RingLog(path, capacity=1024)
+    for i in range(200):
+        ring.append(f"entry {i} " + 'x' * (i % 7))
+    entries = ring.entries()
+    texts = [text for _, _, text in entries]
+    assert texts[-1].startswith('entry 199 ')
+    assert [int(text.split()[1]) for text in texts] == list(range(200 - len(texts), 200))  # Contiguous, oldest first
+    assert sum(len(text) + 24 for text in texts) <= 1024
+    ring.close()
+
+    # A second handle (another worker) sees the same entries and keeps appending after them
+    other = RingLog(path, capacity=4096)
+    other.append('from another worker')
+    assert other.capacity == 1024  # The file keeps the size it was created with
+    assert [text for _, _, text in other.entries()][-2:] == [texts[-1], 'from another worker']
+    assert os.path.getsize(path) == 64 + 1024
+    other.close()
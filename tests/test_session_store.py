@@ -0,0 +1,95 @@
+import os
+import sys
+import sqlite3
+import time
+
+# Define the base directory of the project (two levels up from this test script)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from flask import Flask, session
+
+from src.utils.session_store import SqliteSessionInterface
+
+BOILERPLATE = 'I was present at the U.S. Capitol on January 6, 2021 and suffered harm as a result.'
+DEFAULTS = {'form': {'field2_name': '', 'field3_type_employment': 'Civilian', 'field8_basis_of_claim': BOILERPLATE}}
+
+
+def make_app(tmp_path):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.session_interface = SqliteSessionInterface(str(tmp_path / 'sessions.db'), defaults=DEFAULTS)
+
+    @app.route('/set/<name>')
+    def set_name(name):
+        form_data = dict(DEFAULTS['form'], field2_name=name)
+        session['form_data'] = form_data
+        session['pdf_data'] = {'basis': BOILERPLATE}
+        return ''
+
+    @app.route('/get')
+    def get_name():
+        return session.get('form_data', {}).get('field2_name', '')
+
+    @app.route('/clear')
+    def clear():
+        session.clear()
+        return ''
+
+    return app
+
+
+def test_sessions_round_trip_and_are_only_written_on_change(tmp_path):
+    app = make_app(tmp_path)
+    client = app.test_client()
+    client.get('/set/Jane')
+    assert client.get('/get').data == b'Jane'
+    client.get('/set/Jane')  # Same data again: no write
+    stats = app.session_interface.stats()
+    assert stats['written'] == 1 and stats['unchanged'] == 2
+
+    # Stored as a delta against the defaults, with the boilerplate kept by reference
+    data = sqlite3.connect(str(tmp_path / 'sessions.db')).execute("SELECT data FROM sessions").fetchone()[0]
+    with app.app_context():
+        decoded = app.session_interface.decode(data)
+        raw = app.session_interface.serializer.dumps(decoded)
+    assert decoded['form_data']['field8_basis_of_claim'] == BOILERPLATE and decoded['pdf_data']['basis'] == BOILERPLATE
+    assert BOILERPLATE not in raw
+
+    client.get('/clear')
+    assert sqlite3.connect(str(tmp_path / 'sessions.db')).execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 0
+
+
+def test_expired_sessions_are_swept(tmp_path):
+    app = make_app(tmp_path)
+    client = app.test_client()
+    client.get('/set/Jane')
+    conn = sqlite3.connect(str(tmp_path / 'sessions.db'))
+    conn.execute("UPDATE sessions SET expires_at = ?", (int(time.time()) - 1,))
+    conn.commit()
+    assert client.get('/get').data == b''  # An expired session is not loaded
+    assert app.session_interface.sweep() == 1
+
+
+def test_sessions_survive_a_change_of_defaults(tmp_path):
+    app = make_app(tmp_path)
+    client = app.test_client()
+    client.get('/set/Jane')
+
+    # A deploy edits the boilerplate: the session still decodes against the defaults it was written with
+    changed = {'form': dict(DEFAULTS['form'], field8_basis_of_claim=BOILERPLATE + ' Revised.')}
+    app.session_interface = SqliteSessionInterface(str(tmp_path / 'sessions.db'), defaults=changed)
+    assert client.get('/get').data == b'Jane'
+
+    conn = sqlite3.connect(str(tmp_path / 'sessions.db'))
+    data, version = conn.execute("SELECT data, defaults_version FROM sessions").fetchone()
+    assert version == app.session_interface.serializer.version  # Rewritten against the current defaults
+    with app.app_context():
+        decoded = app.session_interface.decode(data)
+    assert decoded['form_data']['field8_basis_of_claim'] == BOILERPLATE and decoded['pdf_data']['basis'] == BOILERPLATE
+
+    # The old snapshot goes once no session references it
+    assert conn.execute("SELECT COUNT(*) FROM session_defaults").fetchone()[0] == 2
+    app.session_interface.sweep()
+    assert conn.execute("SELECT version FROM session_defaults").fetchall() == [(version,)]
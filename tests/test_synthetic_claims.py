@@ -0,0 +1,33 @@
+import os
+import sys
+import sqlite3
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.utils.synthetic_claims import generate_claims, insert_claims, US_STATE_CODES
+
+BOILERPLATES = {'field8_basis_of_claim': 'Standard basis text.', 'field10_nature_of_injury': 'Standard injury text.'}
+
+
+def test_generated_claims_are_reproducible_and_well_formed():
+    claims = list(generate_claims(500, BOILERPLATES, seed=7))
+    assert claims == list(generate_claims(500, BOILERPLATES, seed=7))
+    assert len({claim['filled_pdf_filename'] for claim in claims}) == 500
+    for claim in claims:
+        assert claim['field2_state'] in US_STATE_CODES
+        total = float(claim['field12a_property_damage_amount']) + float(claim['field12b_personal_injury_amount']) + float(claim['field12c_wrongful_death_amount'])
+        assert claim['field12d_total_claim_amount'] == f"{total:.2f}"
+        assert (claim['field13a_signature'] == 'Pending Signature') == (claim['field18_date_of_signature'] == '')
+    basis_texts = [claim['field8_basis_of_claim'] for claim in claims]
+    assert 0 < sum(text != 'Standard basis text.' for text in basis_texts) < 250  # Mostly boilerplate, some deviating
+
+
+def test_insert_claims_bulk_inserts_the_requested_columns():
+    conn = sqlite3.connect(':memory:')
+    columns = ['field2_name', 'field2_state', 'field12d_total_claim_amount', 'filled_pdf_filename', 'created_at']
+    conn.execute(f"CREATE TABLE claims (id INTEGER PRIMARY KEY, {', '.join(columns)}, UNIQUE(filled_pdf_filename))")
+    assert insert_claims(conn, columns, 250, BOILERPLATES, seed=1) == 250
+    assert conn.execute("SELECT COUNT(*) FROM claims").fetchone()[0] == 250
+    assert not conn.in_transaction
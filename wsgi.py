@@ -0,0 +1,4 @@
+# WSGI entry point for servers other than Passenger (e.g. `gunicorn wsgi:app`)
+from src.app import create_app
+
+app = create_app()